@@ -0,0 +1,33 @@
+import hashlib
+import zlib
+
+_COMPRESSION_LEVEL = 6
+
+
+def blob_key(content: str | bytes) -> str:
+    """Content address of the blob
+
+    Args:
+        content (str | bytes): content of the blob, str is encoded as utf-8
+
+    Returns:
+        str: sha256 hexdigest of the content
+    """
+
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+def is_blob_key(key: str) -> bool:
+    return len(key) == 64 and all(c in "0123456789abcdef" for c in key)
+
+
+def compress_blob(content: str | bytes) -> bytes:
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return zlib.compress(content, _COMPRESSION_LEVEL)
+
+
+def decompress_blob(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
@@ -34,6 +34,15 @@ class ListenerConfig(pydantic_settings.BaseSettings):
     NEXUS_PASSWORD: str
     NEXUS_REPO_URL: str
     MAX_WORKERS: int
+    DIFF_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    EXPIRY_DIFF_CACHE: int = 43200
+    DIFF_MIRRORS_ROOT: str = ""
+    DIFF_MIRRORS_REMOTE: str = "gitcode.com"
+    DIFF_FETCH_IN_WORKER: bool = False
+    PREPARE_TASKS_WORKERS: int = 1
+    FILE_TYPE_RULES: str = ""
+    DEVAGENT_QUEUE: str = "celery"
+    WORKER_METRICS_PORT: int = 0
 
     class Config:
         env_file = "./.env"
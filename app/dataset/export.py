@@ -0,0 +1,157 @@
+import abc
+import asyncio
+import datetime
+import pydantic
+import typing
+
+from app.db.async_db import AsyncDBSession
+from app.nexus.repo import NexusRepo
+
+Row = typing.Any  # row of the db query, columns are accessible as attributes
+
+# streams rows changed within (changed_from, changed_to], all rows if bounds are None
+RowStream = typing.Callable[
+    [datetime.datetime | None, datetime.datetime | None],
+    typing.AsyncIterator[list[Row]],
+]
+
+# archive is kept in memory until it grows larger than this, then it is moved to disk
+SPOOL_MAX_MEMORY = 64 * 1024 * 1024
+
+
+MANIFEST_PATH = "manifest.json"
+
+# `updated_at` is the start time of the writing transaction, so rows committed after
+# the export may still be stamped before it's watermark. Incremental export re-reads
+# rows this far behind the watermark to pick them up, consumers deduplicate rows by id.
+WATERMARK_LAG = datetime.timedelta(minutes=10)
+
+
+class DatasetManifest(pydantic.BaseModel):
+    dataset: str
+    incremental: bool
+    # exclusive, rows are compared by `updated_at`, overlaps the previous export by the lag
+    changed_from: datetime.datetime | None
+    changed_to: datetime.datetime
+    rows: int = 0
+
+
+class IDatasetWriter(abc.ABC):
+    """Writes rows of the dataset into an archive as they arrive
+
+    Methods are blocking and are called outside of the event loop.
+    """
+
+    @abc.abstractmethod
+    def extension(self) -> str:
+        pass
+
+    @abc.abstractmethod
+    def write_rows(self, rows: list[Row]) -> None:
+        pass
+
+    @abc.abstractmethod
+    def finish(
+        self, manifest: DatasetManifest | None = None
+    ) -> tuple[typing.IO[bytes], int]:
+        """Complete the archive
+
+        Args:
+            manifest (DatasetManifest | None): manifest to store in the archive, amount of rows is filled by the writer
+
+        Returns:
+            tuple[typing.IO[bytes], int]: archive file positioned at the start and it's size
+        """
+
+        pass
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        pass
+
+
+async def export_archive(
+    batches: typing.AsyncIterator[list[Row]],
+    writer: IDatasetWriter,
+    nexus: NexusRepo,
+    remote_path: str,
+    manifest: DatasetManifest | None = None,
+) -> str:
+    """Write rows into the archive as they arrive and upload it to nexus
+
+    Writing and upload are blocking, so they are run in the threads,
+    leaving event loop free for the other requests. Writer is closed by the caller.
+
+    Args:
+        batches (typing.AsyncIterator[list[Row]]): rows to export
+        writer (IDatasetWriter): writer of the archive
+        nexus (NexusRepo): repo to upload the archive to
+        remote_path (str): path of the archive in the repo
+        manifest (DatasetManifest | None): manifest to store in the archive
+
+    Returns:
+        str: url of the uploaded archive
+    """
+
+    async for batch in batches:
+        await asyncio.to_thread(writer.write_rows, batch)
+    archive, size = await asyncio.to_thread(writer.finish, manifest)
+    return await nexus.upload_fileobj_async(archive, size, remote_path)
+
+
+async def export_dataset(
+    db: AsyncDBSession,
+    nexus: NexusRepo,
+    dataset: str,
+    incremental: bool,
+    stream: RowStream,
+    writer: IDatasetWriter,
+    watermark_lag: datetime.timedelta = WATERMARK_LAG,
+) -> str:
+    """Export the dataset and advance it's watermark
+
+    Full export contains all rows. Incremental export contains only rows added or
+    changed since the previous export of the dataset, full or incremental, and
+    the rows of the last `watermark_lag` before it, which may have been committed
+    after it. Watermark is stored in the db session and is committed along with it,
+    so failed exports are repeated by the next run.
+
+    Args:
+        db (AsyncDBSession): db session to read rows and the watermark from
+        nexus (NexusRepo): repo to upload the archive to
+        dataset (str): name of the dataset, used as the watermark key and the archive prefix
+        incremental (bool): export only rows changed since the previous export
+        stream (RowStream): rows of the dataset
+        writer (IDatasetWriter): writer of the archive, defines it's format, closed afterwards
+        watermark_lag (datetime.timedelta): overlap of the incremental export with the previous one
+
+    Returns:
+        str: url of the uploaded archive
+    """
+
+    try:
+        changed_to = await db.now()
+        watermark = await db.get_dataset_watermark(dataset) if incremental else None
+        changed_from = None if watermark == None else watermark - watermark_lag
+
+        if incremental and changed_from != None:
+            batches = stream(changed_from, changed_to)
+            kind = "delta"
+        else:
+            batches = stream(None, None)
+            kind = "full"
+
+        manifest = DatasetManifest(
+            dataset=dataset,
+            incremental=(kind == "delta"),
+            changed_from=(changed_from if kind == "delta" else None),
+            changed_to=changed_to,
+        )
+        archive = f"{dataset}-{kind}-{changed_to.date()}-{int(changed_to.timestamp())}.{writer.extension()}"
+
+        archive_url = await export_archive(batches, writer, nexus, archive, manifest)
+        await db.set_dataset_watermark(dataset, changed_to)
+
+        return archive_url
+    finally:
+        writer.close()
@@ -0,0 +1,38 @@
+import enum
+import typing
+
+import pyarrow
+
+from app.dataset.export import IDatasetWriter, Row
+from app.dataset.zip_export import ZipDatasetWriter, ZipEntry
+from app.dataset.parquet_export import ParquetDatasetWriter
+
+
+class DatasetFormat(enum.StrEnum):
+    ZIP = "zip"  # directory with .env, patch and context.md per row
+    PARQUET = "parquet"  # rows and deduplicated patches as parquet tables
+
+
+def create_dataset_writer(
+    format: DatasetFormat,
+    entries: typing.Callable[[Row], list[ZipEntry]],
+    schema: pyarrow.Schema,
+) -> IDatasetWriter:
+    """Create writer of the dataset archive
+
+    Args:
+        format (DatasetFormat): format of the archive
+        entries (typing.Callable[[Row], list[ZipEntry]]): files created for a row in the zip format
+        schema (pyarrow.Schema): columns of the rows table in the parquet format
+
+    Returns:
+        IDatasetWriter: writer of the archive
+    """
+
+    if format == DatasetFormat.ZIP:
+        return ZipDatasetWriter(entries)
+
+    if format == DatasetFormat.PARQUET:
+        return ParquetDatasetWriter(schema)
+
+    raise Exception(f"Unsupported dataset format {format}")
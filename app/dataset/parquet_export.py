@@ -0,0 +1,142 @@
+import shutil
+import tempfile
+import typing
+import zipfile
+
+import pyarrow
+import pyarrow.parquet
+
+from app.dataset.export import (
+    IDatasetWriter,
+    DatasetManifest,
+    Row,
+    MANIFEST_PATH,
+    SPOOL_MAX_MEMORY,
+)
+
+ROWS_PATH = "rows.parquet"
+PATCHES_PATH = "patches.parquet"
+
+PATCHES_SCHEMA = pyarrow.schema(
+    dict[str, pyarrow.DataType](
+        {
+            "id": pyarrow.string(),
+            "content": pyarrow.string(),
+            "context": pyarrow.string(),
+        }
+    )
+)
+
+
+class ParquetDatasetWriter(IDatasetWriter):
+    """Writes rows and their patches into two parquet tables
+
+    Rows reference patches by the `patch` column, each patch is stored once.
+    Tables are packed together with the manifest into a zip archive.
+    """
+
+    _schema: pyarrow.Schema
+    _rows_file: typing.IO[bytes]
+    _patches_file: typing.IO[bytes]
+    _rows_writer: pyarrow.parquet.ParquetWriter
+    _patches_writer: pyarrow.parquet.ParquetWriter
+    _archive: typing.IO[bytes]
+    _seen_patches: set[str]
+    _rows: int
+    _max_memory: int
+
+    def __init__(
+        self, schema: pyarrow.Schema, max_memory: int = SPOOL_MAX_MEMORY
+    ) -> None:
+        self._schema = schema
+        self._max_memory = max_memory
+        self._rows_file = tempfile.SpooledTemporaryFile(max_size=max_memory)
+        self._patches_file = tempfile.SpooledTemporaryFile(max_size=max_memory)
+        self._rows_writer = pyarrow.parquet.ParquetWriter(
+            self._rows_file, schema, compression=_COMPRESSION
+        )
+        self._patches_writer = pyarrow.parquet.ParquetWriter(
+            self._patches_file, PATCHES_SCHEMA, compression=_COMPRESSION
+        )
+        self._archive = tempfile.SpooledTemporaryFile(max_size=max_memory)
+        self._seen_patches = set()
+        self._rows = 0
+
+    def extension(self) -> str:
+        return "parquet.zip"
+
+    def write_rows(self, rows: list[Row]) -> None:
+        if len(rows) == 0:
+            return
+
+        columns = dict[str, list[typing.Any]](
+            (name, list()) for name in self._schema.names
+        )
+        patches = dict[str, list[typing.Any]](
+            (name, list()) for name in PATCHES_SCHEMA.names
+        )
+
+        for row in rows:
+            for name, values in columns.items():
+                values.append(getattr(row, name))
+
+            patch = str(row.patch)
+            if patch in self._seen_patches:
+                continue
+            if row.patch_content == None:
+                raise Exception(f"No patch found with id {patch} in the db")
+            self._seen_patches.add(patch)
+            patches["id"].append(patch)
+            patches["content"].append(row.patch_content)
+            patches["context"].append(row.patch_context)
+
+        self._rows_writer.write_batch(
+            pyarrow.RecordBatch.from_pydict(columns, schema=self._schema)
+        )
+        if len(patches["id"]) > 0:
+            self._patches_writer.write_batch(
+                pyarrow.RecordBatch.from_pydict(patches, schema=PATCHES_SCHEMA)
+            )
+        self._rows += len(rows)
+
+    def finish(
+        self, manifest: DatasetManifest | None = None
+    ) -> tuple[typing.IO[bytes], int]:
+        self._rows_writer.close()
+        self._patches_writer.close()
+
+        # parquet is compressed already
+        with zipfile.ZipFile(
+            self._archive, mode="w", compression=zipfile.ZIP_STORED
+        ) as archive:
+            for path, file in [
+                (ROWS_PATH, self._rows_file),
+                (PATCHES_PATH, self._patches_file),
+            ]:
+                file.seek(0)
+                with archive.open(path, mode="w", force_zip64=True) as entry:
+                    shutil.copyfileobj(file, entry)
+
+            if manifest != None:
+                assert manifest is not None
+                manifest = manifest.model_copy(update={"rows": self._rows})
+                archive.writestr(MANIFEST_PATH, manifest.model_dump_json(indent=2))
+
+        size = self._archive.tell()
+        self._archive.seek(0)
+        return self._archive, size
+
+    def close(self) -> None:
+        self._rows_writer.close()
+        self._patches_writer.close()
+        self._rows_file.close()
+        self._patches_file.close()
+        self._archive.close()
+
+
+###########
+# private #
+###########
+
+
+_COMPRESSION: typing.Final = "zstd"
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import typing
+import zipfile
+
+from app.dataset.export import (
+    IDatasetWriter,
+    DatasetManifest,
+    Row,
+    MANIFEST_PATH,
+    SPOOL_MAX_MEMORY,
+)
+
+# (path in the archive, file content)
+ZipEntry = tuple[str, str]
+
+
+class ZipDatasetWriter(IDatasetWriter):
+    """Writes files of each row into a zip archive backed by a spooled temporary file
+
+    Directories of the files get their own entries, as in the archives made by
+    `shutil.make_archive` from the directory of the dataset.
+    """
+
+    _entries: typing.Callable[[Row], list[ZipEntry]]
+    _file: typing.IO[bytes]
+    _zip: zipfile.ZipFile
+    _dirs: set[str]
+    _rows: int
+
+    def __init__(
+        self,
+        entries: typing.Callable[[Row], list[ZipEntry]],
+        max_memory: int = SPOOL_MAX_MEMORY,
+    ) -> None:
+        self._entries = entries
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_memory)
+        self._zip = zipfile.ZipFile(
+            self._file, mode="w", compression=zipfile.ZIP_DEFLATED
+        )
+        self._dirs = set()
+        self._rows = 0
+
+    def extension(self) -> str:
+        return "zip"
+
+    def write_rows(self, rows: list[Row]) -> None:
+        for row in rows:
+            for path, content in self._entries(row):
+                self._make_dirs(os.path.dirname(path))
+                self._zip.writestr(path, content)
+        self._rows += len(rows)
+
+    def _make_dirs(self, dir: str) -> None:
+        if dir == "" or dir in self._dirs:
+            return
+        self._make_dirs(os.path.dirname(dir))
+        self._zip.mkdir(dir)
+        self._dirs.add(dir)
+
+    def finish(
+        self, manifest: DatasetManifest | None = None
+    ) -> tuple[typing.IO[bytes], int]:
+        if manifest != None:
+            assert manifest is not None
+            manifest = manifest.model_copy(update={"rows": self._rows})
+            self._zip.writestr(MANIFEST_PATH, manifest.model_dump_json(indent=2))
+
+        self._zip.close()
+        size = self._file.tell()
+        self._file.seek(0)
+        return self._file, size
+
+    def close(self) -> None:
+        self._zip.close()
+        self._file.close()
@@ -1,13 +1,17 @@
 import typing
+import datetime
 import alembic.config
 import alembic.command
 import sqlalchemy.future
 import sqlalchemy.ext.asyncio
+import sqlalchemy.dialects.postgresql
 import pydantic
 
 from app.db.schemas.error import Error
 from app.db.schemas.patch import Patch
 from app.db.schemas.user_feedback import UserFeedback
+from app.db.schemas.feedback_daily_stats import FeedbackDailyStats
+from app.db.schemas.dataset_watermark import DatasetWatermark
 
 
 ColumnSelector = typing.Callable[[], typing.Any]
@@ -42,11 +46,27 @@ class AsyncDBSession:
         query_res = await self._session.execute(select)
         return [res for res in query_res.scalars().all()]
 
-    async def insert_errors(self, errors: list[Error]) -> None:
-        self._session.add_all(errors)
+    async def insert_errors(self, errors: list[Error]) -> list[int]:
+        """Insert all errors with a single multi-row statement
+
+        Args:
+            errors (list[Error]): errors to insert
+
+        Returns:
+            list[int]: ids of the inserted errors, in the order of `errors`
+        """
+
+        if len(errors) == 0:
+            return list()
+
+        query_res = await self._session.execute(
+            sqlalchemy.insert(Error).returning(Error.id, sort_by_parameter_order=True),
+            [_column_values(item, _ERROR_COLUMNS) for item in errors],
+        )
+        ids = [int(id) for id in query_res.scalars().all()]
         await self._session.commit()
-        for item in errors:
-            await self._session.refresh(item)
+
+        return ids
 
     async def select_patches(self, selector: ColumnSelector | None) -> list[Patch]:
         select = sqlalchemy.future.select(Patch)
@@ -75,10 +95,34 @@ class AsyncDBSession:
         content: str,
         context: str | None,
     ) -> None:
-        existing_patch = await self.get_patch(id)
-        if existing_patch != None:
+        await self.insert_patches_if_do_not_exist(
+            [Patch(id=id, content=content, context=context)]
+        )
+
+    async def insert_patches_if_do_not_exist(self, patches: list[Patch]) -> None:
+        """Insert patches with a single `INSERT ... ON CONFLICT DO NOTHING`
+
+        Args:
+            patches (list[Patch]): patches to insert, already existing ids are skipped
+        """
+
+        # the same patch may be referenced several times
+        unique_patches = dict((str(patch.id), patch) for patch in patches)
+
+        if len(unique_patches) == 0:
             return
-        await self.insert_patches([Patch(id=id, content=content, context=context)])
+
+        await self._session.execute(
+            sqlalchemy.dialects.postgresql.insert(Patch)
+            .values(
+                [
+                    _column_values(patch, _PATCH_COLUMNS)
+                    for patch in unique_patches.values()
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[Patch.id])
+        )
+        await self._session.commit()
 
     async def select_user_feebdack(
         self, selector: ColumnSelector | None
@@ -99,17 +143,327 @@ class AsyncDBSession:
 
     async def insert_user_feebdack(self, user_feedback: list[UserFeedback]) -> None:
         self._session.add_all(user_feedback)
-        await self._session.commit()
+        await self._session.flush()
         for item in user_feedback:
             await self._session.refresh(item)
 
+        deltas = _FeedbackStatsDeltas()
+        for item in user_feedback:
+            deltas.add(_feedback_stats_key(item), 1)
+        await self._apply_feedback_stats_deltas(deltas)
+
+        await self._session.commit()
+
     async def update_user_feebdack(self, id: int, new_feedback: int) -> None:
+        query_res = await self._session.execute(
+            sqlalchemy.select(
+                UserFeedback.created_at,
+                UserFeedback.rule,
+                UserFeedback.project,
+                UserFeedback.feedback,
+            )
+            .where(UserFeedback.id == id)
+            .with_for_update()
+        )
+        old = query_res.one_or_none()
+
         await self._session.execute(
             sqlalchemy.update(UserFeedback)
             .where(UserFeedback.id == id)
             .values(feedback=new_feedback)
         )
 
+        if old == None or old.feedback == new_feedback:
+            return
+
+        deltas = _FeedbackStatsDeltas()
+        deltas.add(_feedback_stats_key(old), -1)
+        deltas.add(_feedback_stats_key(old, new_feedback), 1)
+        await self._apply_feedback_stats_deltas(deltas)
+
+    async def query_feedback_stats(
+        self,
+        day_from: datetime.date | None = None,
+        day_to: datetime.date | None = None,
+        rule: str | None = None,
+        project: str | None = None,
+    ) -> list[sqlalchemy.Row[typing.Any]]:
+        """Count user feedback per rule and feedback kind using the daily rollup
+
+        Args:
+            day_from (datetime.date | None): inclusive lower bound of the feedback day
+            day_to (datetime.date | None): exclusive upper bound of the feedback day
+            rule (str | None): count only feedback for this rule
+            project (str | None): count only feedback for this project
+
+        Returns:
+            list[sqlalchemy.Row[typing.Any]]: rows with `rule`, `feedback` and `total` columns, ordered by rule
+        """
+
+        total = sqlalchemy.func.sum(FeedbackDailyStats.count)
+        select = sqlalchemy.select(
+            FeedbackDailyStats.rule,
+            FeedbackDailyStats.feedback,
+            sqlalchemy.cast(total, sqlalchemy.Integer).label("total"),
+        )
+        if day_from != None:
+            select = select.where(FeedbackDailyStats.day >= day_from)
+        if day_to != None:
+            select = select.where(FeedbackDailyStats.day < day_to)
+        for filter in _equality_filters(
+            FeedbackDailyStats, rule=rule, project=project
+        ):
+            select = select.where(filter)
+        select = select.group_by(
+            FeedbackDailyStats.rule, FeedbackDailyStats.feedback
+        ).order_by(FeedbackDailyStats.rule, FeedbackDailyStats.feedback)
+
+        query_res = await self._session.execute(select)
+        return list(query_res.all())
+
+    async def query_errors(
+        self,
+        columns: list[str] | None = None,
+        created_from: datetime.datetime | None = None,
+        created_to: datetime.datetime | None = None,
+        rule: str | None = None,
+        project: str | None = None,
+        after_id: int | None = None,
+        limit: int | None = None,
+    ) -> list[sqlalchemy.Row[typing.Any]]:
+        """Query errors, rows are ordered by id
+
+        Args:
+            columns (list[str] | None): columns to load, all columns if None
+            created_from (datetime.datetime | None): inclusive lower bound of `created_at`
+            created_to (datetime.datetime | None): exclusive upper bound of `created_at`
+            rule (str | None): load only errors of this rule
+            project (str | None): load only errors of this project
+            after_id (int | None): keyset pagination, load only rows with id greater than this
+            limit (int | None): maximum amount of rows to load
+
+        Returns:
+            list[sqlalchemy.Row[typing.Any]]: loaded rows, columns are accessible as attributes
+        """
+
+        return await self._query_rows(
+            Error,
+            columns,
+            _created_at_filters(Error, created_from, created_to)
+            + _equality_filters(Error, rule=rule, project=project),
+            after_id,
+            limit,
+        )
+
+    async def query_user_feedback(
+        self,
+        columns: list[str] | None = None,
+        created_from: datetime.datetime | None = None,
+        created_to: datetime.datetime | None = None,
+        rule: str | None = None,
+        project: str | None = None,
+        feedback: int | None = None,
+        after_id: int | None = None,
+        limit: int | None = None,
+    ) -> list[sqlalchemy.Row[typing.Any]]:
+        """Query user feedback, rows are ordered by id
+
+        Args:
+            columns (list[str] | None): columns to load, all columns if None
+            created_from (datetime.datetime | None): inclusive lower bound of `created_at`
+            created_to (datetime.datetime | None): exclusive upper bound of `created_at`
+            rule (str | None): load only feedback for this rule
+            project (str | None): load only feedback for this project
+            feedback (int | None): load only feedback of this kind
+            after_id (int | None): keyset pagination, load only rows with id greater than this
+            limit (int | None): maximum amount of rows to load
+
+        Returns:
+            list[sqlalchemy.Row[typing.Any]]: loaded rows, columns are accessible as attributes
+        """
+
+        return await self._query_rows(
+            UserFeedback,
+            columns,
+            _created_at_filters(UserFeedback, created_from, created_to)
+            + _equality_filters(
+                UserFeedback, rule=rule, project=project, feedback=feedback
+            ),
+            after_id,
+            limit,
+        )
+
+    async def query_patches(
+        self,
+        ids: list[str],
+        columns: list[str] | None = None,
+    ) -> list[sqlalchemy.Row[typing.Any]]:
+        """Query patches by their ids
+
+        Args:
+            ids (list[str]): ids of the patches
+            columns (list[str] | None): columns to load, all columns if None
+
+        Returns:
+            list[sqlalchemy.Row[typing.Any]]: loaded rows, columns are accessible as attributes
+        """
+
+        if len(ids) == 0:
+            return list()
+
+        return await self._query_rows(
+            Patch, columns, [Patch.id.in_(set(ids))], None, None
+        )
+
+    async def _query_rows(
+        self,
+        model: typing.Any,
+        columns: list[str] | None,
+        filters: list[typing.Any],
+        after_id: typing.Any | None,
+        limit: int | None,
+    ) -> list[sqlalchemy.Row[typing.Any]]:
+        table_columns = model.__table__.columns
+        if columns == None:
+            selected = list(table_columns)
+        else:
+            selected = [table_columns[column] for column in columns]
+
+        select = sqlalchemy.select(*selected)
+        for filter in filters:
+            select = select.where(filter)
+        if after_id != None:
+            select = select.where(model.id > after_id)
+        select = select.order_by(model.id)
+        if limit != None:
+            select = select.limit(limit)
+
+        query_res = await self._session.execute(select)
+        return list(query_res.all())
+
+    def stream_errors_with_patches(
+        self,
+        changed_from: datetime.datetime | None = None,
+        changed_to: datetime.datetime | None = None,
+        batch_size: int = 256,
+    ) -> typing.AsyncIterator[list[sqlalchemy.Row[typing.Any]]]:
+        """Stream all errors joined with their patches, rows are ordered by id
+
+        Args:
+            changed_from (datetime.datetime | None): exclusive lower bound of `updated_at`
+            changed_to (datetime.datetime | None): inclusive upper bound of `updated_at`
+            batch_size (int): amount of rows fetched from the server-side cursor at once
+
+        Returns:
+            typing.AsyncIterator[list[sqlalchemy.Row[typing.Any]]]: batches of rows with all error columns plus `patch_content` and `patch_context`
+        """
+
+        return self._stream_rows_with_patches(
+            Error, changed_from, changed_to, batch_size
+        )
+
+    def stream_user_feedback_with_patches(
+        self,
+        changed_from: datetime.datetime | None = None,
+        changed_to: datetime.datetime | None = None,
+        batch_size: int = 256,
+    ) -> typing.AsyncIterator[list[sqlalchemy.Row[typing.Any]]]:
+        """Stream all user feedback joined with the patches, rows are ordered by id
+
+        Args:
+            changed_from (datetime.datetime | None): exclusive lower bound of `updated_at`
+            changed_to (datetime.datetime | None): inclusive upper bound of `updated_at`
+            batch_size (int): amount of rows fetched from the server-side cursor at once
+
+        Returns:
+            typing.AsyncIterator[list[sqlalchemy.Row[typing.Any]]]: batches of rows with all feedback columns plus `patch_content` and `patch_context`
+        """
+
+        return self._stream_rows_with_patches(
+            UserFeedback, changed_from, changed_to, batch_size
+        )
+
+    async def get_dataset_watermark(self, dataset: str) -> datetime.datetime | None:
+        query_res = await self._session.execute(
+            sqlalchemy.select(DatasetWatermark.watermark).where(
+                DatasetWatermark.dataset == dataset
+            )
+        )
+        watermark: datetime.datetime | None = query_res.scalar_one_or_none()
+        return watermark
+
+    async def set_dataset_watermark(
+        self, dataset: str, watermark: datetime.datetime
+    ) -> None:
+        insert = sqlalchemy.dialects.postgresql.insert(DatasetWatermark).values(
+            dataset=dataset, watermark=watermark
+        )
+        await self._session.execute(
+            insert.on_conflict_do_update(
+                index_elements=[DatasetWatermark.dataset],
+                set_=dict(
+                    watermark=insert.excluded.watermark,
+                    updated_at=sqlalchemy.func.now(),
+                ),
+            )
+        )
+
+    async def now(self) -> datetime.datetime:
+        """Current time of the db, comparable with the `created_at` and `updated_at` columns"""
+
+        query_res = await self._session.execute(
+            sqlalchemy.select(sqlalchemy.func.localtimestamp())
+        )
+        now: datetime.datetime = query_res.scalar_one()
+        return now
+
+    async def _stream_rows_with_patches(
+        self,
+        model: typing.Any,
+        changed_from: datetime.datetime | None,
+        changed_to: datetime.datetime | None,
+        batch_size: int,
+    ) -> typing.AsyncIterator[list[sqlalchemy.Row[typing.Any]]]:
+        select = sqlalchemy.select(
+            *model.__table__.columns,
+            Patch.content.label("patch_content"),
+            Patch.context.label("patch_context"),
+        ).outerjoin(Patch, Patch.id == model.patch)
+        if changed_from != None:
+            select = select.where(model.updated_at > changed_from)
+        if changed_to != None:
+            select = select.where(model.updated_at <= changed_to)
+        select = select.order_by(model.id).execution_options(yield_per=batch_size)
+
+        query_res = await self._session.stream(select)
+        async for partition in query_res.partitions():
+            yield list(partition)
+
+    async def _apply_feedback_stats_deltas(self, deltas: "_FeedbackStatsDeltas") -> None:
+        values = [
+            dict(day=day, rule=rule, project=project, feedback=feedback, count=count)
+            for (day, rule, project, feedback), count in deltas.items()
+            if count != 0
+        ]
+
+        if len(values) == 0:
+            return
+
+        insert = sqlalchemy.dialects.postgresql.insert(FeedbackDailyStats).values(
+            values
+        )
+        await self._session.execute(
+            insert.on_conflict_do_update(
+                index_elements=[
+                    FeedbackDailyStats.day,
+                    FeedbackDailyStats.rule,
+                    FeedbackDailyStats.project,
+                    FeedbackDailyStats.feedback,
+                ],
+                set_=dict(count=FeedbackDailyStats.count + insert.excluded.count),
+            )
+        )
+
     async def commit(self) -> None:
         await self._session.commit()
 
@@ -121,13 +475,23 @@ class AsyncDBConnection:
         sqlalchemy.ext.asyncio.AsyncSession
     ]
 
-    def __init__(self, cfg: AsyncDBConnectionConfig):
+    def __init__(
+        self,
+        cfg: AsyncDBConnectionConfig,
+        pool_size: int = 100,
+        max_overflow: int = 20,
+    ):
         url = (
             f"{cfg.protocol}://{cfg.user}:{cfg.password}@{cfg.host}:{cfg.port}/{cfg.db}"
         )
         self._conf = cfg
         self._engine = sqlalchemy.ext.asyncio.create_async_engine(
-            url, echo=True, future=True, pool_size=100, max_overflow=20
+            url,
+            echo=True,
+            future=True,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=True,
         )
         self._session_maker = sqlalchemy.ext.asyncio.async_sessionmaker(
             bind=self._engine,
@@ -136,6 +500,17 @@ class AsyncDBConnection:
             class_=sqlalchemy.ext.asyncio.AsyncSession,
         )
 
+    def pool_status(self) -> tuple[int, int]:
+        """Connections of the pool
+
+        Returns:
+            tuple[int, int]: checked out connections and size of the pool, overflow is not included in the size
+        """
+
+        pool = self._engine.pool
+        assert isinstance(pool, sqlalchemy.pool.QueuePool)
+        return pool.checkedout(), pool.size()
+
     async def close(self) -> None:
         await self._engine.dispose()
 
@@ -160,6 +535,64 @@ class AsyncDBConnection:
 ###########
 
 
+_PATCH_COLUMNS = ["id", "content", "context"]
+
+_ERROR_COLUMNS = [
+    "rev_arkcompiler_development_rules",
+    "rev_devagent",
+    "project",
+    "rev_project",
+    "patch",
+    "rule",
+    "message",
+]
+
+
+# feedback recorded before created_at was introduced is accounted to the epoch
+_FEEDBACK_STATS_DEFAULT_DAY = datetime.date(1970, 1, 1)
+
+_FeedbackStatsKey = tuple[datetime.date, str, str, int]
+
+
+class _FeedbackStatsDeltas(dict[_FeedbackStatsKey, int]):
+    def add(self, key: _FeedbackStatsKey, delta: int) -> None:
+        self.update({key: self.get(key, 0) + delta})
+
+
+def _feedback_stats_key(
+    feedback: typing.Any, feedback_kind: int | None = None
+) -> _FeedbackStatsKey:
+    created_at = feedback.created_at
+    day = _FEEDBACK_STATS_DEFAULT_DAY if created_at == None else created_at.date()
+    kind = int(feedback.feedback) if feedback_kind == None else feedback_kind
+    return day, str(feedback.rule), str(feedback.project), kind
+
+
+def _created_at_filters(
+    model: typing.Any,
+    created_from: datetime.datetime | None,
+    created_to: datetime.datetime | None,
+) -> list[typing.Any]:
+    filters = list[typing.Any]()
+    if created_from != None:
+        filters.append(model.created_at >= created_from)
+    if created_to != None:
+        filters.append(model.created_at < created_to)
+    return filters
+
+
+def _equality_filters(model: typing.Any, **values: typing.Any) -> list[typing.Any]:
+    return [
+        getattr(model, column) == value
+        for column, value in values.items()
+        if value != None
+    ]
+
+
+def _column_values(item: typing.Any, columns: list[str]) -> dict[str, typing.Any]:
+    return dict((column, getattr(item, column)) for column in columns)
+
+
 def _run_migrations(conn: sqlalchemy.Connection) -> None:
     cfg = alembic.config.Config("alembic.ini")
     cfg.attributes["connection"] = conn
@@ -0,0 +1,20 @@
+import sqlalchemy
+
+from app.db.schemas.base import SQL_BASE
+
+
+class DatasetWatermark(SQL_BASE):  # type: ignore
+    """Position up to which the dataset was exported, rows are compared by `updated_at`"""
+
+    __tablename__ = "dataset_watermarks"
+
+    dataset = sqlalchemy.Column(
+        sqlalchemy.String, primary_key=True, nullable=False, unique=True
+    )
+    watermark = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False)
+    updated_at = sqlalchemy.Column(
+        sqlalchemy.DateTime,
+        default=sqlalchemy.func.now(),
+        onupdate=sqlalchemy.func.now(),
+        nullable=True,
+    )
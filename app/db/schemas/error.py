@@ -5,6 +5,12 @@ from app.db.schemas.base import SQL_BASE
 
 class Error(SQL_BASE):  # type: ignore
     __tablename__ = "errors"
+    __table_args__ = (
+        sqlalchemy.Index("ix_errors_rule_created_at", "rule", "created_at"),
+        sqlalchemy.Index("ix_errors_project_created_at", "project", "created_at"),
+        sqlalchemy.Index("ix_errors_patch", "patch"),
+        sqlalchemy.Index("ix_errors_updated_at", "updated_at"),
+    )
 
     id = sqlalchemy.Column(
         sqlalchemy.Integer, primary_key=True, nullable=False, unique=True
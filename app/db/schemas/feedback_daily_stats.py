@@ -0,0 +1,15 @@
+import sqlalchemy
+
+from app.db.schemas.base import SQL_BASE
+
+
+class FeedbackDailyStats(SQL_BASE):  # type: ignore
+    """Daily rollup of the user feedback, maintained along with `user_feedback`"""
+
+    __tablename__ = "feedback_daily_stats"
+
+    day = sqlalchemy.Column(sqlalchemy.Date, primary_key=True, nullable=False)
+    rule = sqlalchemy.Column(sqlalchemy.String, primary_key=True, nullable=False)
+    project = sqlalchemy.Column(sqlalchemy.String, primary_key=True, nullable=False)
+    feedback = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True, nullable=False)
+    count = sqlalchemy.Column(sqlalchemy.Integer, nullable=False, default=0)
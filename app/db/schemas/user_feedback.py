@@ -13,6 +13,12 @@ class Feedback(enum.IntEnum):
 
 class UserFeedback(SQL_BASE):  # type: ignore
     __tablename__ = "user_feedback"
+    __table_args__ = (
+        sqlalchemy.Index("ix_user_feedback_rule_created_at", "rule", "created_at"),
+        sqlalchemy.Index("ix_user_feedback_project_created_at", "project", "created_at"),
+        sqlalchemy.Index("ix_user_feedback_patch", "patch"),
+        sqlalchemy.Index("ix_user_feedback_updated_at", "updated_at"),
+    )
 
     id = sqlalchemy.Column(
         sqlalchemy.Integer, primary_key=True, nullable=False, unique=True
@@ -0,0 +1,100 @@
+import asyncio
+import typing
+
+from app.redis.async_redis import AsyncRedisConfig, AsyncRedis
+from app.db.async_db import AsyncDBConnectionConfig, AsyncDBConnection
+
+T = typing.TypeVar("T")
+
+# worker process runs one task at a time, so small pool is enough
+_DB_POOL_SIZE = 2
+_DB_MAX_OVERFLOW = 4
+
+
+class _WorkerResources:
+    loop: asyncio.AbstractEventLoop
+    redis: dict[str, AsyncRedis]
+    db: dict[str, AsyncDBConnection]
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.redis = dict()
+        self.db = dict()
+
+
+_resources: _WorkerResources | None = None
+
+
+def init_worker_resources() -> None:
+    """Create event loop of the worker process
+
+    Clients are created lazily on the first use and are bound to this loop.
+    Expected to be called once per worker process, e.g. from `worker_process_init` signal
+    """
+
+    global _resources
+
+    if _resources != None:
+        return
+
+    _resources = _WorkerResources()
+    asyncio.set_event_loop(_resources.loop)
+
+
+def close_worker_resources() -> None:
+    global _resources
+
+    if _resources == None:
+        return
+
+    resources = _resources
+    _resources = None
+
+    for redis in resources.redis.values():
+        resources.loop.run_until_complete(redis.close())
+    for db in resources.db.values():
+        resources.loop.run_until_complete(db.close())
+    resources.loop.close()
+
+
+def run_async(coro: typing.Coroutine[typing.Any, typing.Any, T]) -> T:
+    """Run coroutine on the persistent event loop of the worker process"""
+
+    return _get_resources().loop.run_until_complete(coro)
+
+
+def get_redis(cfg: AsyncRedisConfig) -> AsyncRedis:
+    resources = _get_resources()
+    key = cfg.model_dump_json()
+
+    redis = resources.redis.get(key, None)
+    if redis == None:
+        redis = AsyncRedis(cfg)
+        resources.redis.update({key: redis})
+
+    return redis
+
+
+def get_db(cfg: AsyncDBConnectionConfig) -> AsyncDBConnection:
+    resources = _get_resources()
+    key = cfg.model_dump_json()
+
+    db = resources.db.get(key, None)
+    if db == None:
+        db = AsyncDBConnection(
+            cfg, pool_size=_DB_POOL_SIZE, max_overflow=_DB_MAX_OVERFLOW
+        )
+        resources.db.update({key: db})
+
+    return db
+
+
+###########
+# private #
+###########
+
+
+def _get_resources() -> _WorkerResources:
+    init_worker_resources()
+    assert _resources is not None
+    return _resources
@@ -1,19 +1,23 @@
 import os
 import os.path
-import hashlib
-import asyncio
-import tempfile
 import subprocess
 import git
 import time
 import pydantic
 import typing
 import json
+import functools
+import concurrent.futures
 
+from app.blob.blob import blob_key, is_blob_key
 from app.redis.async_redis import AsyncRedisConfig, AsyncRedis
-from app.diff.models.diff import Diff
+from app.devagent.resources import get_redis, run_async
+from app.diff.models.diff import Diff, DiffFile
+from app.diff.provider import DiffProvider
 from app.utils.path import abspath_join, is_subpath
-from app.patch.analyzer import PatchAnalyzer
+from app.patch.analyzer import ANALYZER_VERSION, PatchAnalyzer
+from app.patch.file_types import FileTypeClassifier, DEFAULT_FILE_TYPE_CLASSIFIER
+from app.metrics.metrics import observe_cache
 from app.redis.schemas.task_info import (
     task_info_task_id_key,
     task_info_rules_revision_key,
@@ -38,7 +42,9 @@ class DevagentTask(pydantic.BaseModel):
     wd: str
     project: str
     patch_path: str
+    patch_key: str
     context_path: str
+    context_key: str
     rule_path: str
     rule_dirs: list[str]
     rule_skip: list[str]
@@ -51,6 +57,14 @@ class ProjectInfo(pydantic.BaseModel):
     revision: str
 
 
+def fetch_diffs(diff_provider: DiffProvider, urls: list[str]) -> list[Diff]:
+    if len(urls) == 0:
+        return list()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        return list(executor.map(diff_provider.get_diff, urls))
+
+
 def extract_project_info(diff: Diff) -> ProjectInfo:
     return ProjectInfo(
         remote=diff.remote, project=diff.project, revision=diff.summary.base_sha
@@ -98,41 +112,83 @@ def load_rules(wd: str) -> list[DevagentRule]:
 
 
 def prepare_tasks(
-    task_id: str, wd: str, rules: list[DevagentRule], diffs: list[Diff]
+    wd: str,
+    rules: list[DevagentRule],
+    diffs: list[Diff],
+    context_cache: typing.Callable[[list[str]], dict[str, str]] | None = None,
+    max_workers: int = 1,
+    classifier: FileTypeClassifier = DEFAULT_FILE_TYPE_CLASSIFIER,
 ) -> list[DevagentTask]:
-    tasks = list[DevagentTask]()
-
+    mapped_diffs = list[_MappedDiff]()
+    patches = dict[str, bytes]()
     for diff in diffs:
         mapping = _map_applicable_rules_to_diffs(rules, diff)
 
         if len(mapping) == 0:
             continue
 
-        emitted_diffs = dict[str, str]()
-        patch_contexts = dict[str, str]()
-
+        # rule diffs share the same combined diff by reference, so each one is
+        # hashed once and looked up by identity instead of by content
+        patch_keys = dict[int, str]()
+        rule_patches = list[tuple[DevagentRule, str]]()
         for rule, rule_diff in mapping:
-            diff_hash = _diff_hash(rule_diff)
-            existing_patch = emitted_diffs.get(diff_hash, None)
-            if existing_patch:
-                patch_path = existing_patch
-            else:
-                patch_path = _emit_content(wd, ".content.d", task_id, rule_diff)
-                emitted_diffs.update({diff_hash: patch_path})
+            patch_key = patch_keys.get(id(rule_diff), None)
+            if patch_key == None:
+                patch_key = _diff_hash(rule_diff)
+                patch_keys.update({id(rule_diff): patch_key})
+                patches.update({patch_key: rule_diff})
+            rule_patches.append((rule, patch_key))
+
+        # rule diffs combine all files of the diff, so the context is shared by
+        # all of them and is keyed by the combined diff
+        mapped_diffs.append(
+            _MappedDiff(
+                diff=diff, rule_patches=rule_patches, context_hash=rule_patches[0][1]
+            )
+        )
 
-            patch_context = patch_contexts.get(patch_path, None)
-            if patch_context:
-                context_path = patch_context
-            else:
-                patch_context = _generate_patch_context(patch_path)
-                context_path = _emit_content(wd, ".context.d", task_id, patch_context)
-                patch_contexts.update({patch_path: context_path})
+    cached_contexts = dict[str, str]()
+    if context_cache != None and len(mapped_diffs) > 0:
+        cached_contexts = context_cache([m.context_hash for m in mapped_diffs])
+
+    not_cached = dict[str, Diff]()
+    for m in mapped_diffs:
+        if not m.context_hash in cached_contexts:
+            not_cached.update({m.context_hash: m.diff})
+
+    if context_cache != None:
+        observe_cache("patch_context", len(cached_contexts), len(not_cached))
+
+    patch_contexts = dict[str, str](cached_contexts)
+    generated_contexts = _generate_patch_contexts(
+        [diff.files for diff in not_cached.values()], classifier, max_workers
+    )
+    patch_contexts.update(zip(not_cached.keys(), generated_contexts))
 
+    contexts = dict[str, bytes]()
+    context_keys = dict[str, str]()
+    for diff_hash, context in patch_contexts.items():
+        encoded_context = context.encode("utf-8")
+        context_key = blob_key(encoded_context)
+        contexts.update({context_key: encoded_context})
+        context_keys.update({diff_hash: context_key})
+
+    patch_paths = _emit_contents(wd, ".content.d", patches, max_workers)
+    context_paths = _emit_contents(wd, ".context.d", contexts, max_workers)
+
+    # tasks are built in the order of the diffs and rules regardless of the
+    # order of completion, so partitioning of the tasks between workers is stable
+    tasks = list[DevagentTask]()
+    for m in mapped_diffs:
+        context_key = context_keys[m.context_hash]
+        for rule, patch_key in m.rule_patches:
             task = DevagentTask(
                 wd=wd,
-                project=diff.project,
-                patch_path=patch_path,
-                context_path=context_path,
+                project=m.diff.project,
+                patch_path=patch_paths[patch_key],
+                patch_key=patch_key,
+                context_path=context_paths[context_key],
+                context_key=context_key,
                 rule_path=_rule_abspath(wd, rule.name),
                 rule_dirs=rule.dirs,
                 rule_skip=rule.skip,
@@ -144,13 +200,36 @@ def prepare_tasks(
     return tasks
 
 
+def patch_context_version(classifier: FileTypeClassifier) -> str:
+    """Version of the patch contexts generated with the file type table of the classifier"""
+
+    return f"{ANALYZER_VERSION}:{classifier.fingerprint()}"
+
+
+def load_patch_contexts(
+    redis_cfg: AsyncRedisConfig,
+    diff_hashes: list[str],
+    classifier: FileTypeClassifier = DEFAULT_FILE_TYPE_CLASSIFIER,
+) -> dict[str, str]:
+    """Look up contexts generated for the same patches by the previous reviews"""
+
+    redis = get_redis(redis_cfg)
+    version = patch_context_version(classifier)
+    return run_async(redis.get_patch_contexts(diff_hashes, version))
+
+
 def store_task_info_to_redis(
-    redis_cfg: AsyncRedisConfig, task_id: str, wd: str, tasks: list[DevagentTask]
+    redis_cfg: AsyncRedisConfig,
+    task_id: str,
+    wd: str,
+    tasks: list[DevagentTask],
+    classifier: FileTypeClassifier = DEFAULT_FILE_TYPE_CLASSIFIER,
 ) -> None:
     task_info = _create_task_info(task_id, wd, tasks)
-    redis = AsyncRedis(redis_cfg)
-    asyncio.get_event_loop().run_until_complete(redis.set_task_info(task_info))
-    asyncio.get_event_loop().run_until_complete(redis.close())
+    blob_paths = _task_blob_paths(tasks)
+    redis = get_redis(redis_cfg)
+    version = patch_context_version(classifier)
+    run_async(_store_task_info(redis, task_info, blob_paths, tasks, version))
 
 
 ###########
@@ -158,6 +237,41 @@ def store_task_info_to_redis(
 ###########
 
 
+async def _store_task_info(
+    redis: AsyncRedis,
+    task_info: dict[str, typing.Any],
+    blob_paths: dict[str, str],
+    tasks: list[DevagentTask],
+    context_version: str,
+) -> None:
+    # blobs go first, so task info never references missing blobs
+    missing_keys = await redis.missing_blobs(list(blob_paths.keys()))
+    missing_blobs = dict[str, str | bytes]()
+    for key in missing_keys:
+        with open(blob_paths[key], "rb") as f:
+            missing_blobs.update({key: f.read()})
+    existing_keys = [key for key in blob_paths.keys() if key not in missing_blobs]
+
+    await redis.set_blobs(missing_blobs, touch=existing_keys)
+    await redis.set_patch_contexts(_task_context_keys(tasks), context_version)
+    await redis.set_task_info(task_info)
+
+
+def _task_blob_paths(tasks: list[DevagentTask]) -> dict[str, str]:
+    blob_paths = dict[str, str]()
+    for task in tasks:
+        blob_paths.update({task.patch_key: task.patch_path})
+        blob_paths.update({task.context_key: task.context_path})
+    return blob_paths
+
+
+def _task_context_keys(tasks: list[DevagentTask]) -> dict[str, str]:
+    context_keys = dict[str, str]()
+    for task in tasks:
+        context_keys.update({task.patch_key: task.context_key})
+    return context_keys
+
+
 def _create_task_info(
     task_id: str, wd: str, tasks: list[DevagentTask]
 ) -> dict[str, typing.Any]:
@@ -181,19 +295,14 @@ def _create_task_info(
         if not (project_rev_key in task_info):
             task_info.update({project_rev_key: _get_revision(project_root)})
 
-        # patch_name is a basename of the patch
+        # patch_name is a basename of the patch, which is it's content address
         patch_name = os.path.basename(task.patch_path)
+        # contents are stored separately as blobs, task info keeps the keys
         patch_content_key = task_info_patch_content_key(patch_name)
-        if not (patch_content_key in task_info):
-            p = open(task.patch_path)
-            task_info.update({patch_content_key: p.read()})
-            p.close()
+        task_info.update({patch_content_key: task.patch_key})
 
         patch_context_key = task_info_patch_context_key(patch_name)
-        if not (patch_context_key in task_info):
-            c = open(task.context_path)
-            task_info.update({patch_context_key: c.read()})
-            c.close()
+        task_info.update({patch_context_key: task.context_key})
 
         # rule name is the file name of the rule without file extension
         rule_name = os.path.splitext(os.path.basename(task.rule_path))[0]
@@ -202,8 +311,42 @@ def _create_task_info(
     return task_info
 
 
-def _generate_patch_context(patch_path: str) -> str:
-    pa = PatchAnalyzer(patch_path)
+class _MappedDiff(pydantic.BaseModel):
+    diff: Diff
+    # applicable rules with the content addresses of their patches
+    rule_patches: list[tuple[DevagentRule, str]]
+    context_hash: str
+
+
+def _generate_patch_contexts(
+    diff_files: list[list[DiffFile]], classifier: FileTypeClassifier, max_workers: int
+) -> list[str]:
+    """Contexts of the diffs in the order of the diffs
+
+    Analysis is CPU bound, so with `max_workers` > 1 diffs are analyzed by a process pool
+    """
+
+    if max_workers <= 1 or len(diff_files) <= 1:
+        return [
+            _generate_diff_files_context(files, classifier) for files in diff_files
+        ]
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=min(max_workers, len(diff_files))
+    ) as executor:
+        generate = functools.partial(
+            _generate_diff_files_context, classifier=classifier
+        )
+        return list(executor.map(generate, diff_files))
+
+
+def _generate_diff_files_context(
+    files: list[DiffFile], classifier: FileTypeClassifier
+) -> str:
+    return _generate_patch_context(PatchAnalyzer.from_diff_files(files, classifier))
+
+
+def _generate_patch_context(pa: PatchAnalyzer) -> str:
     patch_summary = ""
     if pa.analyze():
         patch_summary += pa.verboseRuntimeSummary()
@@ -214,7 +357,7 @@ def _generate_patch_context(patch_path: str) -> str:
 
 def _map_applicable_rules_to_diffs(
     rules: list[DevagentRule], diff: Diff
-) -> list[tuple[DevagentRule, str]]:
+) -> list[tuple[DevagentRule, bytes]]:
     changed_files = [os.path.join(diff.project, file.file) for file in diff.files]
 
     relevant_rules = [
@@ -223,11 +366,19 @@ def _map_applicable_rules_to_diffs(
         if any(_is_rule_applicable(rule, file) for file in changed_files)
     ]
 
-    combined_diff = "\n\n".join([file.diff for file in diff.files])
+    if len(relevant_rules) == 0:
+        return list()
+
+    # built and encoded once, all rules share the same object
+    combined_diff = _combine_diff_files(diff)
 
     return [(rule, combined_diff) for rule in relevant_rules]
 
 
+def _combine_diff_files(diff: Diff) -> bytes:
+    return "\n\n".join([file.diff for file in diff.files]).encode("utf-8")
+
+
 def _is_rule_applicable(rule: DevagentRule, file: str) -> bool:
     for dir in rule.skip:
         if is_subpath(dir, file):
@@ -288,25 +439,50 @@ def _init_project_at_root(root: str, remote: str, project: str, rev: str) -> Non
     repo.git.checkout(rev)
 
 
-def _diff_hash(diff: str) -> str:
-    return hashlib.sha256(diff.encode()).hexdigest()
+def _diff_hash(diff: bytes) -> str:
+    return blob_key(diff)
 
 
-def _emit_content(wd: str, subdir: str, task_id: str, content: str) -> str:
+def _emit_content(wd: str, subdir: str, key: str, content: bytes) -> str:
+    assert is_blob_key(key), f"Emitted content must be named by it's blob key, got {key}"
+
     dir = abspath_join(wd, subdir)
     os.makedirs(dir, exist_ok=True)
     assert os.path.exists(dir), f"Created dir {dir} does not exist"
 
-    temp = tempfile.NamedTemporaryFile(prefix=f"{task_id}_", dir=dir, delete=False)
-    temp.write(content.encode("utf-8"))
-    path = temp.name
-    temp.close()
+    # files are named by the content address, so the same content is emitted once
+    # and is named the same in every review
+    path = abspath_join(dir, key)
+    try:
+        with open(path, "xb") as f:
+            f.write(content)
+    except FileExistsError:
+        pass
 
     assert os.path.exists(path), f"Emitted file {path} does not exist"
 
     return path
 
 
+def _emit_contents(
+    wd: str, subdir: str, contents: dict[str, bytes], max_workers: int
+) -> dict[str, str]:
+    """Emit contents concurrently, returns keys of the contents mapped to the emitted paths"""
+
+    def emit(item: tuple[str, bytes]) -> str:
+        return _emit_content(wd, subdir, item[0], item[1])
+
+    if max_workers <= 1 or len(contents) <= 1:
+        paths = [emit(item) for item in contents.items()]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(max_workers, len(contents))
+        ) as executor:
+            paths = list(executor.map(emit, contents.items()))
+
+    return dict(zip(contents.keys(), paths))
+
+
 def _get_revision(root: str) -> str:
     cmd = ["git", "-C", root, "rev-parse", "HEAD"]
 
@@ -1,10 +1,10 @@
 import shutil
-import asyncio
 import pydantic
 
 from app.db.schemas.error import Error
-from app.redis.async_redis import AsyncRedisConfig
+from app.db.schemas.patch import Patch
 from app.redis.async_redis import AsyncRedisConfig, AsyncRedis
+from app.devagent.resources import get_db, get_redis, run_async
 from app.db.async_db import AsyncDBConnectionConfig, AsyncDBConnection
 from app.devagent.stages.review_patches import (
     DevagentError,
@@ -12,6 +12,7 @@ from app.devagent.stages.review_patches import (
     ReviewPatchResult,
 )
 from app.redis.schemas.task_info import (
+    task_info_task_id_key,
     task_info_rules_revision_key,
     task_info_devagent_revision_key,
     task_info_patch_content_key,
@@ -36,8 +37,8 @@ def store_errors_to_postgres(
     if len(errors.items()) == 0:
         return
 
-    asyncio.get_event_loop().run_until_complete(
-        _store_errors_to_postgres(db_cfg, redis_cfg, task_id, errors)
+    run_async(
+        _store_errors_to_postgres(get_db(db_cfg), get_redis(redis_cfg), task_id, errors)
     )
 
 
@@ -86,54 +87,87 @@ def process_review_result(
 
 
 async def _store_errors_to_postgres(
-    db_cfg: AsyncDBConnectionConfig,
-    redis_cfg: AsyncRedisConfig,
+    db_conn: AsyncDBConnection,
+    redis: AsyncRedis,
     task_id: str,
     errors: dict[str, list[DevagentError]],
 ) -> None:
-    redis = AsyncRedis(redis_cfg)
-    task_info = await redis.get_task_info(task_id)
-    await redis.close()
+    rules = set(error.rule for repo_errors in errors.values() for error in repo_errors)
+    task_info = await redis.get_task_info_fields(
+        task_id,
+        [task_info_rules_revision_key(), task_info_devagent_revision_key()]
+        + [task_info_project_revision_key(project) for project in errors.keys()]
+        + list(rules),
+    )
 
     if task_info == None:
         raise Exception(f"Task info for task {task_id} expired or never existed")
 
+    patch_names = set(task_info[rule] for rule in rules)
+    patch_info = await redis.get_task_info_fields(
+        task_id,
+        [task_info_patch_content_key(patch_name) for patch_name in patch_names]
+        + [task_info_patch_context_key(patch_name) for patch_name in patch_names],
+    )
+
+    if patch_info == None:
+        raise Exception(f"Task info for task {task_id} expired or never existed")
+
+    task_info.update(patch_info)
+
+    blobs = await redis.get_blobs(
+        [
+            blob
+            for key, blob in patch_info.items()
+            if key != task_info_task_id_key()
+        ]
+    )
+
     ark_dev_rules_rev_key = task_info_rules_revision_key()
     ark_dev_rules_rev = task_info[ark_dev_rules_rev_key]
 
     devagent_rev_key = task_info_devagent_revision_key()
     devagent_rev = task_info[devagent_rev_key]
 
-    db_conn = AsyncDBConnection(db_cfg)
+    orm_patches = dict[str, Patch]()
+    orm_errors = list[Error]()
 
-    async for db_session in db_conn.get_session():
-        orm_errors = list[Error]()
-
-        for project, repo_errors in errors.items():
-            project_rev_key = task_info_project_revision_key(project)
-            project_rev = task_info[project_rev_key]
-            for error in repo_errors:
-                rule = error.rule
-                message = error.message
-                patch_name = task_info[rule]
+    for project, repo_errors in errors.items():
+        project_rev_key = task_info_project_revision_key(project)
+        project_rev = task_info[project_rev_key]
+        for error in repo_errors:
+            rule = error.rule
+            message = error.message
+            patch_name = task_info[rule]
+
+            if patch_name not in orm_patches:
                 patch_content_key = task_info_patch_content_key(patch_name)
-                patch_content = task_info[patch_content_key]
+                patch_content = _get_blob(blobs, task_info[patch_content_key])
                 patch_context_key = task_info_patch_context_key(patch_name)
-                patch_context = task_info[patch_context_key]
-
-                await db_session.insert_patch_if_does_not_exist(
-                    patch_name, patch_content, patch_context
+                patch_context = _get_blob(blobs, task_info[patch_context_key])
+                orm_patch = Patch(
+                    id=patch_name, content=patch_content, context=patch_context
                 )
+                orm_patches.update({patch_name: orm_patch})
+
+            orm_error: Error = Error(
+                rev_arkcompiler_development_rules=ark_dev_rules_rev,
+                rev_devagent=devagent_rev,
+                project=project,
+                rev_project=project_rev,
+                patch=patch_name,
+                rule=rule,
+                message=message,
+            )
+            orm_errors.append(orm_error)
 
-                orm_error: Error = Error(
-                    rev_arkcompiler_development_rules=ark_dev_rules_rev,
-                    rev_devagent=devagent_rev,
-                    project=project,
-                    rev_project=project_rev,
-                    patch=patch_name,
-                    rule=rule,
-                    message=message,
-                )
-                orm_errors.append(orm_error)
+    async for db_session in db_conn.get_session():
+        await db_session.insert_patches_if_do_not_exist(list(orm_patches.values()))
         await db_session.insert_errors(orm_errors)
-    await db_conn.close()
+
+
+def _get_blob(blobs: dict[str, str], key: str) -> str:
+    blob = blobs.get(key, None)
+    if blob == None:
+        raise Exception(f"Blob {key} expired or never existed")
+    return blob
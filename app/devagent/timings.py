@@ -0,0 +1,60 @@
+import contextlib
+import time
+import typing
+
+from app.devagent.resources import get_redis, run_async
+from app.metrics.metrics import observe_stage
+from app.redis.async_redis import AsyncRedisConfig
+from app.redis.schemas.task_timings import StageTiming
+from app.utils.timer import Timer, TimerResolution
+
+
+class StageTimings:
+    """Timing spans of the stages run by a single celery task of the review"""
+
+    root_task_id: str
+    task_id: str
+    spans: list[StageTiming]
+
+    def __init__(self, root_task_id: str, task_id: str) -> None:
+        self.root_task_id = root_task_id
+        self.task_id = task_id
+        self.spans = list()
+
+    @contextlib.contextmanager
+    def stage(self, stage: str, **labels: str) -> typing.Iterator[None]:
+        """Measure the stage, span is recorded even if the stage fails
+
+        Args:
+            stage (str): name of the stage
+            labels (str): details of the stage, e.g. rule of the reviewed patch
+        """
+
+        started_at = time.time()
+        failed = True
+        with Timer(stage, TimerResolution.NANOSECONDS) as timer:
+            try:
+                yield
+                failed = False
+            finally:
+                timer.stop()
+                elapsed = timer.measure() or 0
+                span = StageTiming(
+                    stage=stage,
+                    task_id=self.task_id,
+                    started_at=started_at,
+                    duration=elapsed / 1e9,
+                    failed=failed,
+                    labels=labels,
+                )
+                self.spans.append(span)
+                observe_stage(span)
+
+    def store(self, redis_cfg: AsyncRedisConfig) -> None:
+        """Store the spans to redis, failure to do so does not fail the review"""
+
+        try:
+            redis = get_redis(redis_cfg)
+            run_async(redis.add_task_timings(self.root_task_id, self.spans))
+        except Exception as e:
+            print(f"[{self.root_task_id}] Failed to store stage timings: {e}")
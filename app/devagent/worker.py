@@ -1,21 +1,38 @@
 import celery  # type: ignore
 import inspect
+import functools
 import celery.exceptions  # type: ignore
+import celery.signals  # type: ignore
 import traceback
 import tempfile
 import typing
+import redis
 import os
+import prometheus_client
 
 from app.diff.models.diff import Diff
+from app.diff.provider import DiffProvider, DiffCache
+from app.diff.default_provider import create_diff_provider
+from app.patch.file_types import FileTypeClassifier, load_file_type_classifier
 from app.db.async_db import AsyncDBConnectionConfig
 from app.redis.async_redis import AsyncRedisConfig
 from app.config import CONFIG
+from app.devagent.resources import init_worker_resources, close_worker_resources
+from app.devagent.timings import StageTimings
+from app.metrics.metrics import (
+    WORKER_TASKS,
+    metrics_registry,
+    reset_multiprocess_dir,
+    mark_process_dead,
+)
 
 from app.devagent.stages.review_init import (
+    fetch_diffs,
     extract_project_info,
     populate_workdir,
     load_rules,
     prepare_tasks,
+    load_patch_contexts,
     store_task_info_to_redis,
     ProjectInfo,
     DevagentTask,
@@ -58,6 +75,34 @@ def init_worker() -> celery.Celery:
 devagent_worker = init_worker()
 
 
+@celery.signals.worker_init.connect  # type: ignore
+def on_worker_init(**kwargs: typing.Any) -> None:
+    if CONFIG.WORKER_METRICS_PORT > 0:
+        # runs in the main process before the pool is forked
+        reset_multiprocess_dir()
+        prometheus_client.start_http_server(
+            CONFIG.WORKER_METRICS_PORT, registry=metrics_registry()
+        )
+
+
+@celery.signals.worker_process_init.connect  # type: ignore
+def on_worker_process_init(**kwargs: typing.Any) -> None:
+    init_worker_resources()
+
+
+@celery.signals.worker_process_shutdown.connect  # type: ignore
+def on_worker_process_shutdown(**kwargs: typing.Any) -> None:
+    close_worker_resources()
+    mark_process_dead(os.getpid())
+
+
+@celery.signals.task_postrun.connect  # type: ignore
+def on_task_postrun(
+    task: celery.Task, state: str | None = None, **kwargs: typing.Any
+) -> None:
+    WORKER_TASKS.labels(task.name.split(".")[-1], str(state)).inc()
+
+
 @devagent_worker.task(bind=True, track_started=True)  # type: ignore
 def review_init(
     self: celery.Task,
@@ -65,14 +110,23 @@ def review_init(
     db_cfg: UntypedModel,
     redis_cfg: UntypedModel,
     n_groups: int = CONFIG.MAX_WORKERS,
+    urls: list[str] | None = None,
 ) -> typing.Any:
     task_id = self.request.id
     log_tag = f"[{task_id}]"
+    timings = StageTimings(task_id, task_id)
+    validated_redis_cfg: AsyncRedisConfig | None = None
 
     try:
+        validated_redis_cfg = AsyncRedisConfig.model_validate(redis_cfg)
         wd = tempfile.mkdtemp()
 
-        validated_diffs = [Diff.model_validate(diff) for diff in diffs]
+        if urls != None:
+            # diffs were not fetched by the listener, fetch them here
+            with timings.stage("fetch_diffs"):
+                validated_diffs = fetch_diffs(_get_diff_provider(), urls)
+        else:
+            validated_diffs = [Diff.model_validate(diff) for diff in diffs]
 
         projects_info = [extract_project_info(diff) for diff in validated_diffs]
 
@@ -82,27 +136,49 @@ def review_init(
             revision=CONFIG.DEVAGENT_RULES_REVISION,
         )
 
-        populate_workdir(wd, rules_info, projects_info)
+        with timings.stage("populate_workdir"):
+            populate_workdir(wd, rules_info, projects_info)
 
-        rules = load_rules(wd)
+        with timings.stage("load_rules"):
+            rules = load_rules(wd)
 
-        tasks = prepare_tasks(task_id, wd, rules, validated_diffs)
+        classifier = _get_file_type_classifier()
 
-        validated_redis_cfg = AsyncRedisConfig.model_validate(redis_cfg)
-        store_task_info_to_redis(
-            redis_cfg=validated_redis_cfg, task_id=task_id, wd=wd, tasks=tasks
-        )
+        with timings.stage("prepare_tasks"):
+            tasks = prepare_tasks(
+                wd,
+                rules,
+                validated_diffs,
+                context_cache=functools.partial(
+                    load_patch_contexts, validated_redis_cfg, classifier=classifier
+                ),
+                max_workers=CONFIG.PREPARE_TASKS_WORKERS,
+                classifier=classifier,
+            )
+
+        with timings.stage("store_task_info"):
+            store_task_info_to_redis(
+                redis_cfg=validated_redis_cfg,
+                task_id=task_id,
+                wd=wd,
+                tasks=tasks,
+                classifier=classifier,
+            )
 
         untyped_tasks = [task.model_dump() for task in tasks]
 
         review_tasks = [
-            review_patches.s(untyped_tasks, i, n_groups) for i in range(n_groups)
+            review_patches.s(untyped_tasks, i, n_groups, redis_cfg)
+            for i in range(n_groups)
         ]
         wrapup_task = review_wrapup.s(wd, db_cfg, redis_cfg)
 
         chord = celery.chord(review_tasks)(wrapup_task)
     except Exception:
         raise celery.exceptions.TaskError(_exception_message(log_tag))
+    finally:
+        if validated_redis_cfg != None:
+            timings.store(validated_redis_cfg)
 
     return chord
 
@@ -113,10 +189,15 @@ def review_patches(
     tasks: list[UntypedModel],
     group_idx: int,
     group_size: int,
+    redis_cfg: UntypedModel | None = None,
 ) -> list[UntypedModel]:
     log_tag = f"[{self.request.root_id}] -> [{self.request.id}]"
+    timings = StageTimings(self.request.root_id, self.request.id)
+    validated_redis_cfg: AsyncRedisConfig | None = None
 
     try:
+        if redis_cfg != None:
+            validated_redis_cfg = AsyncRedisConfig.model_validate(redis_cfg)
         validated_tasks = [DevagentTask.model_validate(item) for item in tasks]
 
         start_idx, end_idx = worker_get_range(
@@ -128,15 +209,20 @@ def review_patches(
         results = list[ReviewPatchResult]()
         for task in validated_tasks:
             project_root = os.path.abspath(os.path.join(task.wd, task.project))
-            patch_review_result = review_patch(
-                project_root, task.patch_path, task.rule_path, task.context_path
-            )
+            rule = os.path.splitext(os.path.basename(task.rule_path))[0]
+            with timings.stage("review_patch", project=task.project, rule=rule):
+                patch_review_result = review_patch(
+                    project_root, task.patch_path, task.rule_path, task.context_path
+                )
             filtered_result = filter_violations(patch_review_result, task)
             results.append(filtered_result)
 
         res = [review.model_dump() for review in results]
     except Exception:
         raise celery.exceptions.TaskError(_exception_message(log_tag))
+    finally:
+        if validated_redis_cfg != None:
+            timings.store(validated_redis_cfg)
 
     return res
 
@@ -150,29 +236,37 @@ def review_wrapup(
     redis_cfg: UntypedModel,
 ) -> UntypedModel:
     log_tag = f"[{self.request.root_id}] -> [{self.request.id}]"
+    timings = StageTimings(self.request.root_id, self.request.id)
+    validated_redis_cfg: AsyncRedisConfig | None = None
 
     try:
+        validated_redis_cfg = AsyncRedisConfig.model_validate(redis_cfg)
         validated_review = [
             [ReviewPatchResult.model_validate(item) for item in review_list]
             for review_list in review
         ]
 
-        processed_review = process_review_result(validated_review)
+        with timings.stage("process_review_result"):
+            processed_review = process_review_result(validated_review)
 
         validated_db_cfg = AsyncDBConnectionConfig.model_validate(db_cfg)
-        validated_redis_cfg = AsyncRedisConfig.model_validate(redis_cfg)
-        store_errors_to_postgres(
-            validated_db_cfg,
-            validated_redis_cfg,
-            self.request.root_id,
-            processed_review,
-        )
+        with timings.stage("store_errors_to_postgres"):
+            store_errors_to_postgres(
+                validated_db_cfg,
+                validated_redis_cfg,
+                self.request.root_id,
+                processed_review,
+            )
 
-        clean_workdir(wd)
+        with timings.stage("clean_workdir"):
+            clean_workdir(wd)
 
         untyped_review = processed_review.model_dump()
     except Exception:
         raise celery.exceptions.TaskError(_exception_message(log_tag))
+    finally:
+        if validated_redis_cfg != None:
+            timings.store(validated_redis_cfg)
 
     return untyped_review
 
@@ -182,6 +276,41 @@ def review_wrapup(
 ###########
 
 
+_diff_provider: DiffProvider | None = None
+
+
+def _get_diff_provider() -> DiffProvider:
+    global _diff_provider
+
+    if _diff_provider == None:
+        diff_cache_redis = redis.Redis(
+            host=CONFIG.REDIS_HOST,
+            port=CONFIG.REDIS_PORT,
+            password=CONFIG.REDIS_PASSWORD,
+            db=CONFIG.REDIS_LISTENER_DB,
+        )
+        diff_cache = DiffCache(
+            max_bytes=CONFIG.DIFF_CACHE_MAX_BYTES,
+            redis_conn=diff_cache_redis,
+            expiry=CONFIG.EXPIRY_DIFF_CACHE,
+        )
+        _diff_provider = create_diff_provider(diff_cache)
+
+    return _diff_provider
+
+
+_file_type_classifier: FileTypeClassifier | None = None
+
+
+def _get_file_type_classifier() -> FileTypeClassifier:
+    global _file_type_classifier
+
+    if _file_type_classifier == None:
+        _file_type_classifier = load_file_type_classifier(CONFIG.FILE_TYPE_RULES)
+
+    return _file_type_classifier
+
+
 def _exception_message(tag: str) -> str:
     caller = inspect.stack()[1].function
     exc_message = traceback.format_exc().split("\n")
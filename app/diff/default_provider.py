@@ -0,0 +1,28 @@
+from app.config import CONFIG
+from app.diff.provider import DiffProvider, DiffCache
+from app.diff.providers.gitcode_provider import GitcodeDiffProvider
+from app.diff.providers.local_git_provider import LocalGitDiffProvider
+
+
+def create_diff_provider(diff_cache: DiffCache | None = None) -> DiffProvider:
+    """Create diff provider with all the providers enabled by the config
+
+    Args:
+        diff_cache (DiffCache | None): cache used by the provider, if any
+
+    Returns:
+        DiffProvider: unified interface to obtain git diff
+    """
+
+    diff_provider = DiffProvider(diff_cache)
+
+    gitcode_provider = GitcodeDiffProvider(CONFIG.GITCODE_TOKEN)
+    diff_provider.register_provider(gitcode_provider)
+
+    if CONFIG.DIFF_MIRRORS_ROOT:
+        local_git_provider = LocalGitDiffProvider(
+            CONFIG.DIFF_MIRRORS_ROOT, CONFIG.DIFF_MIRRORS_REMOTE
+        )
+        diff_provider.register_provider(local_git_provider)
+
+    return diff_provider
@@ -1,7 +1,26 @@
 import abc
+import collections
+import threading
+import typing
 import urllib.parse
+import pydantic
+import redis
 
 from app.diff.models.diff import Diff
+from app.metrics.metrics import observe_cache
+
+
+class DiffVersion(pydantic.BaseModel):
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def is_empty(self) -> bool:
+        return self.etag == None and self.last_modified == None
+
+
+class CachedDiff(pydantic.BaseModel):
+    diff: Diff
+    version: DiffVersion
 
 
 class IDiffProvider(abc.ABC):
@@ -13,12 +32,117 @@ class IDiffProvider(abc.ABC):
     def get_diff(self, url: str) -> Diff:
         pass
 
+    def get_diff_if_modified(
+        self, url: str, version: DiffVersion | None
+    ) -> tuple[Diff | None, DiffVersion]:
+        """Conditionally fetch the diff
+
+        Providers that support conditional requests should override this method.
+        Default implementation always fetches the diff and reports no version,
+        so results of such providers are never cached.
+
+        Args:
+            url (str): url of the diff
+            version (DiffVersion | None): version of the cached diff, if any
+
+        Returns:
+            tuple[Diff | None, DiffVersion]: fetched diff and it's version. Diff is None if it was not modified since `version`
+        """
+
+        return self.get_diff(url), DiffVersion()
+
+
+class DiffCache:
+    """In-memory LRU of the diffs, optionally backed by redis
+
+    Memory part of the cache is bounded by the total size of the stored diffs.
+    """
+
+    _max_bytes: int
+    _total_bytes: int
+    _entries: collections.OrderedDict[str, tuple[CachedDiff, int]]
+    _lock: threading.Lock
+    _redis: redis.Redis | None
+    _expiry: int
+
+    def __init__(
+        self, max_bytes: int, redis_conn: redis.Redis | None = None, expiry: int = 0
+    ) -> None:
+        self._max_bytes = max_bytes
+        self._total_bytes = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = redis_conn
+        self._expiry = expiry
+
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def get(self, url: str) -> CachedDiff | None:
+        with self._lock:
+            entry = self._entries.get(url, None)
+            if entry != None:
+                self._entries.move_to_end(url)
+                return entry[0]
+
+        if self._redis == None:
+            return None
+
+        # redis only backs the cache, so it's failures are misses, not errors
+        try:
+            serialized = typing.cast(bytes | None, self._redis.get(_redis_key(url)))
+            if serialized == None:
+                return None
+            assert serialized is not None
+            cached = CachedDiff.model_validate_json(serialized)
+        except (redis.RedisError, pydantic.ValidationError) as e:
+            print(f"Failed to read cached diff of {url}: {e}")
+            return None
+
+        self._put_to_memory(url, cached)
+        return cached
+
+    def put(self, url: str, cached: CachedDiff) -> None:
+        self._put_to_memory(url, cached)
+
+        if self._redis == None:
+            return
+
+        try:
+            self._redis.set(
+                _redis_key(url),
+                cached.model_dump_json(),
+                ex=(self._expiry or None),
+            )
+        except redis.RedisError as e:
+            print(f"Failed to cache diff of {url}: {e}")
+
+    def _put_to_memory(self, url: str, cached: CachedDiff) -> None:
+        size = _diff_size(cached.diff)
+
+        with self._lock:
+            old_entry = self._entries.pop(url, None)
+            if old_entry != None:
+                self._total_bytes -= old_entry[1]
+
+            if size > self._max_bytes:
+                return
+
+            self._entries[url] = (cached, size)
+            self._total_bytes += size
+
+            while self._total_bytes > self._max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
 
 class DiffProvider:
     _providers: dict[str, IDiffProvider]
+    _cache: DiffCache | None
 
-    def __init__(self) -> None:
+    def __init__(self, cache: DiffCache | None = None) -> None:
         self._providers = dict()
+        self._cache = cache
 
     def register_provider(self, provider: IDiffProvider) -> None:
         self._providers.update({provider.domain(): provider})
@@ -30,4 +154,36 @@ class DiffProvider:
         if provider == None:
             raise Exception(f"No provider is registered for domain {parsed_url.netloc}")
 
-        return provider.get_diff(url)
+        if self._cache == None:
+            return provider.get_diff(url)
+
+        cached = self._cache.get(url)
+
+        diff, version = provider.get_diff_if_modified(
+            url, cached.version if cached else None
+        )
+
+        if diff == None:
+            assert cached != None, f"Provider reported not modified diff for {url}"
+            observe_cache("diff", hits=1, misses=0)
+            return cached.diff
+
+        observe_cache("diff", hits=0, misses=1)
+
+        if not version.is_empty():
+            self._cache.put(url, CachedDiff(diff=diff, version=version))
+
+        return diff
+
+
+###########
+# private #
+###########
+
+
+def _redis_key(url: str) -> str:
+    return f"diff_cache:{url}"
+
+
+def _diff_size(diff: Diff) -> int:
+    return sum(len(file.diff.encode()) + len(file.file.encode()) for file in diff.files)
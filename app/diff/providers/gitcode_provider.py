@@ -1,4 +1,5 @@
 import time
+import urllib.error
 import urllib.request
 import urllib.parse
 import json
@@ -7,7 +8,7 @@ import re
 import validators
 
 from app.diff.models.diff import Diff, DiffFile, DiffSummary
-from app.diff.provider import IDiffProvider
+from app.diff.provider import IDiffProvider, DiffVersion
 
 
 class GitcodeDiffProvider(IDiffProvider):
@@ -21,6 +22,13 @@ class GitcodeDiffProvider(IDiffProvider):
         return "gitcode.com"
 
     def get_diff(self, url: str, retries: int = 5) -> Diff:
+        diff, _ = self.get_diff_if_modified(url, None, retries)
+        assert diff != None, f"Unconditional request for {url} returned no diff"
+        return diff
+
+    def get_diff_if_modified(
+        self, url: str, version: DiffVersion | None, retries: int = 5
+    ) -> tuple[Diff | None, DiffVersion]:
         _assert_valid_url(url)
 
         timeout = 5
@@ -28,7 +36,7 @@ class GitcodeDiffProvider(IDiffProvider):
 
         while True:
             try:
-                return _try_get_diff(self._api_token, url)
+                return _try_get_diff(self._api_token, url, version=version)
             except Exception as e:
                 if tries_left > 0:
                     tries_left -= 1
@@ -44,6 +52,8 @@ class GitcodeDiffProvider(IDiffProvider):
 # private #
 ###########
 
+_FILES_PER_PAGE = 100
+
 
 def _assert_valid_url(url: str) -> None:
     if not validators.url(url):
@@ -58,16 +68,27 @@ def _assert_valid_url(url: str) -> None:
         raise Exception(f"Invalid gitcode pull request url : {url}")
 
 
-def _try_get_diff(token: str, url: str) -> Diff:
+def _try_get_diff(
+    token: str,
+    url: str,
+    per_page: int = _FILES_PER_PAGE,
+    version: DiffVersion | None = None,
+) -> tuple[Diff | None, DiffVersion]:
     """
     Fetch Pull Request data from GitCode API.
 
+    Files are requested page by page, and every page is converted to `DiffFile`
+    objects right away, so only one page of the raw response is alive at a time.
+
     Args:
-        payload: Contains 'owner', 'repo', 'number', and optional 'token' fields
-        context: Tool execution context
+        token: GitCode api token
+        url: Pull request url
+        per_page: Amount of files requested per page
+        version: Version of the cached diff, first page is requested conditionally if provided
 
     Returns:
-        Dict with 'files' list containing file paths and diffs
+        Diff with all the files of the pull request (None if it was not modified
+        since `version`) and version reported by the API
     """
 
     parsed_url = urllib.parse.urlparse(url)
@@ -84,107 +105,175 @@ def _try_get_diff(token: str, url: str) -> Diff:
         )
 
     # Construct API URL
-    url = f"https://api.gitcode.com/api/v5/repos/{owner}/{repo}/pulls/{pr_number}/files.json"
+    api_url = f"https://api.gitcode.com/api/v5/repos/{owner}/{repo}/pulls/{pr_number}/files.json"
+
+    try:
+        data, new_version = _fetch_files_page(token, api_url, 1, per_page, version)
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and version != None:
+            return None, version
+        raise e
+
+    files = list[DiffFile]()
+    summary: DiffSummary | None = None
+    page = 1
+
+    while True:
+        if page > 1:
+            data, _ = _fetch_files_page(token, api_url, page, per_page, None)
+
+        if summary == None:
+            summary = _extract_summary(data)
+
+        n_page_files = _convert_to_standard_diff(data, files)
+
+        # data holds the raw page, release it before requesting the next one
+        del data
+
+        if n_page_files < per_page or len(files) >= summary.total_files:
+            break
+
+        page += 1
+
+    assert summary is not None
+
+    res = Diff(
+        remote="gitcode.com",
+        project=f"{owner}/{repo}",
+        files=files,
+        summary=summary,
+    )
+
+    return res, new_version
+
+
+def _fetch_files_page(
+    token: str,
+    api_url: str,
+    page: int,
+    per_page: int,
+    version: DiffVersion | None,
+) -> tuple[dict[str, typing.Any], DiffVersion]:
+    query = urllib.parse.urlencode({"page": page, "per_page": per_page})
 
     # Make HTTP request
-    req = urllib.request.Request(url)
+    req = urllib.request.Request(f"{api_url}?{query}")
     req.add_header("Accept", "application/json")
 
     # Add authentication token if provided
     if token:
         req.add_header("Authorization", f"Bearer {token}")
 
+    # Make request conditional if cached version is known
+    if version != None and version.etag != None:
+        req.add_header("If-None-Match", version.etag)
+    if version != None and version.last_modified != None:
+        req.add_header("If-Modified-Since", version.last_modified)
+
+    # parse straight from the socket, without keeping decoded copy of the body
     with urllib.request.urlopen(req, timeout=30) as response:
-        data = json.loads(response.read().decode("utf-8"))
+        data: dict[str, typing.Any] = json.load(response)
+        new_version = DiffVersion(
+            etag=response.headers.get("ETag", None),
+            last_modified=response.headers.get("Last-Modified", None),
+        )
 
     # Check for API errors
     if "code" in data and data["code"] != 0:
         raise Exception(f"API returned error code: {data['code']}")
 
-    # Convert to standard diff format
-    files = _convert_to_standard_diff(data)
+    return data, new_version
 
-    # Add summary information
-    summary = DiffSummary(
-        total_files=int(data.get("count", 0)),
-        added_lines=int(data.get("added_lines", 0)),
-        removed_lines=int(data.get("remove_lines", 0)),
-        base_sha=str(data.get("diff_refs", dict()).get("base_sha", "")),
-        head_sha=str(data.get("diff_refs", dict()).get("head_sha", "")),
-    )
 
-    res = Diff(
-        remote="gitcode.com",
-        project=f"{owner}/{repo}",
-        files=files,
-        summary=summary,
-    )
+def _extract_summary(api_response: dict[str, typing.Any]) -> DiffSummary:
+    diff_refs = api_response.get("diff_refs", dict())
 
-    return res
+    return DiffSummary(
+        total_files=int(api_response.get("count", 0)),
+        added_lines=int(api_response.get("added_lines", 0)),
+        removed_lines=int(api_response.get("remove_lines", 0)),
+        base_sha=str(diff_refs.get("base_sha", "")),
+        head_sha=str(diff_refs.get("head_sha", "")),
+    )
 
 
-def _convert_to_standard_diff(api_response: dict[str, typing.Any]) -> list[DiffFile]:
+def _convert_to_standard_diff(
+    api_response: dict[str, typing.Any], result: list[DiffFile]
+) -> int:
     """
     Convert GitCode API response to standard diff format.
 
+    Converted items of the response are dropped as soon as corresponding
+    `DiffFile` is created.
+
     Args:
         api_response: Raw response from GitCode API
+        result: List the converted files are appended to
 
     Returns:
-        List of dicts with 'file' and 'diff' keys
+        Amount of the files converted
     """
-    result = list[DiffFile]()
 
-    if "diffs" not in api_response:
-        return result
+    diff_items = api_response.pop("diffs", list())
 
-    for diff_item in api_response["diffs"]:
-        # Extract file path
-        file_path = diff_item.get("statistic", dict()).get("path", "unknown")
+    for i in range(len(diff_items)):
+        result.append(_convert_diff_item(diff_items[i]))
+        diff_items[i] = None
 
-        # Build standard diff format from the content
-        diff_lines = list()
+    return len(diff_items)
 
-        # Add diff header
-        old_path = diff_item.get("statistic", dict()).get("old_path", file_path)
-        new_path = diff_item.get("statistic", dict()).get("new_path", file_path)
+
+def _convert_diff_item(diff_item: dict[str, typing.Any]) -> DiffFile:
+    statistic = diff_item.get("statistic", dict())
+
+    # Extract file path
+    file_path = statistic.get("path", "unknown")
+
+    # Add diff header
+    old_path = statistic.get("old_path", file_path)
+    new_path = statistic.get("new_path", file_path)
+
+    # Process text content
+    text_lines = diff_item.get("content", dict()).get("text", list())
+
+    # Build standard diff format from the content. Lines are joined once, so
+    # every line is copied into the resulting string exactly once
+    diff_lines = [
         # FIXME: remove when not needed
-        diff_lines.append(f"diff --git a/{old_path} b/{new_path}")
-        diff_lines.append(f"--- a/{old_path}")
-        diff_lines.append(f"+++ b/{new_path}")
-
-        # Process text content
-        content = diff_item.get("content", dict())
-        text_lines = content.get("text", list())
-
-        for line_item in text_lines:
-            line_content = line_item.get("line_content", "")
-            line_type = line_item.get("type", "")
-
-            # Handle different line types
-            if line_type == "match":
-                # Hunk header (e.g., @@ -0,0 +1,29 @@)
-                diff_lines.append(line_content)
-            elif line_type == "new":
-                # Added line
-                diff_lines.append(f"+{line_content}")
-            elif line_type == "old":
-                # Removed line
-                diff_lines.append(f"-{line_content}")
-            elif line_type == "context" or line_type == "":
-                # Context line (unchanged)
-                diff_lines.append(f" {line_content}")
-
-        # Join lines into a single diff string
-        diff_str = "\n".join(diff_lines)
-
-        result.append(
-            DiffFile(
-                file=file_path,
-                diff=diff_str,
-                added_lines=diff_item.get("added_lines", 0),
-                removed_lines=diff_item.get("remove_lines", 0),
-            )
-        )
+        f"diff --git a/{old_path} b/{new_path}",
+        f"--- a/{old_path}",
+        f"+++ b/{new_path}",
+    ]
+    diff_lines.extend(
+        line
+        for line in (_convert_line(line_item) for line_item in text_lines)
+        if line is not None
+    )
+
+    return DiffFile(
+        file=file_path,
+        diff="\n".join(diff_lines),
+        added_lines=diff_item.get("added_lines", 0),
+        removed_lines=diff_item.get("remove_lines", 0),
+    )
+
 
-    return result
+def _convert_line(line_item: dict[str, typing.Any]) -> str | None:
+    line_content = line_item.get("line_content", "")
+    line_type = line_item.get("type", "")
+
+    # Handle different line types
+    if line_type == "match":
+        # Hunk header (e.g., @@ -0,0 +1,29 @@)
+        return str(line_content)
+    if line_type == "new":
+        # Added line
+        return f"+{line_content}"
+    if line_type == "old":
+        # Removed line
+        return f"-{line_content}"
+    if line_type == "context" or line_type == "":
+        # Context line (unchanged)
+        return f" {line_content}"
+
+    return None
@@ -0,0 +1,201 @@
+import os.path
+import re
+import subprocess
+import tempfile
+import typing
+
+from app.diff.models.diff import Diff, DiffFile, DiffSummary
+from app.diff.provider import IDiffProvider
+from app.utils.path import abspath_join, is_subpath
+
+
+class LocalGitDiffProvider(IDiffProvider):
+    """Computes diffs from the local bare mirrors instead of the forge API
+
+    Mirrors are expected to be laid out as `<mirrors_root>/<owner>/<repo>.git`.
+    Accepted urls look like `https://<domain>/<owner>/<repo>/compare/<base_sha>...<head_sha>`
+    """
+
+    _mirrors_root: str
+    _remote: str
+    _domain: str
+
+    def __init__(
+        self, mirrors_root: str, remote: str, domain: str = "git-mirror"
+    ) -> None:
+        super().__init__()
+        self._mirrors_root = mirrors_root
+        self._remote = remote
+        self._domain = domain
+
+    def domain(self) -> str:
+        return self._domain
+
+    def get_diff(self, url: str) -> Diff:
+        project, base_sha, head_sha = _parse_url(self._domain, url)
+        return self.get_revisions_diff(project, base_sha, head_sha)
+
+    def get_revisions_diff(self, project: str, base_sha: str, head_sha: str) -> Diff:
+        mirror = self.mirror_path(project)
+        if not is_subpath(os.path.abspath(self._mirrors_root), mirror):
+            raise Exception(f"Git mirror of {project} is outside of the mirrors root")
+        _assert_valid_mirror(mirror)
+        _assert_revision_exists(mirror, base_sha)
+        _assert_revision_exists(mirror, head_sha)
+
+        files = list[DiffFile]()
+        added_lines = 0
+        removed_lines = 0
+
+        for file in _stream_diff_files(mirror, base_sha, head_sha):
+            added_lines += file.added_lines
+            removed_lines += file.removed_lines
+            files.append(file)
+
+        return Diff(
+            remote=self._remote,
+            project=project,
+            files=files,
+            summary=DiffSummary(
+                total_files=len(files),
+                added_lines=added_lines,
+                removed_lines=removed_lines,
+                base_sha=base_sha,
+                head_sha=head_sha,
+            ),
+        )
+
+    def mirror_path(self, project: str) -> str:
+        return abspath_join(self._mirrors_root, f"{project}.git")
+
+
+###########
+# private #
+###########
+
+
+_DIFF_HEADER_PREFIX = "diff --git "
+
+
+def _parse_url(domain: str, url: str) -> tuple[str, str, str]:
+    match = re.match(
+        f"^https?://{re.escape(domain)}/([A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+)/compare/([0-9a-fA-F]+)\\.\\.\\.([0-9a-fA-F]+)/?$",
+        url,
+    )
+    if match == None or any(
+        segment in [".", ".."] for segment in match.group(1).split("/")
+    ):
+        raise Exception(f"Invalid git mirror compare url : {url}")
+    assert match is not None
+    return match.group(1), match.group(2), match.group(3)
+
+
+def _assert_valid_mirror(mirror: str) -> None:
+    if not os.path.isdir(mirror):
+        raise Exception(f"No git mirror found at {mirror}")
+
+
+def _assert_revision_exists(mirror: str, rev: str) -> None:
+    cmd = ["git", "-C", mirror, "cat-file", "-e", f"{rev}^{{commit}}"]
+    res = subprocess.run(cmd, capture_output=True)
+    if res.returncode != 0:
+        raise Exception(f"Revision {rev} is not present in the mirror {mirror}")
+
+
+def _stream_diff_files(
+    mirror: str, base_sha: str, head_sha: str
+) -> typing.Iterator[DiffFile]:
+    """Run `git diff` and yield files as soon as their diff is read
+
+    Three-dot notation is used, so the diff is taken against the merge base,
+    same as the pull request diffs of the forge.
+    """
+
+    cmd = [
+        "git",
+        "-C",
+        mirror,
+        "-c",
+        "core.quotepath=off",
+        "diff",
+        "--no-color",
+        "--no-ext-diff",
+        "--find-renames",
+        f"{base_sha}...{head_sha}",
+    ]
+
+    # stderr is not read until git exits, so it goes to a file to never fill the pipe
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr)
+        assert proc.stdout is not None
+
+        try:
+            file_lines = list[str]()
+            for raw_line in proc.stdout:
+                line = raw_line.decode("utf-8", errors="replace").rstrip("\n")
+                if line.startswith(_DIFF_HEADER_PREFIX) and len(file_lines) > 0:
+                    yield _make_diff_file(file_lines)
+                    file_lines = list[str]()
+                file_lines.append(line)
+
+            if len(file_lines) > 0:
+                yield _make_diff_file(file_lines)
+
+            returncode = proc.wait()
+            if returncode != 0:
+                stderr.seek(0)
+                raise Exception(
+                    f"Return code of cmd {cmd} was {returncode}. expected 0. stderr = {stderr.read().decode('utf-8', errors='replace')}"
+                )
+        finally:
+            # git is left running if the consumer fails or stops early
+            proc.kill()
+            proc.wait()
+            proc.stdout.close()
+
+
+def _make_diff_file(lines: list[str]) -> DiffFile:
+    old_path: str | None = None
+    new_path: str | None = None
+    added_lines = 0
+    removed_lines = 0
+    in_hunk = False
+
+    for line in lines:
+        if in_hunk:
+            if line.startswith("+"):
+                added_lines += 1
+            elif line.startswith("-"):
+                removed_lines += 1
+        elif line.startswith("--- "):
+            old_path = _strip_path_prefix(line[len("--- ") :], "a/")
+        elif line.startswith("+++ "):
+            new_path = _strip_path_prefix(line[len("+++ ") :], "b/")
+        elif line.startswith("rename from "):
+            old_path = line[len("rename from ") :]
+        elif line.startswith("rename to "):
+            new_path = line[len("rename to ") :]
+
+        if line.startswith("@@"):
+            in_hunk = True
+
+    if new_path != None and new_path != "/dev/null":
+        file = new_path
+    elif old_path != None and old_path != "/dev/null":
+        file = old_path
+    else:
+        # binary or mode-only change, take path from the header
+        file = lines[0][len(_DIFF_HEADER_PREFIX) :].split(" b/", 1)[-1]
+
+    return DiffFile(
+        file=file,
+        diff="\n".join(lines),
+        added_lines=added_lines,
+        removed_lines=removed_lines,
+    )
+
+
+def _strip_path_prefix(path: str, prefix: str) -> str:
+    if path.startswith(prefix):
+        return path[len(prefix) :]
+    return path
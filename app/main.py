@@ -1,17 +1,22 @@
 import fastapi
 import contextlib
 import typing
+import redis
+import prometheus_client
 
 from app.config import CONFIG
 from app.utils.authentication import generate_signature
-from app.diff.provider import DiffProvider
-from app.diff.providers.gitcode_provider import GitcodeDiffProvider
+from app.diff.provider import DiffProvider, DiffCache
+from app.diff.default_provider import create_diff_provider
 from app.nexus.repo import NexusRepo
 from app.redis.async_redis import AsyncRedis, AsyncRedisConfig
 from app.db.async_db import AsyncDBConnection, AsyncDBConnectionConfig, AsyncDBSession
 
+from app.metrics.listener import ListenerCollector, observe_request, render_metrics
 from app.routes.api.v1.devagent.endpoint import (
     endpoint_api_v1_devagent,
+    TaskKind,
+    TASK_KIND_ACTIONS,
     Response as ResponseApiV1Devagent,
 )
 from app.routes.health.endpoint import (
@@ -67,10 +72,18 @@ def get_diff_provider(request: fastapi.Request) -> DiffProvider:
 @contextlib.asynccontextmanager
 async def lifespan(app: fastapi.FastAPI):  # type: ignore
     print("Initializing diff providers")
-    diff_provider = DiffProvider()
-    gitcode_provider = GitcodeDiffProvider(CONFIG.GITCODE_TOKEN)
-    diff_provider.register_provider(gitcode_provider)
-    app.state.diff_provider = diff_provider
+    diff_cache_redis = redis.Redis(
+        host=CONFIG.REDIS_HOST,
+        port=CONFIG.REDIS_PORT,
+        password=CONFIG.REDIS_PASSWORD,
+        db=CONFIG.REDIS_LISTENER_DB,
+    )
+    diff_cache = DiffCache(
+        max_bytes=CONFIG.DIFF_CACHE_MAX_BYTES,
+        redis_conn=diff_cache_redis,
+        expiry=CONFIG.EXPIRY_DIFF_CACHE,
+    )
+    app.state.diff_provider = create_diff_provider(diff_cache)
     print("Initializing nexus repo")
     app.state.nexus_repo = NexusRepo(
         username=CONFIG.NEXUS_USERNAME,
@@ -98,12 +111,33 @@ async def lifespan(app: fastapi.FastAPI):  # type: ignore
     app.state.async_db = AsyncDBConnection(async_db_cfg)
     print("Running db migrations")
     await app.state.async_db.run_migrations()
+    print("Initializing metrics")
+    broker_redis = redis.Redis(
+        host=CONFIG.REDIS_HOST,
+        port=CONFIG.REDIS_PORT,
+        password=CONFIG.REDIS_PASSWORD,
+        db=CONFIG.REDIS_DEVAGENT_DB,
+    )
+    metrics_collector = ListenerCollector(
+        db=app.state.async_db,
+        redis=app.state.async_redis,
+        broker=broker_redis,
+        queue=CONFIG.DEVAGENT_QUEUE,
+    )
+    prometheus_client.REGISTRY.register(metrics_collector)
     print("Listening for requests")
     yield
+    print("Closing metrics")
+    prometheus_client.REGISTRY.unregister(metrics_collector)
+    broker_redis.close()
     print("Closing redis connection")
     await app.state.async_redis.close()
     print("Closing db connection")
     await app.state.async_db.close()
+    print("Closing diff cache connection")
+    diff_cache_redis.close()
+    print("Closing nexus session")
+    app.state.nexus_repo.close()
 
 
 listener = fastapi.FastAPI(debug=True, lifespan=lifespan)
@@ -123,6 +157,20 @@ def health(request: fastapi.Request) -> ResponseHealth:
     return endpoint_health()
 
 
+@listener.get("/metrics")
+def metrics(request: fastapi.Request) -> fastapi.Response:
+    """Metrics of the listener in the prometheus text format
+
+    Returns:
+        fastapi.Response: exposition of the metrics
+    """
+
+    if not authenticate_request(request):
+        raise fastapi.HTTPException(status_code=400, detail="Authentication failed")
+
+    return render_metrics()
+
+
 @listener.get("/api/v1/devagent")
 async def api_v1_devagent(
     request: fastapi.Request,
@@ -152,12 +200,18 @@ async def api_v1_devagent(
     if not authenticate_request(request):
         raise fastapi.HTTPException(status_code=400, detail="Authentication failed")
 
-    return await endpoint_api_v1_devagent(
-        request=request,
-        db=db,
-        redis=redis,
-        nexus=nexus,
-        diff_provider=diff_provider,
-        task_kind=task_kind,
-        action=action,
-    )
+    with observe_request(
+        task_kind,
+        action,
+        [e.value for e in TaskKind],
+        TASK_KIND_ACTIONS.get(task_kind, []),
+    ):
+        return await endpoint_api_v1_devagent(
+            request=request,
+            db=db,
+            redis=redis,
+            nexus=nexus,
+            diff_provider=diff_provider,
+            task_kind=task_kind,
+            action=action,
+        )
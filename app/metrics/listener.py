@@ -0,0 +1,104 @@
+import contextlib
+import time
+import typing
+import fastapi
+import redis
+import prometheus_client
+import prometheus_client.core
+import prometheus_client.registry
+
+from app.db.async_db import AsyncDBConnection
+from app.redis.async_redis import AsyncRedis
+from app.metrics.metrics import REQUEST_DURATION
+
+
+@contextlib.contextmanager
+def observe_request(
+    task_kind: int, action: int, task_kinds: list[int], actions: list[int]
+) -> typing.Iterator[None]:
+    """Observe latency and status of the api request
+
+    Args:
+        task_kind (int): task kind of the request
+        action (int): action of the request
+        task_kinds (list[int]): valid task kinds, other values are reported as `other` to bound the number of series
+        actions (list[int]): valid actions of the task kind, other values are reported as `other`
+    """
+
+    start = time.perf_counter()
+    status = 500
+    try:
+        yield
+        status = 200
+    except fastapi.HTTPException as e:
+        status = e.status_code
+        raise
+    finally:
+        REQUEST_DURATION.labels(
+            str(task_kind) if task_kind in task_kinds else "other",
+            str(action) if action in actions else "other",
+            str(status),
+        ).observe(time.perf_counter() - start)
+
+
+class ListenerCollector(prometheus_client.registry.Collector):
+    """Gauges sampled on scrape: pools of the listener and depth of the celery queue"""
+
+    _db: AsyncDBConnection
+    _redis: AsyncRedis
+    _broker: redis.Redis
+    _queue: str
+
+    def __init__(
+        self, db: AsyncDBConnection, redis: AsyncRedis, broker: redis.Redis, queue: str
+    ) -> None:
+        self._db = db
+        self._redis = redis
+        self._broker = broker
+        self._queue = queue
+
+    def collect(self) -> typing.Iterable[prometheus_client.core.Metric]:
+        db_checked_out, db_size = self._db.pool_status()
+        db_pool = prometheus_client.core.GaugeMetricFamily(
+            "devagent_listener_db_pool_connections",
+            "Connections of the db pool",
+            labels=["state"],
+        )
+        db_pool.add_metric(["checked_out"], db_checked_out)
+        db_pool.add_metric(["size"], db_size)
+        yield db_pool
+
+        redis_status = self._redis.pool_status()
+        if redis_status != None:
+            assert redis_status is not None
+            redis_in_use, redis_available = redis_status
+            redis_pool = prometheus_client.core.GaugeMetricFamily(
+                "devagent_listener_redis_pool_connections",
+                "Connections of the redis pool",
+                labels=["state"],
+            )
+            redis_pool.add_metric(["in_use"], redis_in_use)
+            redis_pool.add_metric(["available"], redis_available)
+            yield redis_pool
+
+        try:
+            # celery keeps the queue as a list in the redis broker
+            depth = int(self._broker.llen(self._queue))  # type: ignore
+        except Exception as e:
+            print(f"Failed to read depth of the queue {self._queue}: {e}")
+            return
+
+        yield prometheus_client.core.GaugeMetricFamily(
+            "devagent_worker_queue_depth",
+            "Tasks waiting in the celery queue",
+            value=depth,
+        )
+
+
+def render_metrics() -> fastapi.Response:
+    # listener is a single process, so it's metrics are in the default registry
+    return fastapi.Response(
+        content=prometheus_client.generate_latest(prometheus_client.REGISTRY),
+        media_type=prometheus_client.CONTENT_TYPE_LATEST,
+    )
+
@@ -0,0 +1,104 @@
+import os
+import shutil
+import prometheus_client
+import prometheus_client.multiprocess
+
+from app.redis.schemas.task_timings import StageTiming
+
+# latency of the listener is dominated by the db, redis and nexus round trips
+_REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# devagent runs take minutes, while the rest of the stages may take milliseconds
+_STAGE_BUCKETS = (0.01, 0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800)
+
+REQUEST_DURATION = prometheus_client.Histogram(
+    "devagent_listener_request_duration_seconds",
+    "Latency of the api requests of the listener",
+    ["task_kind", "action", "status"],
+    buckets=_REQUEST_BUCKETS,
+)
+
+STAGE_DURATION = prometheus_client.Histogram(
+    "devagent_worker_stage_duration_seconds",
+    "Duration of the stages of the review pipeline",
+    ["stage", "status"],
+    buckets=_STAGE_BUCKETS,
+)
+
+RULE_DURATION = prometheus_client.Histogram(
+    "devagent_worker_rule_duration_seconds",
+    "Duration of the stages run per rule, e.g. devagent review of the patch",
+    ["stage", "rule", "status"],
+    buckets=_STAGE_BUCKETS,
+)
+
+WORKER_TASKS = prometheus_client.Counter(
+    "devagent_worker_tasks",
+    "Celery tasks of the review pipeline",
+    ["task", "status"],
+)
+
+CACHE_REQUESTS = prometheus_client.Counter(
+    "devagent_cache_requests",
+    "Lookups of the caches",
+    ["cache", "result"],
+)
+
+
+def observe_stage(span: StageTiming) -> None:
+    status = "failed" if span.failed else "succeeded"
+    STAGE_DURATION.labels(span.stage, status).observe(span.duration)
+
+    rule = span.labels.get("rule", None)
+    if rule != None:
+        RULE_DURATION.labels(span.stage, rule, status).observe(span.duration)
+
+
+def observe_cache(cache: str, hits: int, misses: int) -> None:
+    if hits > 0:
+        CACHE_REQUESTS.labels(cache, "hit").inc(hits)
+    if misses > 0:
+        CACHE_REQUESTS.labels(cache, "miss").inc(misses)
+
+
+def metrics_registry() -> prometheus_client.CollectorRegistry:
+    """Registry with the metrics of this process, or of all processes in multiprocess mode
+
+    Multiprocess mode is enabled by `PROMETHEUS_MULTIPROC_DIR`, as required by
+    celery prefork pool, where tasks are run by the child processes.
+    """
+
+    if not _is_multiprocess():
+        return prometheus_client.REGISTRY
+
+    registry = prometheus_client.CollectorRegistry()
+    prometheus_client.multiprocess.MultiProcessCollector(registry)  # type: ignore
+    return registry
+
+
+def reset_multiprocess_dir() -> None:
+    """Remove metrics of the previous run, expected to be called before the processes are forked"""
+
+    if not _is_multiprocess():
+        return
+
+    dir = os.environ[_MULTIPROC_DIR_ENV]
+    shutil.rmtree(dir, ignore_errors=True)
+    os.makedirs(dir, exist_ok=True)
+
+
+def mark_process_dead(pid: int) -> None:
+    if _is_multiprocess():
+        prometheus_client.multiprocess.mark_process_dead(pid)  # type: ignore
+
+
+###########
+# private #
+###########
+
+
+_MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def _is_multiprocess() -> bool:
+    return len(os.environ.get(_MULTIPROC_DIR_ENV, "")) > 0
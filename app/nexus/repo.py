@@ -1,34 +1,153 @@
+import asyncio
+import os
+import time
+import typing
 import requests
+import requests.adapters
 
 
 class NexusRepo:
+    """Uploads files to the raw nexus repository
+
+    Connections are pooled in the session and reused between uploads.
+    Uploads are plain PUT requests, which are idempotent, so failed uploads
+    are retried by sending the whole file again.
+    """
+
     _username: str
     _password: str
     _repo: str
+    _session: requests.Session
+    _timeout: tuple[float, float]
+    _retries: int
+    _backoff: float
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        repo: str,
+        timeout: tuple[float, float] = (10, 300),
+        retries: int = 3,
+        backoff: float = 2,
+        pool_size: int = 4,
+    ):
+        """
+        Args:
+            username (str): nexus user
+            password (str): password of the nexus user
+            repo (str): url of the repository
+            timeout (tuple[float, float]): connect and read timeouts of a request, in seconds
+            retries (int): amount of retries of the failed upload
+            backoff (float): delay before the first retry, in seconds. Doubles with each retry
+            pool_size (int): amount of connections kept open to the nexus host
+        """
 
-    def __init__(self, username: str, password: str, repo: str):
         self._username = username
         self._password = password
         self._repo = repo
+        self._timeout = timeout
+        self._retries = retries
+        self._backoff = backoff
+
+        self._session = requests.Session()
+        self._session.auth = (username, password)
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def close(self) -> None:
+        self._session.close()
 
     def upload_file(self, local_path: str, remote_path: str) -> str:
         with open(local_path, "rb") as f:
-            data = f.read()
+            return self.upload_fileobj(f, os.path.getsize(local_path), remote_path)
+
+    def upload_fileobj(
+        self, fileobj: typing.IO[bytes], size: int, remote_path: str
+    ) -> str:
+        """Upload contents of the file object, reading it in chunks
+
+        Args:
+            fileobj (typing.IO[bytes]): seekable file object positioned at the start of the data
+            size (int): amount of bytes to upload
+            remote_path (str): path of the file in the repo
+
+        Returns:
+            str: url of the uploaded file
+        """
 
         file_url = f"{self._repo}/{remote_path}"
+        start = fileobj.tell()
+        tries_left = self._retries
+
+        while True:
+            fileobj.seek(start)
+            try:
+                response = self._session.put(
+                    file_url,
+                    data=_SizedReader(fileobj, size),
+                    timeout=self._timeout,
+                )
+                if response.status_code in _RETRIABLE_STATUS_CODES:
+                    raise _RetriableError(
+                        f"Received error code {response.status_code}:{response.reason}"
+                    )
+            except (requests.ConnectionError, requests.Timeout, _RetriableError) as e:
+                if tries_left > 0:
+                    tries_left -= 1
+                    print(
+                        f"[tries left: {tries_left}] Upload to {file_url} failed with the exception {str(e)}"
+                    )
+                    time.sleep(self._backoff * 2 ** (self._retries - tries_left - 1))
+                    continue
+                raise Exception(f"Upload to {file_url} failed : {str(e)}")
+
+            if not response.ok:
+                raise Exception(
+                    f"Received error code {response.status_code}:{response.reason}"
+                )
+
+            return file_url
+
+    async def upload_fileobj_async(
+        self, fileobj: typing.IO[bytes], size: int, remote_path: str
+    ) -> str:
+        """Same as `upload_fileobj`, but runs in a thread not to block the event loop"""
+
+        return await asyncio.to_thread(self.upload_fileobj, fileobj, size, remote_path)
+
+
+###########
+# private #
+###########
+
+
+_RETRIABLE_STATUS_CODES = [408, 429, 500, 502, 503, 504]
+
+
+class _RetriableError(Exception):
+    pass
+
+
+class _SizedReader:
+    """File object wrapper with known length
+
+    requests sends objects with `read` in chunks and takes Content-Length from `len`,
+    so the body is never loaded into memory as a whole.
+    """
+
+    _fileobj: typing.IO[bytes]
+    _size: int
+
+    def __init__(self, fileobj: typing.IO[bytes], size: int) -> None:
+        self._fileobj = fileobj
+        self._size = size
+
+    def __len__(self) -> int:
+        return self._size
 
-        try:
-            response = requests.put(
-                file_url,
-                auth=(self._username, self._password),
-                data=data,
-            )
-        except Exception as e:
-            raise e
-
-        if not response.ok:
-            raise Exception(
-                f"Received error code {response.status_code}:{response.reason}"
-            )
-
-        return file_url
+    def read(self, size: int = -1) -> bytes:
+        return self._fileobj.read(size)
@@ -1,7 +1,18 @@
-import re
+import io
+import functools
 from dataclasses import dataclass
-from typing import Literal
+from typing import Callable, Iterable, Literal
 
+from app.diff.models.diff import DiffFile
+from app.patch.file_types import (
+    FileType,
+    FileTypeClassifier,
+    DEFAULT_FILE_TYPE_CLASSIFIER,
+)
+
+# patch contexts are cached across reviews by the diff, this version and the
+# fingerprint of the file type table, bump it whenever the output of the summaries changes
+ANALYZER_VERSION = 1
 
 @dataclass
 class FileInfo:
@@ -18,35 +29,7 @@ class FileInfo:
 
     state: Literal["modified", "added", "removed", "renamed"] = "modified"
 
-    type: Literal[
-        "other",
-        "runtime",
-        "runtime ETS stdlib",
-        "front-end",
-        "front-end parser",
-        "front-end checker",
-        "front-end AST verifier",
-        "front-end code generator",
-        "test",
-        "unit test",
-        "front-end test",
-        "negative front-end test",
-        "positive front-end test",
-        "CTS test",
-        "positive CTS test",
-        "negative CTS test",
-        "functional test",
-        "negative functional test",
-        "positive functional test",
-    ] = "other"
-
-    @staticmethod
-    def _is_cpp_file(s: str) -> bool:
-        return s.endswith(".cpp") or s.endswith(".h")
-
-    @staticmethod
-    def _is_ets_file(s: str) -> bool:
-        return s.endswith(".ets") or s.endswith(".sts")
+    type: FileType = "other"
 
     def _assertParsed(self) -> None:
         assert len(self.old_name) > 0
@@ -80,52 +63,16 @@ class FileInfo:
             if self.num_added_lines == 0 and self.num_removed_lines == 0:
                 self.state = "renamed"
 
-    def _inferFileType(self) -> None:
+    def _inferFileType(self, classifier: FileTypeClassifier) -> None:
         assert self.type == "other"
+        self.type = classifier.classify(self.new_name)
 
-        path = self.new_name
-        if "/test" in path:
-            self.type = "test"
-
-            if FileInfo._is_cpp_file(path):
-                self.type = "unit test"
-            elif FileInfo._is_ets_file(path):
-                if "ets2panda/test" in path:
-                    self.type = "front-end test"
-                    if "ets2panda/test/ast" in path:
-                        self.type = "negative front-end test"
-                    elif "ets2panda/test/runtime" in path:
-                        self.type = "positive front-end test"
-                elif "tests/ets-templates" in path:
-                    self.type = "CTS test"
-                    # TODO(igelhaus): inference for positive / negative cases
-                elif "ets_func_tests" in path:
-                    self.type = "functional test"
-                    # TODO(igelhaus): inference for positive / negative cases
-
-        elif "ets2panda/" in path:
-            self.type = "front-end"
-
-            if FileInfo._is_cpp_file(path):
-                if "ets2panda/parser/" in path or "ets2panda/ir/" in path:
-                    self.type = "front-end parser"
-                elif "ets2panda/checker/" in path:
-                    self.type = "front-end checker"
-                elif "ets2panda/ast_verifier" in path:
-                    self.type = "front-end AST verifier"
-                elif "ETSGen." in path or "ETSemitter." in path:
-                    self.type = "front-end code generator"
-
-        elif "static_core/" in path:
-            if "stdlib/" in path:
-                self.type = "runtime ETS stdlib"
-            elif FileInfo._is_cpp_file(path):
-                self.type = "runtime"
-
-    def enrich(self) -> None:
+    def enrich(
+        self, classifier: FileTypeClassifier = DEFAULT_FILE_TYPE_CLASSIFIER
+    ) -> None:
         self._assertParsed()
         self._inferState()
-        self._inferFileType()
+        self._inferFileType(classifier)
 
     def removesAssertions(self) -> bool:
         return self.num_removed_assertions > self.num_added_assertions
@@ -135,16 +82,19 @@ class FileInfo:
 
 
 class PatchAnalyzer:
-    """Parse unified diff patches into structured project-specific data."""
+    """Parse unified diff patches into structured project-specific data.
 
-    OLD_FILE_HEADER = re.compile(r"^--- (?:a/)?(.+)$")
-    NEW_FILE_HEADER = re.compile(r"^\+\+\+ (?:b/)?(.+)$")
+    The patch is read in a single pass. Per-category totals used by the summaries
+    are accumulated as files are parsed, so rendering a summary does not
+    re-iterate `file_facts`.
+    """
 
     @staticmethod
     def _contains_any_assertion(s: str) -> bool:
         """Heuristic: Determines if a string s contains an assertion."""
 
-        return "ES2PANDA_ASSERT(" in s or "arktest.assert" in s or "ASSERT(" in s
+        # "ES2PANDA_ASSERT(" is covered by "ASSERT("
+        return "ASSERT(" in s or "arktest.assert" in s
 
     @staticmethod
     def _contains_cte_check(s: str) -> bool:
@@ -152,75 +102,91 @@ class PatchAnalyzer:
 
         return "/* @@" in s
 
-    def __init__(self, patch_name: str) -> None:
+    def __init__(
+        self,
+        patch_name: str,
+        classifier: FileTypeClassifier = DEFAULT_FILE_TYPE_CLASSIFIER,
+    ) -> None:
         """Initialize the analyzer with the patch.
 
         Args:
             patch_name: Path to the patch file in the unified diff format
+            classifier: Table of the file types of the reviewed repository
         """
 
         self.patch_name = patch_name
+        self.classifier = classifier
         self.file_facts = list[FileInfo]()
+        self._totals = _PatchTotals()
+        self._lines: Callable[[], Iterable[str]] | None = None
+        self._diff_files: Iterable[DiffFile] | None = None
+
+    @classmethod
+    def from_lines(
+        cls,
+        lines: Iterable[str],
+        classifier: FileTypeClassifier = DEFAULT_FILE_TYPE_CLASSIFIER,
+    ) -> "PatchAnalyzer":
+        """Initialize the analyzer with the lines of the patch in the unified diff format.
+
+        Lines may keep their line endings. Iterable is traversed on each `analyze` call.
+        """
+
+        pa = cls(_IN_MEMORY_PATCH, classifier)
+        pa._lines = lambda: lines
+        return pa
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes | memoryview,
+        classifier: FileTypeClassifier = DEFAULT_FILE_TYPE_CLASSIFIER,
+    ) -> "PatchAnalyzer":
+        """Initialize the analyzer with the utf-8 encoded patch in the unified diff format."""
+
+        pa = cls(_IN_MEMORY_PATCH, classifier)
+        pa._lines = lambda: io.TextIOWrapper(io.BytesIO(data), encoding="utf-8")
+        return pa
+
+    @classmethod
+    def from_diff_files(
+        cls,
+        files: Iterable[DiffFile],
+        classifier: FileTypeClassifier = DEFAULT_FILE_TYPE_CLASSIFIER,
+    ) -> "PatchAnalyzer":
+        """Initialize the analyzer with the files of the diff.
+
+        Each DiffFile is a single file, so line counts are taken from
+        `added_lines` and `removed_lines` of the DiffFile instead of being recounted.
+        """
+
+        pa = cls(_IN_MEMORY_PATCH, classifier)
+        pa._diff_files = files
+        return pa
 
     def _commit_file_info(self, fi: FileInfo | None) -> None:
         """Appends a new FileInfo item fi to the internal storage."""
 
         if fi is None:
             return
-        fi.enrich()
+        fi.enrich(self.classifier)
         self.file_facts.append(fi)
+        self._totals.add(fi)
 
     def analyze(self) -> bool:
         """Reads the patch creating a FileInfo item per each parsed file."""
 
         self.file_facts.clear()
+        self._totals = _PatchTotals()
 
         try:
-            with open(self.patch_name, "r") as patch:
-                curr_file: FileInfo | None = None
-
-                for line in patch:
-                    if match := self.OLD_FILE_HEADER.match(line):
-                        self._commit_file_info(curr_file)
-
-                        curr_file = FileInfo()
-                        curr_file.old_name = match.group(1)
-
-                    elif match := self.NEW_FILE_HEADER.match(line):
-                        assert curr_file is not None
-                        curr_file.new_name = match.group(1)
-
-                    elif line.startswith("@@"):
-                        assert curr_file is not None
-
-                    elif line.startswith("+"):
-                        assert curr_file is not None
-                        curr_file.num_added_lines += 1
-                        if PatchAnalyzer._contains_any_assertion(line):
-                            curr_file.num_added_assertions += 1
-                        if PatchAnalyzer._contains_cte_check(line):
-                            curr_file.num_added_cte_checks += 1
-
-                    elif line.startswith("-"):
-                        assert curr_file is not None
-                        curr_file.num_removed_lines += 1
-                        if PatchAnalyzer._contains_any_assertion(line):
-                            curr_file.num_removed_assertions += 1
-                        if PatchAnalyzer._contains_cte_check(line):
-                            curr_file.num_removed_cte_checks += 1
-
-                    elif line.startswith(" "):
-                        assert curr_file is not None
-                        if PatchAnalyzer._contains_any_assertion(line):
-                            curr_file.num_context_assertions += 1
-                        if PatchAnalyzer._contains_cte_check(line):
-                            curr_file.num_context_cte_checks += 1
-
-                    else:
-                        pass
-
-                assert curr_file is not None
-                self._commit_file_info(curr_file)
+            if self._diff_files is not None:
+                self._analyze_diff_files(self._diff_files)
+            elif self._lines is not None:
+                self._analyze_lines(self._lines())
+            else:
+                with open(self.patch_name, "r") as patch:
+                    self._analyze_lines(patch)
         except FileNotFoundError:
             print(f"Error: The file '{self.patch_name}' was not found.")
             return False
@@ -230,150 +196,92 @@ class PatchAnalyzer:
 
         return True
 
-    def _countFrontendContribs(self) -> tuple[int, int]:
-        """Private: Yet another contrib counter."""
+    def _analyze_lines(self, lines: Iterable[str]) -> None:
+        contains_any_assertion = PatchAnalyzer._contains_any_assertion
+        contains_cte_check = PatchAnalyzer._contains_cte_check
+        curr_file: FileInfo | None = None
 
-        num_added: int = 0
-        num_removed: int = 0
-        for fi in self.file_facts:
-            if "front-end" in fi.type and not "test" in fi.type:
-                num_added += fi.num_added_lines
-                num_removed += fi.num_removed_lines
-        return (num_added, num_removed)
-
-    def _countRuntimeContribs(self) -> tuple[int, int]:
-        """Private: Yet another contrib counter."""
+        for line in lines:
+            # dispatch on the first character, header lines are checked first,
+            # same as the unified diff headers take precedence over the hunk lines
+            first = line[:1]
 
-        num_added: int = 0
-        num_removed: int = 0
-        for fi in self.file_facts:
-            if "runtime" in fi.type and not "test" in fi.type:
-                num_added += fi.num_added_lines
-                num_removed += fi.num_removed_lines
-        return (num_added, num_removed)
-
-    def _countETSStdlibContribs(self) -> tuple[int, int]:
-        """Private: Yet another contrib counter."""
-
-        num_added: int = 0
-        num_removed: int = 0
-        for fi in self.file_facts:
-            if fi.type == "runtime ETS stdlib":
-                num_added += fi.num_added_lines
-                num_removed += fi.num_removed_lines
-        return (num_added, num_removed)
-
-    def _countParserContribs(self) -> tuple[int, int]:
-        """Private: Yet another contrib counter."""
-
-        num_added: int = 0
-        num_removed: int = 0
-        for fi in self.file_facts:
-            if fi.type == "front-end parser":
-                num_added += fi.num_added_lines
-                num_removed += fi.num_removed_lines
-        return (num_added, num_removed)
-
-    def _countCheckerContribs(self) -> tuple[int, int]:
-        """Private: Yet another contrib counter."""
-
-        num_added: int = 0
-        num_removed: int = 0
-        for fi in self.file_facts:
-            if fi.type == "front-end checker":
-                num_added += fi.num_added_lines
-                num_removed += fi.num_removed_lines
-
-        return (num_added, num_removed)
-
-    def _countASTVerifierContribs(self) -> tuple[int, int]:
-        """Private: Yet another contrib counter."""
-
-        num_added: int = 0
-        num_removed: int = 0
-        for fi in self.file_facts:
-            if fi.type == "front-end AST verifier":
-                num_added += fi.num_added_lines
-                num_removed += fi.num_removed_lines
-        return (num_added, num_removed)
+            if first == "-":
+                name = _header_name(line, "--- ", "a/")
+                if name is not None:
+                    self._commit_file_info(curr_file)
+                    curr_file = FileInfo()
+                    curr_file.old_name = name
+                    continue
 
-    def _countCodegenContribs(self) -> tuple[int, int]:
-        """Private: Yet another contrib counter."""
-
-        num_added: int = 0
-        num_removed: int = 0
-        for fi in self.file_facts:
-            if fi.type == "front-end code generator":
-                num_added += fi.num_added_lines
-                num_removed += fi.num_removed_lines
-        return (num_added, num_removed)
-
-    def _countTestContribs(self) -> tuple[int, int]:
-        """Private: Yet another contrib counter."""
-
-        num_added: int = 0
-        num_removed: int = 0
-        for fi in self.file_facts:
-            if "test" in fi.type:
-                num_added += fi.num_added_lines
-                num_removed += fi.num_removed_lines
-        return (num_added, num_removed)
-
-    def _countAddedTests(self) -> int:
-        """Private: Yet another file counter."""
-
-        n: int = 0
-        for fi in self.file_facts:
-            if "test" in fi.type and fi.state == "added":
-                n += 1
-        return n
-
-    def _countRemovedTests(self) -> int:
-        """Private: Yet another file counter."""
-
-        n: int = 0
-        for fi in self.file_facts:
-            if "test" in fi.type and fi.state == "removed":
-                n += 1
-        return n
-
-    def _countModifiedTests(self) -> int:
-        """Private: Yet another file counter."""
-
-        n: int = 0
-        for fi in self.file_facts:
-            if "test" in fi.type and fi.state == "modified":
-                n += 1
-        return n
-
-    def _countPositiveTestsWithoutAssertions(self) -> int:
-        """Private: Yet another file counter."""
-
-        n: int = 0
-
-        for fi in self.file_facts:
-            if not "test" in fi.type:
-                continue
-            if not "positive" in fi.type:
-                continue
+                assert curr_file is not None
+                curr_file.num_removed_lines += 1
+                if contains_any_assertion(line):
+                    curr_file.num_removed_assertions += 1
+                if contains_cte_check(line):
+                    curr_file.num_removed_cte_checks += 1
+
+            elif first == "+":
+                name = _header_name(line, "+++ ", "b/")
+                if name is not None:
+                    assert curr_file is not None
+                    curr_file.new_name = name
+                    continue
 
-            if fi.state == "added" and fi.num_added_assertions == 0:
-                n += 1
+                assert curr_file is not None
+                curr_file.num_added_lines += 1
+                if contains_any_assertion(line):
+                    curr_file.num_added_assertions += 1
+                if contains_cte_check(line):
+                    curr_file.num_added_cte_checks += 1
 
-            if fi.state == "removed" and fi.num_removed_assertions > 0:
-                n += 1
+            elif first == " ":
+                assert curr_file is not None
+                if contains_any_assertion(line):
+                    curr_file.num_context_assertions += 1
+                if contains_cte_check(line):
+                    curr_file.num_context_cte_checks += 1
 
-            if fi.state == "modified" and fi.removesAssertions():
-                n += 1
+            elif first == "@" and line.startswith("@@"):
+                assert curr_file is not None
 
-        return n
+        assert curr_file is not None
+        self._commit_file_info(curr_file)
+
+    def _analyze_diff_files(self, files: Iterable[DiffFile]) -> None:
+        for file in files:
+            curr_file = FileInfo()
+            curr_file.num_added_lines = file.added_lines
+            curr_file.num_removed_lines = file.removed_lines
+
+            in_hunk = False
+            for line in file.diff.split("\n"):
+                if not in_hunk:
+                    # headers may only precede the first hunk
+                    if line.startswith("@@"):
+                        in_hunk = True
+                    elif (name := _header_name(line, "--- ", "a/")) is not None:
+                        curr_file.old_name = name
+                    elif (name := _header_name(line, "+++ ", "b/")) is not None:
+                        curr_file.new_name = name
+                    continue
+
+                _count_markers(curr_file, line)
+
+            # binary and mode-only changes have no ---/+++ headers
+            if len(curr_file.old_name) == 0:
+                curr_file.old_name = file.file
+            if len(curr_file.new_name) == 0:
+                curr_file.new_name = file.file
+
+            self._commit_file_info(curr_file)
 
     def verboseFrontEndSummary(self) -> str:
         """Based on the patch, summarizes front-end contribution
         informartion into a human-readable string.
         """
 
-        fe_contribs = self._countFrontendContribs()
+        fe_contribs = self._totals.loc(_FRONTEND)
 
         if fe_contribs[0] + fe_contribs[1] == 0:
             return "This patch does not contribute to the front-end.\n\n"
@@ -385,7 +293,7 @@ class PatchAnalyzer:
         summary += "are removed"
         summary += ".\n\n"
 
-        parser_contribs = self._countParserContribs()
+        parser_contribs = self._totals.loc(_PARSER)
         if parser_contribs[0] + parser_contribs[1]:
             summary += f"In particular, {parser_contribs[0]} LoC "
             summary += "are added to the parser, "
@@ -393,7 +301,7 @@ class PatchAnalyzer:
             summary += "are removed from the parser"
             summary += ".\n\n"
 
-        checker_contribs = self._countCheckerContribs()
+        checker_contribs = self._totals.loc(_CHECKER)
         if checker_contribs[0] + checker_contribs[1]:
             summary += f"In particular, {checker_contribs[0]} LoC "
             summary += "are added to the type checker, "
@@ -401,7 +309,7 @@ class PatchAnalyzer:
             summary += "are removed from the type checker"
             summary += ".\n\n"
 
-        astverifier_contribs = self._countASTVerifierContribs()
+        astverifier_contribs = self._totals.loc(_AST_VERIFIER)
         if astverifier_contribs[0] + astverifier_contribs[1]:
             summary += f"In particular, {astverifier_contribs[0]} LoC "
             summary += "are added to the AST verifier, "
@@ -409,7 +317,7 @@ class PatchAnalyzer:
             summary += "are removed from the AST verifier"
             summary += ".\n\n"
 
-        codegen_contribs = self._countCodegenContribs()
+        codegen_contribs = self._totals.loc(_CODEGEN)
         if codegen_contribs[0] + codegen_contribs[1]:
             summary += f"In particular, {codegen_contribs[0]} LoC "
             summary += "are added to the code generator, "
@@ -424,16 +332,16 @@ class PatchAnalyzer:
         informartion into a human-readable string.
         """
 
-        num_added_tests = self._countAddedTests()
-        num_removed_tests = self._countRemovedTests()
-        num_modified_tests = self._countModifiedTests()
+        num_added_tests = self._totals.counters[_ADDED_TESTS]
+        num_removed_tests = self._totals.counters[_REMOVED_TESTS]
+        num_modified_tests = self._totals.counters[_MODIFIED_TESTS]
 
         if num_added_tests + num_removed_tests + num_modified_tests == 0:
             return "The patch does not contribute to the tests.\n\n"
 
         summary = "This patch contributes to the tests.\n\n"
 
-        test_contribs = self._countTestContribs()
+        test_contribs = self._totals.loc(_TEST)
         summary += f"Overall, {test_contribs[0]} LoC "
         summary += "are added to the tests, and "
         summary += f"{test_contribs[1]} LoC "
@@ -460,7 +368,9 @@ class PatchAnalyzer:
         )
         summary += ".\n\n"
 
-        num_without_assertions = self._countPositiveTestsWithoutAssertions()
+        num_without_assertions = self._totals.counters[
+            _POSITIVE_TESTS_WITHOUT_ASSERTIONS
+        ]
         if num_without_assertions > 0:
             summary += f"The patch has {num_without_assertions} "
             summary += "positive tests which decrease assertion usage"
@@ -469,12 +379,11 @@ class PatchAnalyzer:
         return summary
 
     def verboseRuntimeSummary(self) -> str:
-        summary = ""
         """Based on the patch, summarizes runtime contribution
         informartion into a human-readable string.
         """
 
-        rt_contribs = self._countRuntimeContribs()
+        rt_contribs = self._totals.loc(_RUNTIME)
 
         if rt_contribs[0] + rt_contribs[1] == 0:
             return "This patch does not contribute to the runtime.\n\n"
@@ -486,7 +395,7 @@ class PatchAnalyzer:
         summary += "are removed"
         summary += ".\n\n"
 
-        stdlib_contribs = self._countETSStdlibContribs()
+        stdlib_contribs = self._totals.loc(_ETS_STDLIB)
         if stdlib_contribs[0] + stdlib_contribs[1]:
             summary += f"In particular, {stdlib_contribs[0]} LoC "
             summary += "are added to the ETS stdlib, "
@@ -518,4 +427,129 @@ class PatchAnalyzer:
         return raw
 
 
+###########
+# private #
+###########
+
+
+# categories of the contributed lines
+_FRONTEND = 0
+_PARSER = 1
+_CHECKER = 2
+_AST_VERIFIER = 3
+_CODEGEN = 4
+_RUNTIME = 5
+_ETS_STDLIB = 6
+_TEST = 7
+_NUM_CATEGORIES = 8
+
+# counters of the files
+_ADDED_TESTS = 0
+_REMOVED_TESTS = 1
+_MODIFIED_TESTS = 2
+_POSITIVE_TESTS_WITHOUT_ASSERTIONS = 3
+_NUM_COUNTERS = 4
+
+
+# types come from the rule table, so categories are resolved on the first use of the type
+@functools.cache
+def _type_categories(type: str) -> tuple[int, ...]:
+    categories = list[int]()
+    if "front-end" in type and not "test" in type:
+        categories.append(_FRONTEND)
+    if type == "front-end parser":
+        categories.append(_PARSER)
+    if type == "front-end checker":
+        categories.append(_CHECKER)
+    if type == "front-end AST verifier":
+        categories.append(_AST_VERIFIER)
+    if type == "front-end code generator":
+        categories.append(_CODEGEN)
+    if "runtime" in type and not "test" in type:
+        categories.append(_RUNTIME)
+    if type == "runtime ETS stdlib":
+        categories.append(_ETS_STDLIB)
+    if "test" in type:
+        categories.append(_TEST)
+    return tuple(categories)
+
+
+
+class _PatchTotals:
+    """Per-category totals of the patch, kept in flat lists"""
+
+    __slots__ = ("lines", "counters")
+
+    # added and removed lines of each category, interleaved
+    lines: list[int]
+    counters: list[int]
+
+    def __init__(self) -> None:
+        self.lines = [0] * (2 * _NUM_CATEGORIES)
+        self.counters = [0] * _NUM_COUNTERS
+
+    def loc(self, category: int) -> tuple[int, int]:
+        return (self.lines[2 * category], self.lines[2 * category + 1])
+
+    def add(self, fi: FileInfo) -> None:
+        for category in _type_categories(fi.type):
+            self.lines[2 * category] += fi.num_added_lines
+            self.lines[2 * category + 1] += fi.num_removed_lines
+
+        if not "test" in fi.type:
+            return
+
+        if fi.state == "added":
+            self.counters[_ADDED_TESTS] += 1
+        elif fi.state == "removed":
+            self.counters[_REMOVED_TESTS] += 1
+        elif fi.state == "modified":
+            self.counters[_MODIFIED_TESTS] += 1
+
+        if "positive" in fi.type and (
+            (fi.state == "added" and fi.num_added_assertions == 0)
+            or (fi.state == "removed" and fi.num_removed_assertions > 0)
+            or (fi.state == "modified" and fi.removesAssertions())
+        ):
+            self.counters[_POSITIVE_TESTS_WITHOUT_ASSERTIONS] += 1
+
+
+_IN_MEMORY_PATCH = "<in-memory patch>"
+
+
+def _count_markers(fi: FileInfo, line: str) -> None:
+    first = line[:1]
+    if first == "+":
+        if PatchAnalyzer._contains_any_assertion(line):
+            fi.num_added_assertions += 1
+        if PatchAnalyzer._contains_cte_check(line):
+            fi.num_added_cte_checks += 1
+    elif first == "-":
+        if PatchAnalyzer._contains_any_assertion(line):
+            fi.num_removed_assertions += 1
+        if PatchAnalyzer._contains_cte_check(line):
+            fi.num_removed_cte_checks += 1
+    elif first == " ":
+        if PatchAnalyzer._contains_any_assertion(line):
+            fi.num_context_assertions += 1
+        if PatchAnalyzer._contains_cte_check(line):
+            fi.num_context_cte_checks += 1
+
+
+def _header_name(line: str, marker: str, prefix: str) -> str | None:
+    """Name of the file from the `--- a/name` or `+++ b/name` header, None if line is not a header"""
+
+    if not line.startswith(marker):
+        return None
+
+    name = line[len(marker) :]
+    if name.endswith("\n"):
+        name = name[:-1]
+    if len(name) > len(prefix) and name.startswith(prefix):
+        name = name[len(prefix) :]
+    if len(name) == 0:
+        return None
+    return name
+
+
 __all__ = ["PatchAnalyzer", "FileInfo"]
@@ -0,0 +1,257 @@
+import re
+import json
+import hashlib
+import typing
+import pydantic
+
+
+# types are defined by the rule table, so tables of other repositories bring their
+# own. Summaries of the patch group the types by the words they contain: "front-end",
+# "runtime", "test", "positive", see BUILTIN_FILE_TYPES for the types of the default table
+FileType = typing.Annotated[str, pydantic.StringConstraints(min_length=1)]
+
+BUILTIN_FILE_TYPES = [
+    "other",
+    "runtime",
+    "runtime ETS stdlib",
+    "front-end",
+    "front-end parser",
+    "front-end checker",
+    "front-end AST verifier",
+    "front-end code generator",
+    "test",
+    "unit test",
+    "front-end test",
+    "negative front-end test",
+    "positive front-end test",
+    "CTS test",
+    "positive CTS test",
+    "negative CTS test",
+    "functional test",
+    "negative functional test",
+    "positive functional test",
+]
+
+
+class FileTypeRule(pydantic.BaseModel):
+    """Entry of the ordered file type table
+
+    Rule matches the path if the path contains any of `contains` and ends with
+    any of `suffixes`, empty list matches any path. Rules of the same level are
+    tried in order, the first matching rule assigns it's `type` (if set) and
+    it's nested `rules` are tried to refine the type.
+    """
+
+    contains: list[str] = []
+    suffixes: list[str] = []
+    type: FileType | None = None
+    rules: list["FileTypeRule"] = []
+
+
+class FileTypeClassifier:
+    """Infers the type of the file from it's path using the table of rules
+
+    Each level of the table is compiled into a single regex and results are
+    memoised per path, since the same paths are seen by review after review.
+    """
+
+    _rules: list[FileTypeRule]
+    _root: "_CompiledRules"
+    _fingerprint: str
+    _cache: dict[str, FileType]
+    _max_cached_paths: int
+
+    def __init__(
+        self, rules: list[FileTypeRule], max_cached_paths: int = 64 * 1024
+    ) -> None:
+        self._rules = rules
+        self._root = _CompiledRules(rules)
+        self._fingerprint = _rules_fingerprint(rules)
+        self._cache = dict()
+        self._max_cached_paths = max_cached_paths
+
+    @staticmethod
+    def from_json(path: str) -> "FileTypeClassifier":
+        """Load the table from the json list of `FileTypeRule`"""
+
+        with open(path) as f:
+            rules = [FileTypeRule.model_validate(rule) for rule in json.load(f)]
+        return FileTypeClassifier(rules)
+
+    def fingerprint(self) -> str:
+        """Content address of the rule table, tells results of the different tables apart"""
+
+        return self._fingerprint
+
+    def __reduce__(self) -> tuple[typing.Any, ...]:
+        # sent to the analysis processes by it's rules, without the memoised paths
+        return (FileTypeClassifier, (self._rules, self._max_cached_paths))
+
+    def classify(self, path: str) -> FileType:
+        type = self._cache.get(path, None)
+        if type != None:
+            assert type is not None
+            return type
+
+        type = self._root.classify(path, "other")
+
+        if len(self._cache) >= self._max_cached_paths:
+            self._cache.clear()
+        self._cache.update({path: type})
+
+        return type
+
+
+_CPP_SUFFIXES = [".cpp", ".h"]
+_ETS_SUFFIXES = [".ets", ".sts"]
+
+DEFAULT_FILE_TYPE_RULES = [
+    FileTypeRule(
+        contains=["/test"],
+        type="test",
+        rules=[
+            FileTypeRule(suffixes=_CPP_SUFFIXES, type="unit test"),
+            FileTypeRule(
+                suffixes=_ETS_SUFFIXES,
+                rules=[
+                    FileTypeRule(
+                        contains=["ets2panda/test"],
+                        type="front-end test",
+                        rules=[
+                            FileTypeRule(
+                                contains=["ets2panda/test/ast"],
+                                type="negative front-end test",
+                            ),
+                            FileTypeRule(
+                                contains=["ets2panda/test/runtime"],
+                                type="positive front-end test",
+                            ),
+                        ],
+                    ),
+                    # TODO(igelhaus): inference for positive / negative cases
+                    FileTypeRule(
+                        contains=["tests/ets-templates"], type="CTS test"
+                    ),
+                    FileTypeRule(
+                        contains=["ets_func_tests"], type="functional test"
+                    ),
+                ],
+            ),
+        ],
+    ),
+    FileTypeRule(
+        contains=["ets2panda/"],
+        type="front-end",
+        rules=[
+            FileTypeRule(
+                suffixes=_CPP_SUFFIXES,
+                rules=[
+                    FileTypeRule(
+                        contains=["ets2panda/parser/", "ets2panda/ir/"],
+                        type="front-end parser",
+                    ),
+                    FileTypeRule(
+                        contains=["ets2panda/checker/"], type="front-end checker"
+                    ),
+                    FileTypeRule(
+                        contains=["ets2panda/ast_verifier"],
+                        type="front-end AST verifier",
+                    ),
+                    FileTypeRule(
+                        contains=["ETSGen.", "ETSemitter."],
+                        type="front-end code generator",
+                    ),
+                ],
+            ),
+        ],
+    ),
+    FileTypeRule(
+        contains=["static_core/"],
+        rules=[
+            FileTypeRule(contains=["stdlib/"], type="runtime ETS stdlib"),
+            FileTypeRule(suffixes=_CPP_SUFFIXES, type="runtime"),
+        ],
+    ),
+]
+
+
+###########
+# private #
+###########
+
+
+class _CompiledRules:
+    """Single level of the table
+
+    Alternatives of the regex are anchored at the start of the path and made
+    of lookaheads only, so they are tried in the order of the rules, not in the
+    order of their matches in the path.
+    """
+
+    _pattern: re.Pattern[str] | None
+    _rules: list[tuple[FileType | None, "_CompiledRules"]]
+
+    def __init__(self, rules: list[FileTypeRule]) -> None:
+        self._rules = [(rule.type, _CompiledRules(rule.rules)) for rule in rules]
+
+        if len(rules) == 0:
+            self._pattern = None
+            return
+
+        alternatives = [
+            f"(?P<r{i}>{_rule_pattern(rule)})" for i, rule in enumerate(rules)
+        ]
+        self._pattern = re.compile("^(?:" + "|".join(alternatives) + ")", re.DOTALL)
+
+    def classify(self, path: str, type: FileType) -> FileType:
+        if self._pattern == None:
+            return type
+        assert self._pattern is not None
+
+        match = self._pattern.match(path)
+        if match == None:
+            return type
+        assert match is not None and match.lastgroup is not None
+
+        rule_type, nested = self._rules[int(match.lastgroup[1:])]
+        return nested.classify(path, rule_type or type)
+
+
+def _rule_pattern(rule: FileTypeRule) -> str:
+    pattern = ""
+    if len(rule.contains) > 0:
+        pattern += f"(?=.*?(?:{_any_of(rule.contains)}))"
+    if len(rule.suffixes) > 0:
+        pattern += f"(?=.*(?:{_any_of(rule.suffixes)})\\Z)"
+    return pattern
+
+
+def _any_of(strings: list[str]) -> str:
+    return "|".join(re.escape(s) for s in strings)
+
+
+def _rules_fingerprint(rules: list[FileTypeRule]) -> str:
+    table = json.dumps([rule.model_dump() for rule in rules], sort_keys=True)
+    return hashlib.sha256(table.encode("utf-8")).hexdigest()
+
+
+DEFAULT_FILE_TYPE_CLASSIFIER = FileTypeClassifier(DEFAULT_FILE_TYPE_RULES)
+
+
+def load_file_type_classifier(path: str) -> FileTypeClassifier:
+    """Classifier of the rule table at `path`, the default table if the path is empty"""
+
+    if len(path) == 0:
+        return DEFAULT_FILE_TYPE_CLASSIFIER
+    return FileTypeClassifier.from_json(path)
+
+
+__all__ = [
+    "FileType",
+    "BUILTIN_FILE_TYPES",
+    "FileTypeRule",
+    "FileTypeClassifier",
+    "DEFAULT_FILE_TYPE_RULES",
+    "DEFAULT_FILE_TYPE_CLASSIFIER",
+    "load_file_type_classifier",
+]
@@ -1,8 +1,13 @@
 import redis.asyncio
-import jsonschema
 import pydantic
 
-from app.redis.schemas.task_info import TASK_INFO_SCHEMA
+from app.blob.blob import compress_blob, decompress_blob
+from app.redis.schemas.task_timings import StageTiming
+from app.redis.schemas.task_info import (
+    TASK_INFO_VALIDATOR,
+    task_info_task_id_key,
+    task_info_is_valid_key,
+)
 
 
 class AsyncRedisConfig(pydantic.BaseModel):
@@ -29,10 +34,26 @@ class AsyncRedis:
     def config(self) -> AsyncRedisConfig:
         return self._conf
 
+    def pool_status(self) -> tuple[int, int] | None:
+        """Connections of the pool
+
+        Returns:
+            tuple[int, int] | None: connections in use and idle connections, None if the pool does not track them
+        """
+
+        # redis-py does not expose the counters, so they are taken from the private
+        # pool state, which may change with any release
+        pool = self._conn.connection_pool
+        in_use = getattr(pool, "_in_use_connections", None)
+        available = getattr(pool, "_available_connections", None)
+        if in_use == None or available == None:
+            return None
+        return len(in_use), len(available)
+
     async def set_task_info(
         self, task_info: dict[str, str], expiry: int | None = None
     ) -> None:
-        jsonschema.validate(task_info, TASK_INFO_SCHEMA)
+        TASK_INFO_VALIDATOR.validate(task_info)
 
         task_id = str(task_info["task_id"])
         task_info = dict((k, str(v)) for k, v in task_info.items())
@@ -56,9 +77,212 @@ class AsyncRedis:
             (k.decode("utf-8"), v.decode("utf-8")) for k, v in task_info.items()
         )
 
-        jsonschema.validate(decoded, TASK_INFO_SCHEMA)
+        TASK_INFO_VALIDATOR.validate(decoded)
 
         return decoded
 
+    async def get_task_info_fields(
+        self, task_id: str, keys: list[str]
+    ) -> dict[str, str] | None:
+        """Read only the requested fields of the task info
+
+        Args:
+            task_id (str): id of the task
+            keys (list[str]): fields of the task info to read
+
+        Returns:
+            dict[str, str] | None: requested fields that exist in the task info, None if task info expired or never existed
+        """
+
+        for key in keys:
+            if not task_info_is_valid_key(key):
+                raise Exception(f"Invalid task info key {key}")
+
+        # task id is always requested to tell expired task info from missing fields
+        requested_keys = [task_info_task_id_key()] + keys
+
+        # since async redis is used, it is always Awaitable
+        values = await self._conn.hmget(task_id, requested_keys)  # type: ignore
+
+        if values[0] == None:
+            # task_info expired or never existed
+            return None
+
+        return dict(
+            (key, value.decode("utf-8"))
+            for key, value in zip(requested_keys, values)
+            if value != None
+        )
+
+    async def missing_blobs(self, keys: list[str]) -> list[str]:
+        """Filter out the blobs that are already stored
+
+        Args:
+            keys (list[str]): content addresses of the blobs
+
+        Returns:
+            list[str]: keys of the blobs that are not stored
+        """
+
+        unique_keys = list(dict.fromkeys(keys))
+
+        pipe = self._conn.pipeline(transaction=False)
+        for key in unique_keys:
+            pipe.exists(_blob_redis_key(key))
+        exists = await pipe.execute()
+
+        return [key for key, e in zip(unique_keys, exists) if not e]
+
+    async def set_blobs(
+        self,
+        blobs: dict[str, str | bytes],
+        touch: list[str] | None = None,
+        expiry: int | None = None,
+    ) -> None:
+        """Store compressed blobs, already stored blobs are not overwritten
+
+        Args:
+            blobs (dict[str, str | bytes]): content address mapped to the content, str is encoded as utf-8
+            touch (list[str] | None): keys of already stored blobs whose expiry should be extended
+            expiry (int | None): expiry of the blobs, defaults to the expiry from config
+        """
+
+        ex = expiry or self._conf.expiry
+
+        pipe = self._conn.pipeline(transaction=False)
+        for key, content in blobs.items():
+            pipe.set(_blob_redis_key(key), compress_blob(content), ex=ex, nx=True)
+        for key in list(blobs.keys()) + (touch or list()):
+            # blob may be shared with the task info that expires later
+            pipe.expire(_blob_redis_key(key), ex, gt=True)
+        await pipe.execute()
+
+    async def get_blobs(self, keys: list[str]) -> dict[str, str]:
+        """Read blobs by their content addresses
+
+        Args:
+            keys (list[str]): content addresses of the blobs
+
+        Returns:
+            dict[str, str]: content address mapped to the content, missing blobs are omitted
+        """
+
+        unique_keys = list(dict.fromkeys(keys))
+        if len(unique_keys) == 0:
+            return dict()
+
+        values = await self._conn.mget([_blob_redis_key(key) for key in unique_keys])
+
+        return dict(
+            (key, decompress_blob(value))
+            for key, value in zip(unique_keys, values)
+            if value != None
+        )
+
+    async def get_patch_contexts(
+        self, diff_hashes: list[str], version: str
+    ) -> dict[str, str]:
+        """Read cached contexts of the patches
+
+        Args:
+            diff_hashes (list[str]): content addresses of the patches
+            version (str): version of the analyzer and of the file type table that generated the contexts
+
+        Returns:
+            dict[str, str]: content address of the patch mapped to the content of it's context, misses are omitted
+        """
+
+        unique_hashes = list(dict.fromkeys(diff_hashes))
+        if len(unique_hashes) == 0:
+            return dict()
+
+        values = await self._conn.mget(
+            [_patch_context_redis_key(h, version) for h in unique_hashes]
+        )
+        context_keys = dict(
+            (h, value.decode("utf-8"))
+            for h, value in zip(unique_hashes, values)
+            if value != None
+        )
+
+        # context blob may expire before the mapping, such entries are misses
+        blobs = await self.get_blobs(list(context_keys.values()))
+
+        return dict(
+            (h, blobs[key]) for h, key in context_keys.items() if key in blobs
+        )
+
+    async def set_patch_contexts(
+        self, context_keys: dict[str, str], version: str, expiry: int | None = None
+    ) -> None:
+        """Cache contexts of the patches, contexts themselves are expected to be stored as blobs
+
+        Args:
+            context_keys (dict[str, str]): content address of the patch mapped to the content address of it's context
+            version (str): version of the analyzer and of the file type table that generated the contexts
+            expiry (int | None): expiry of the entries, defaults to the expiry from config
+        """
+
+        ex = expiry or self._conf.expiry
+
+        pipe = self._conn.pipeline(transaction=False)
+        for h, key in context_keys.items():
+            pipe.set(_patch_context_redis_key(h, version), key, ex=ex)
+        await pipe.execute()
+
+    async def add_task_timings(
+        self, root_task_id: str, timings: list[StageTiming], expiry: int | None = None
+    ) -> None:
+        """Append timing spans of the stages to the spans of the review
+
+        Args:
+            root_task_id (str): id of the root task of the review
+            timings (list[StageTiming]): spans to append
+            expiry (int | None): expiry of the spans, defaults to the expiry from config
+        """
+
+        if len(timings) == 0:
+            return
+
+        key = _task_timings_redis_key(root_task_id)
+
+        pipe = self._conn.pipeline(transaction=True)
+        pipe.rpush(key, *[timing.model_dump_json() for timing in timings])
+        pipe.expire(key, expiry or self._conf.expiry)
+        await pipe.execute()
+
+    async def get_task_timings(self, root_task_id: str) -> list[StageTiming]:
+        """Read timing spans of the review in the order they were stored
+
+        Args:
+            root_task_id (str): id of the root task of the review
+
+        Returns:
+            list[StageTiming]: spans of the review, empty if they expired or were never stored
+        """
+
+        key = _task_timings_redis_key(root_task_id)
+        # since async redis is used, it is always Awaitable
+        values = await self._conn.lrange(key, 0, -1)  # type: ignore
+
+        return [StageTiming.model_validate_json(value) for value in values]
+
     async def close(self) -> None:
         await self._conn.close()
+
+
+###########
+# private #
+###########
+
+
+def _blob_redis_key(key: str) -> str:
+    return f"blob:{key}"
+
+
+def _patch_context_redis_key(diff_hash: str, version: str) -> str:
+    return f"patch_context:{version}:{diff_hash}"
+
+
+def _task_timings_redis_key(root_task_id: str) -> str:
+    return f"task_timings:{root_task_id}"
@@ -1,3 +1,5 @@
+import jsonschema
+
 _TASK_INFO_PATCH_CONTENT_PREFIX = "patch_content_"
 
 _TASK_INFO_PATCH_CONTEXT_PREFIX = "patch_context_"
@@ -62,12 +64,14 @@ TASK_INFO_SCHEMA = {
     "patternProperties": {
         # TODO: fix when new rules are added or patch format changes
         f"^{_TASK_INFO_PATCH_CONTENT_PREFIX}.*$": {
-            "description": "Patch name mapped to the content of the patch",
+            "description": "Patch name mapped to the blob key of the content of the patch",
             "type": "string",
+            "pattern": "^[0-9a-f]{64}$",
         },
         f"^{_TASK_INFO_PATCH_CONTEXT_PREFIX}.*$": {
-            "description": "Patch name mapped to the context of the patch",
+            "description": "Patch name mapped to the blob key of the context of the patch",
             "type": "string",
+            "pattern": "^[0-9a-f]{64}$",
         },
         f"^{_TASK_INFO_RULE_PREFIX}.*$": {
             "description": "Rule name mapped to the patch name",
@@ -85,3 +89,7 @@ TASK_INFO_SCHEMA = {
     ],
     "additionalProperties": False,
 }
+
+# compiled once, so validation does not check the schema and build validator on every call
+TASK_INFO_VALIDATOR = jsonschema.Draft202012Validator(TASK_INFO_SCHEMA)
+TASK_INFO_VALIDATOR.check_schema(TASK_INFO_SCHEMA)
@@ -0,0 +1,14 @@
+import pydantic
+
+
+class StageTiming(pydantic.BaseModel):
+    """Timing span of a single stage of the review pipeline"""
+
+    stage: str
+    # celery task that ran the stage, root task id is the key of the spans
+    task_id: str
+    # unix time, seconds
+    started_at: float
+    duration: float
+    failed: bool = False
+    labels: dict[str, str] = dict()
@@ -8,14 +8,17 @@ from app.nexus.repo import NexusRepo
 
 from app.routes.api.v1.devagent.tasks.code_review.code_review import (
     code_review,
+    Action as CodeReviewAction,
     Response as CodeReviewResponse,
 )
 from app.routes.api.v1.devagent.tasks.user_feedback.user_feedback import (
     user_feedback,
+    Action as UserFeedbackAction,
     Response as UserFeedbackResponse,
 )
 from app.routes.api.v1.devagent.tasks.dataset.dataset import (
     dataset,
+    Action as DatasetAction,
     Response as DatasetResponse,
 )
 
@@ -26,6 +29,14 @@ class TaskKind(enum.IntEnum):
     TASK_KIND_DATASET = 3  # Collect db info into dataset
 
 
+# valid actions of each task kind
+TASK_KIND_ACTIONS = {
+    TaskKind.TASK_KIND_CODE_REVIEW.value: [e.value for e in CodeReviewAction],
+    TaskKind.TASK_KIND_USER_FEEDBACK.value: [e.value for e in UserFeedbackAction],
+    TaskKind.TASK_KIND_DATASET.value: [e.value for e in DatasetAction],
+}
+
+
 Response = CodeReviewResponse | UserFeedbackResponse | DatasetResponse
 
 
@@ -60,7 +71,9 @@ async def endpoint_api_v1_devagent(
         )
 
     if TaskKind.TASK_KIND_DATASET.value == task_kind:
-        return await dataset(db=db, nexus=nexus, action=action)
+        return await dataset(
+            db=db, nexus=nexus, action=action, query_params=query_params
+        )
 
     raise fastapi.HTTPException(
         status_code=500,
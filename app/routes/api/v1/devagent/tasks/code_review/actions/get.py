@@ -6,6 +6,8 @@ import celery.result  # type: ignore
 import celery.states  # type: ignore
 
 from app.devagent.worker import devagent_worker
+from app.redis.async_redis import AsyncRedis
+from app.redis.schemas.task_timings import StageTiming
 from app.devagent.stages.review_patches import ReviewPatchResult
 from app.devagent.stages.review_wrapup import ProcessedReview, process_review_result
 from app.routes.api.v1.devagent.tasks.validation import validate_query_params
@@ -13,6 +15,8 @@ from app.routes.api.v1.devagent.tasks.validation import validate_query_params
 
 class QueryParams(pydantic.BaseModel):
     payload: str
+    # attach timing spans of the stages of the review
+    timings: bool = False
 
 
 class TaskStatus(enum.IntEnum):
@@ -26,10 +30,31 @@ class Response(pydantic.BaseModel):
     task_id: str
     task_status: int
     task_result: None | str | ProcessedReview
+    task_timings: list[StageTiming] | None = None
 
 
 @validate_query_params(QueryParams)
-def action_get(query_params: QueryParams) -> Response:
+async def action_get(redis: AsyncRedis, query_params: QueryParams) -> Response:
+    response = _get_response(query_params)
+
+    if query_params.timings:
+        try:
+            response.task_timings = await redis.get_task_timings(response.task_id)
+        except Exception as e:
+            raise fastapi.HTTPException(
+                status_code=500,
+                detail=f"[code_review_get] Exception {type(e)} occured during reading timings of {query_params.payload}: {str(e)}",
+            )
+
+    return response
+
+
+###########
+# private #
+###########
+
+
+def _get_response(query_params: QueryParams) -> Response:
     try:
         parent_task = devagent_worker.AsyncResult(query_params.payload)
         parent_task_status, parent_task_result = _get_task_status_and_result(
@@ -90,11 +115,6 @@ def action_get(query_params: QueryParams) -> Response:
         )
 
 
-###########
-# private #
-###########
-
-
 def _get_task_status_and_result(
     task: celery.result.AsyncResult,
 ) -> tuple[TaskStatus, typing.Any]:
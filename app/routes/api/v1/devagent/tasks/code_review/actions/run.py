@@ -2,6 +2,7 @@ import fastapi
 import pydantic
 import asyncio
 
+from app.config import CONFIG
 from app.redis.async_redis import AsyncRedis
 from app.db.async_db import AsyncDBSession
 from app.diff.provider import DiffProvider
@@ -26,14 +27,23 @@ async def action_run(
 ) -> Response:
     try:
         urls = _parse_urls(query_params.payload)
-        diffs = await asyncio.gather(
-            *[asyncio.to_thread(diff_provider.get_diff, url) for url in urls]
-        )
-        task = review_init.s(
-            [diff.model_dump() for diff in diffs],
-            db.config().model_dump(),
-            redis.config().model_dump(),
-        ).apply_async()
+        if CONFIG.DIFF_FETCH_IN_WORKER:
+            # only urls go through the broker, worker fetches diffs itself
+            task = review_init.s(
+                list(),
+                db.config().model_dump(),
+                redis.config().model_dump(),
+                urls=urls,
+            ).apply_async()
+        else:
+            diffs = await asyncio.gather(
+                *[asyncio.to_thread(diff_provider.get_diff, url) for url in urls]
+            )
+            task = review_init.s(
+                [diff.model_dump() for diff in diffs],
+                db.config().model_dump(),
+                redis.config().model_dump(),
+            ).apply_async()
         print(f"started task {task.id} for payload {query_params.payload}")
     except fastapi.HTTPException as httpe:
         raise httpe
@@ -54,7 +54,7 @@ async def code_review(
     _validate_action(action)
 
     if Action.ACTION_GET.value == action:
-        return action_get(query_params=query_params)
+        return await action_get(redis=redis, query_params=query_params)
 
     if Action.ACTION_RUN.value == action:
         return await action_run(
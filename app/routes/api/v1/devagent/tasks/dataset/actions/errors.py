@@ -1,61 +1,39 @@
 import os
 import fastapi
 import pydantic
-import tempfile
-import shutil
-import datetime
+import pyarrow
 
 from app.db.async_db import AsyncDBSession
+from app.dataset.export import export_dataset, Row
+from app.dataset.zip_export import ZipEntry
+from app.dataset.formats import DatasetFormat, create_dataset_writer
 from app.nexus.repo import NexusRepo
+from app.routes.api.v1.devagent.tasks.validation import validate_query_params
+
+
+class QueryParams(pydantic.BaseModel):
+    incremental: bool = False  # export only rows changed since the previous export
+    format: DatasetFormat = DatasetFormat.ZIP
 
 
 class Response(pydantic.BaseModel):
     archive: str
 
 
-async def action_errors(db: AsyncDBSession, nexus: NexusRepo) -> Response:
+@validate_query_params(QueryParams)
+async def action_errors(
+    db: AsyncDBSession, nexus: NexusRepo, query_params: QueryParams
+) -> Response:
     try:
-        wd = tempfile.mkdtemp()
-
-        errors = await db.select_errors(None)
-
-        for error in errors:
-            error_wd = os.path.abspath(os.path.join(wd, str(error.id)))
-            os.makedirs(error_wd)
-
-            env_file = os.path.join(error_wd, ".env")
-            with open(env_file, "w") as e:
-                e.write(f"PROJECT={error.project}\n")
-                e.write(f"REV_PROJECT={error.rev_project}\n")
-                e.write(f"REV_DEV_RULES={error.rev_devagent}\n")
-                e.write(f"REV_DEVAGENT={error.rev_arkcompiler_development_rules}\n")
-                e.write(f"RULE={error.rule}\n")
-                e.write(f"MESSAGE={error.message}\n")
-
-            patch = await db.get_patch(str(error.patch))
-
-            if patch == None:
-                raise Exception(f"No patch found with id {id} in the db")
-
-            patch_file = os.path.join(error_wd, str(error.patch))
-            with open(patch_file, "w") as p:
-                patch_content = str(patch.content)
-                p.write(patch_content)
-
-            context_file = os.path.join(error_wd, "context.md")
-            with open(context_file, "w") as p:
-                if patch.context == None:
-                    context = ""
-                else:
-                    context = str(patch.context)
-                p.write(context)
-        archive = os.path.join(
-            tempfile.mkdtemp(),
-            f"errors-{datetime.datetime.now().date()}-{int(datetime.datetime.now().timestamp())}",
-        )
-        shutil.make_archive(archive, "zip", wd, ".")
-        archive_url = nexus.upload_file(
-            f"{archive}.zip", os.path.basename(f"{archive}.zip")
+        archive_url = await export_dataset(
+            db=db,
+            nexus=nexus,
+            dataset="errors",
+            incremental=query_params.incremental,
+            stream=db.stream_errors_with_patches,
+            writer=create_dataset_writer(
+                query_params.format, _error_entries, _ERRORS_SCHEMA
+            ),
         )
     except fastapi.HTTPException as httpe:
         raise httpe
@@ -66,3 +44,50 @@ async def action_errors(db: AsyncDBSession, nexus: NexusRepo) -> Response:
         )
     else:
         return Response(archive=archive_url)
+
+
+###########
+# private #
+###########
+
+
+_ERRORS_SCHEMA = pyarrow.schema(
+    dict[str, pyarrow.DataType](
+        {
+            "id": pyarrow.int64(),
+            "rev_arkcompiler_development_rules": pyarrow.string(),
+            "rev_devagent": pyarrow.string(),
+            "project": pyarrow.string(),
+            "rev_project": pyarrow.string(),
+            "patch": pyarrow.string(),
+            "rule": pyarrow.string(),
+            "message": pyarrow.string(),
+            "created_at": pyarrow.timestamp("us"),
+            "updated_at": pyarrow.timestamp("us"),
+        }
+    )
+)
+
+
+def _error_entries(error: Row) -> list[ZipEntry]:
+    if error.patch_content == None:
+        raise Exception(f"No patch found with id {error.patch} in the db")
+
+    error_wd = str(error.id)
+
+    env = ""
+    env += f"PROJECT={error.project}\n"
+    env += f"REV_PROJECT={error.rev_project}\n"
+    env += f"REV_DEV_RULES={error.rev_devagent}\n"
+    env += f"REV_DEVAGENT={error.rev_arkcompiler_development_rules}\n"
+    env += f"RULE={error.rule}\n"
+    env += f"MESSAGE={error.message}\n"
+
+    return [
+        (os.path.join(error_wd, ".env"), env),
+        (os.path.join(error_wd, str(error.patch)), str(error.patch_content)),
+        (
+            os.path.join(error_wd, "context.md"),
+            "" if error.patch_context == None else str(error.patch_context),
+        ),
+    ]
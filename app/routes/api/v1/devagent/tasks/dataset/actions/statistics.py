@@ -0,0 +1,76 @@
+import datetime
+import fastapi
+import pydantic
+import sqlalchemy
+import typing
+
+from app.db.async_db import AsyncDBSession
+from app.db.schemas.user_feedback import Feedback
+from app.routes.api.v1.devagent.tasks.validation import validate_query_params
+
+
+class QueryParams(pydantic.BaseModel):
+    date_from: datetime.date | None = None  # inclusive
+    date_to: datetime.date | None = None  # exclusive
+    rule: str | None = None
+    project: str | None = None
+
+
+class RuleStatistics(pydantic.BaseModel):
+    rule: str
+    true_positive: int
+    false_positive: int
+    precision: float | None  # None if there is no TP/FP feedback for the rule
+
+
+class Response(pydantic.BaseModel):
+    statistics: list[RuleStatistics]
+
+
+@validate_query_params(QueryParams)
+async def action_statistics(db: AsyncDBSession, query_params: QueryParams) -> Response:
+    try:
+        rows = await db.query_feedback_stats(
+            day_from=query_params.date_from,
+            day_to=query_params.date_to,
+            rule=query_params.rule,
+            project=query_params.project,
+        )
+        statistics = _rule_statistics(rows)
+    except fastapi.HTTPException as httpe:
+        raise httpe
+    except Exception as e:
+        raise fastapi.HTTPException(
+            status_code=500,
+            detail=f"[dataset_statistics] Exception {type(e)} occured during handling of task dataset statistics: {str(e)}",
+        )
+    else:
+        return Response(statistics=statistics)
+
+
+###########
+# private #
+###########
+
+
+def _rule_statistics(rows: list[sqlalchemy.Row[typing.Any]]) -> list[RuleStatistics]:
+    counts = dict[str, dict[int, int]]()
+    for row in rows:
+        rule_counts = counts.get(str(row.rule), dict[int, int]())
+        rule_counts.update({int(row.feedback): int(row.total)})
+        counts.update({str(row.rule): rule_counts})
+
+    statistics = list[RuleStatistics]()
+    for rule, rule_counts in counts.items():
+        tp = rule_counts.get(Feedback.TRUE_POSITIVE.value, 0)
+        fp = rule_counts.get(Feedback.FALSE_POSITIVE.value, 0)
+        statistics.append(
+            RuleStatistics(
+                rule=rule,
+                true_positive=tp,
+                false_positive=fp,
+                precision=(tp / (tp + fp)) if tp + fp > 0 else None,
+            )
+        )
+
+    return statistics
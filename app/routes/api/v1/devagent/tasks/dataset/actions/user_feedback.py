@@ -1,70 +1,40 @@
 import os
 import fastapi
 import pydantic
-import tempfile
-import shutil
-import datetime
+import pyarrow
 
 from app.db.async_db import AsyncDBSession
 from app.db.schemas.user_feedback import Feedback
+from app.dataset.export import export_dataset, Row
+from app.dataset.zip_export import ZipEntry
+from app.dataset.formats import DatasetFormat, create_dataset_writer
 from app.nexus.repo import NexusRepo
+from app.routes.api.v1.devagent.tasks.validation import validate_query_params
+
+
+class QueryParams(pydantic.BaseModel):
+    incremental: bool = False  # export only rows changed since the previous export
+    format: DatasetFormat = DatasetFormat.ZIP
 
 
 class Response(pydantic.BaseModel):
     archive: str
 
 
-async def action_user_feedback(db: AsyncDBSession, nexus: NexusRepo) -> Response:
+@validate_query_params(QueryParams)
+async def action_user_feedback(
+    db: AsyncDBSession, nexus: NexusRepo, query_params: QueryParams
+) -> Response:
     try:
-        wd = tempfile.mkdtemp()
-
-        user_feedback = await db.select_user_feebdack(None)
-
-        for feedback in user_feedback:
-            feedback_wd = os.path.abspath(
-                os.path.join(
-                    wd,
-                    str(feedback.rule),
-                    Feedback(int(feedback.feedback)).name,
-                    str(feedback.id),
-                )
-            )
-            os.makedirs(feedback_wd, exist_ok=True)
-
-            env_file = os.path.join(feedback_wd, ".env")
-            with open(env_file, "w") as e:
-                e.write(f"PROJECT={feedback.project}\n")
-                e.write(f"REV_PROJECT={feedback.rev_project}\n")
-                e.write(f"REV_DEV_RULES={feedback.rev_devagent}\n")
-                e.write(f"REV_DEVAGENT={feedback.rev_arkcompiler_development_rules}\n")
-                e.write(f"RULE={feedback.rule}\n")
-                e.write(f"FILE={feedback.file}\n")
-                e.write(f"LINE={feedback.line}\n")
-
-            patch = await db.get_patch(str(feedback.patch))
-
-            if patch == None:
-                raise Exception(f"No patch found with id {id} in the db")
-
-            patch_file = os.path.join(feedback_wd, str(feedback.patch))
-            with open(patch_file, "w") as p:
-                patch_content = str(patch.content)
-                p.write(patch_content)
-
-            context_file = os.path.join(feedback_wd, "context.md")
-            with open(context_file, "w") as p:
-                if patch.context == None:
-                    context = ""
-                else:
-                    context = str(patch.context)
-                p.write(context)
-        archive = os.path.join(
-            tempfile.mkdtemp(),
-            f"user-feedback-{datetime.datetime.now().date()}-{int(datetime.datetime.now().timestamp())}",
-        )
-        shutil.make_archive(archive, "zip", wd, ".")
-        archive_url = nexus.upload_file(
-            f"{archive}.zip", os.path.basename(f"{archive}.zip")
+        archive_url = await export_dataset(
+            db=db,
+            nexus=nexus,
+            dataset="user-feedback",
+            incremental=query_params.incremental,
+            stream=db.stream_user_feedback_with_patches,
+            writer=create_dataset_writer(
+                query_params.format, _feedback_entries, _USER_FEEDBACK_SCHEMA
+            ),
         )
     except fastapi.HTTPException as httpe:
         raise httpe
@@ -75,3 +45,57 @@ async def action_user_feedback(db: AsyncDBSession, nexus: NexusRepo) -> Response
         )
     else:
         return Response(archive=archive_url)
+
+
+###########
+# private #
+###########
+
+
+_USER_FEEDBACK_SCHEMA = pyarrow.schema(
+    dict[str, pyarrow.DataType](
+        {
+            "id": pyarrow.int64(),
+            "rev_arkcompiler_development_rules": pyarrow.string(),
+            "rev_devagent": pyarrow.string(),
+            "project": pyarrow.string(),
+            "rev_project": pyarrow.string(),
+            "patch": pyarrow.string(),
+            "rule": pyarrow.string(),
+            "file": pyarrow.string(),
+            "line": pyarrow.int64(),
+            "feedback": pyarrow.int64(),
+            "created_at": pyarrow.timestamp("us"),
+            "updated_at": pyarrow.timestamp("us"),
+        }
+    )
+)
+
+
+def _feedback_entries(feedback: Row) -> list[ZipEntry]:
+    if feedback.patch_content == None:
+        raise Exception(f"No patch found with id {feedback.patch} in the db")
+
+    feedback_wd = os.path.join(
+        str(feedback.rule),
+        Feedback(int(feedback.feedback)).name,
+        str(feedback.id),
+    )
+
+    env = ""
+    env += f"PROJECT={feedback.project}\n"
+    env += f"REV_PROJECT={feedback.rev_project}\n"
+    env += f"REV_DEV_RULES={feedback.rev_devagent}\n"
+    env += f"REV_DEVAGENT={feedback.rev_arkcompiler_development_rules}\n"
+    env += f"RULE={feedback.rule}\n"
+    env += f"FILE={feedback.file}\n"
+    env += f"LINE={feedback.line}\n"
+
+    return [
+        (os.path.join(feedback_wd, ".env"), env),
+        (os.path.join(feedback_wd, str(feedback.patch)), str(feedback.patch_content)),
+        (
+            os.path.join(feedback_wd, "context.md"),
+            "" if feedback.patch_context == None else str(feedback.patch_context),
+        ),
+    ]
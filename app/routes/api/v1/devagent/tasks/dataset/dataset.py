@@ -13,20 +13,26 @@ from app.routes.api.v1.devagent.tasks.dataset.actions.user_feedback import (
     action_user_feedback,
     Response as UserFeedbackResponse,
 )
+from app.routes.api.v1.devagent.tasks.dataset.actions.statistics import (
+    action_statistics,
+    Response as StatisticsResponse,
+)
 
 
 class Action(enum.IntEnum):
     ACTION_ERRORS = 0
     ACTION_USER_FEEDBACK = 1
+    ACTION_STATISTICS = 2  # Per rule feedback statistics
 
 
-Response = ErrorsResponse | UserFeedbackResponse
+Response = ErrorsResponse | UserFeedbackResponse | StatisticsResponse
 
 
 async def dataset(
     db: AsyncDBSession,
     nexus: NexusRepo,
     action: int,
+    query_params: dict[str, typing.Any],
 ) -> Response:
     """Create dataset from the information stored in db
 
@@ -45,10 +51,15 @@ async def dataset(
     _validate_action(action)
 
     if Action.ACTION_ERRORS.value == action:
-        return await action_errors(db=db, nexus=nexus)
+        return await action_errors(db=db, nexus=nexus, query_params=query_params)
 
     if Action.ACTION_USER_FEEDBACK.value == action:
-        return await action_user_feedback(db=db, nexus=nexus)
+        return await action_user_feedback(
+            db=db, nexus=nexus, query_params=query_params
+        )
+
+    if Action.ACTION_STATISTICS.value == action:
+        return await action_statistics(db=db, query_params=query_params)
 
     raise fastapi.HTTPException(
         status_code=500,
@@ -14,6 +14,7 @@ from app.redis.schemas.task_info import (
     task_info_patch_content_key,
     task_info_patch_context_key,
     task_info_project_revision_key,
+    task_info_is_valid_key,
 )
 
 
@@ -34,7 +35,20 @@ async def action_set(
     try:
         project, file, line, rule = _decrypt_project_file_line_rule(query_params.data)
 
-        task_info = await redis.get_task_info(query_params.task_id)
+        if not task_info_is_valid_key(rule):
+            raise fastapi.HTTPException(
+                status_code=400,
+                detail=f"Invalid rule {rule} for task {query_params.task_id}",
+            )
+
+        ark_dev_rules_rev_key = task_info_rules_revision_key()
+        devagent_rev_key = task_info_devagent_revision_key()
+        project_rev_key = task_info_project_revision_key(project)
+
+        task_info = await redis.get_task_info_fields(
+            query_params.task_id,
+            [ark_dev_rules_rev_key, devagent_rev_key, project_rev_key, rule],
+        )
 
         if task_info == None:
             raise fastapi.HTTPException(
@@ -42,22 +56,36 @@ async def action_set(
                 detail=f"Task info for task {query_params.task_id} expired or never existed",
             )
 
-        ark_dev_rules_rev_key = task_info_rules_revision_key()
         ark_rev_rules_rev = task_info[ark_dev_rules_rev_key]
-
-        devagent_rev_key = task_info_devagent_revision_key()
         devagent_rev = task_info[devagent_rev_key]
-
-        project_rev_key = task_info_project_revision_key(project)
         project_rev = task_info[project_rev_key]
-
         patch_name = task_info[rule]
 
         patch_content_key = task_info_patch_content_key(patch_name)
-        patch_content = task_info[patch_content_key]
-
         patch_context_key = task_info_patch_context_key(patch_name)
-        patch_context = task_info[patch_context_key]
+
+        patch_info = await redis.get_task_info_fields(
+            query_params.task_id, [patch_content_key, patch_context_key]
+        )
+
+        if patch_info == None:
+            raise fastapi.HTTPException(
+                status_code=400,
+                detail=f"Task info for task {query_params.task_id} expired or never existed",
+            )
+
+        patch_content_blob = patch_info[patch_content_key]
+        patch_context_blob = patch_info[patch_context_key]
+
+        blobs = await redis.get_blobs([patch_content_blob, patch_context_blob])
+        patch_content = blobs.get(patch_content_blob, None)
+        patch_context = blobs.get(patch_context_blob, None)
+
+        if patch_content == None or patch_context == None:
+            raise fastapi.HTTPException(
+                status_code=400,
+                detail=f"Patch {patch_name} for task {query_params.task_id} expired or never existed",
+            )
 
         await db.insert_patch_if_does_not_exist(
             patch_name, patch_content, patch_context
@@ -1,8 +1,16 @@
 import time
+import math
 import logging
-import inspect
 import enum
+import random
+import threading
+import functools
+import asyncio
 import typing
+import pydantic
+
+RT = typing.TypeVar("RT")  # return type
+P = typing.ParamSpec("P")  # parameters
 
 
 class TimerResolution(enum.Enum):
@@ -10,41 +18,123 @@ class TimerResolution(enum.Enum):
     NANOSECONDS = 1
 
 
+class TimerStats(pydantic.BaseModel):
+    """Aggregated measurements of the label, in seconds
+
+    Percentiles are estimated from a bounded uniform sample of the measurements.
+    """
+
+    label: str
+    count: int
+    total: float
+    min: float
+    max: float
+    p50: float
+    p90: float
+    p99: float
+
+
+class TimerRegistry:
+    """Aggregates measurements of the timers per label
+
+    Recording is O(1): count, sum, min and max are updated in place and
+    measurements are reservoir-sampled for the percentiles.
+    """
+
+    _max_samples: int
+    _lock: threading.Lock
+    _entries: dict[str, "_TimerEntry"]
+
+    def __init__(self, max_samples: int = 1024) -> None:
+        self._max_samples = max_samples
+        self._lock = threading.Lock()
+        self._entries = dict()
+
+    def record(self, label: str, elapsed_ns: int) -> None:
+        with self._lock:
+            entry = self._entries.get(label, None)
+            if entry == None:
+                entry = _TimerEntry()
+                self._entries.update({label: entry})
+            assert entry is not None
+            entry.add(elapsed_ns, self._max_samples)
+
+    def stats(self, label: str) -> TimerStats | None:
+        with self._lock:
+            entry = self._entries.get(label, None)
+            if entry == None:
+                return None
+            assert entry is not None
+            return entry.stats(label)
+
+    def summary(self) -> list[TimerStats]:
+        with self._lock:
+            return [
+                entry.stats(label) for label, entry in sorted(self._entries.items())
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def timer(self, label: str) -> "Timer":
+        return Timer(label, TimerResolution.NANOSECONDS, registry=self)
+
+
 class Timer:
-    def __init__(self, res: TimerResolution = TimerResolution.SECONDS):
-        self.log = logging.getLogger(
-            f"{self.__class__.__name__}] [{inspect.stack()[1].function}"
-        )
-        self.log.setLevel(logging.INFO)
+    """Measures elapsed time with the monotonic `perf_counter_ns`
 
-        self.res = res
-        self.time = time.time if res is TimerResolution.SECONDS else time.time_ns
+    On exit of the context the measurement is recorded to the registry if it
+    is given, otherwise it is logged.
+    """
 
-        self.tic: float | int | None = None
-        self.toc: float | int | None = None
-        self.running: bool = False
+    __slots__ = ("label", "res", "registry", "tic", "toc")
+
+    label: str
+    res: TimerResolution
+    registry: TimerRegistry | None
+    tic: int | None
+    toc: int | None
+
+    def __init__(
+        self,
+        label: str = "timer",
+        res: TimerResolution = TimerResolution.SECONDS,
+        registry: TimerRegistry | None = None,
+    ) -> None:
+        self.label = label
+        self.res = res
+        self.registry = registry
+        self.tic = None
+        self.toc = None
 
     def is_running(self) -> bool:
         return self.tic != None and self.toc == None
 
     def reset(self) -> None:
-        tic = self.time()
-
-        self.tic = tic
         self.toc = None
+        self.tic = time.perf_counter_ns()
 
     def stop(self) -> None:
-        toc = self.time()
+        toc = time.perf_counter_ns()
 
         if self.is_running():
             self.toc = toc
 
-    def measure(self) -> float | int | None:
-        if not self.tic or not self.toc:
+    def elapsed_ns(self) -> int | None:
+        if self.tic == None or self.toc == None:
             return None
+        assert self.tic is not None and self.toc is not None
         return self.toc - self.tic
 
-    def __enter__(self):  # type: ignore
+    def measure(self) -> float | int | None:
+        elapsed = self.elapsed_ns()
+        if elapsed == None or self.res is TimerResolution.NANOSECONDS:
+            return elapsed
+        assert elapsed is not None
+        return elapsed / 1e9
+
+    def __enter__(self) -> "Timer":
         self.reset()
         return self
 
@@ -52,6 +142,125 @@ class Timer:
         self, exc_type: typing.Any, exc: typing.Any, traceback: typing.Any
     ) -> None:
         self.stop()
-        self.log.info(
-            f"elapsed: {self.measure()}{'s' if self.res is TimerResolution.SECONDS else 'ns'}"
+
+        if self.registry != None:
+            assert self.registry is not None and self.tic is not None
+            assert self.toc is not None
+            self.registry.record(self.label, self.toc - self.tic)
+            return
+
+        _log.info(
+            f"[{self.label}] elapsed: {self.measure()}{'s' if self.res is TimerResolution.SECONDS else 'ns'}"
+        )
+
+
+def timed(
+    label: str | None = None, registry: TimerRegistry | None = None
+) -> typing.Callable[[typing.Callable[P, RT]], typing.Callable[P, RT]]:
+    """Decorator recording the duration of each call to the registry
+
+    Args:
+        label (str | None): label of the measurements, defaults to the qualified name of the function
+        registry (TimerRegistry | None): registry of the measurements, defaults to `TIMERS`
+    """
+
+    def decorator(func: typing.Callable[P, RT]) -> typing.Callable[P, RT]:
+        # resolved once, so calls only pay for the clock and the record
+        func_label = label or func.__qualname__
+        func_registry = registry or TIMERS
+
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> typing.Any:
+                tic = time.perf_counter_ns()
+                try:
+                    awaitable = typing.cast(
+                        typing.Awaitable[typing.Any], func(*args, **kwargs)
+                    )
+                    return await awaitable
+                finally:
+                    func_registry.record(func_label, time.perf_counter_ns() - tic)
+
+            # calling the coroutine function returns the coroutine, i.e. RT
+            return typing.cast(typing.Callable[P, RT], async_wrapper)
+
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> RT:
+            tic = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                func_registry.record(func_label, time.perf_counter_ns() - tic)
+
+        return wrapper
+
+    return decorator
+
+
+# process-wide registry
+TIMERS = TimerRegistry()
+
+
+###########
+# private #
+###########
+
+
+_log = logging.getLogger("Timer")
+_log.setLevel(logging.INFO)
+
+
+class _TimerEntry:
+    __slots__ = ("count", "total_ns", "min_ns", "max_ns", "samples")
+
+    count: int
+    total_ns: int
+    min_ns: int
+    max_ns: int
+    samples: list[int]
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.samples = list()
+
+    def add(self, elapsed_ns: int, max_samples: int) -> None:
+        if self.count == 0 or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.count += 1
+        self.total_ns += elapsed_ns
+
+        # reservoir sampling keeps a uniform sample of all measurements
+        if len(self.samples) < max_samples:
+            self.samples.append(elapsed_ns)
+        else:
+            idx = random.randrange(self.count)
+            if idx < max_samples:
+                self.samples[idx] = elapsed_ns
+
+    def stats(self, label: str) -> TimerStats:
+        samples = sorted(self.samples)
+        return TimerStats(
+            label=label,
+            count=self.count,
+            total=self.total_ns / 1e9,
+            min=self.min_ns / 1e9,
+            max=self.max_ns / 1e9,
+            p50=_percentile(samples, 0.5) / 1e9,
+            p90=_percentile(samples, 0.9) / 1e9,
+            p99=_percentile(samples, 0.99) / 1e9,
         )
+
+
+def _percentile(sorted_samples: list[int], q: float) -> int:
+    """Nearest-rank percentile"""
+
+    if len(sorted_samples) == 0:
+        return 0
+    rank = max(1, math.ceil(len(sorted_samples) * q))
+    return sorted_samples[rank - 1]
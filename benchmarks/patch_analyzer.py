@@ -0,0 +1,59 @@
+import sys
+import os
+import tempfile
+import timeit
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.patch.analyzer import PatchAnalyzer
+
+_SAMPLE_PATCHES = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests", "patch", p)
+    for p in ["8860.patch", "categories.patch"]
+]
+
+
+def _make_patch(size: int) -> str:
+    sample = ""
+    for path in _SAMPLE_PATCHES:
+        with open(path, "r") as f:
+            sample += f.read()
+    return sample * max(1, size // len(sample))
+
+
+def _summaries(pa: PatchAnalyzer) -> str:
+    return (
+        pa.verboseRuntimeSummary()
+        + pa.verboseFrontEndSummary()
+        + pa.verboseTestSummary()
+    )
+
+
+def patch_analyzer() -> None:
+    """
+    argv[0] -- script name
+    argv[1] -- number of repetitions (optional)
+    """
+
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print("| patch, MB | files | analyze, ms | MB/s | summaries, ms |")
+    print("|-----------|-------|-------------|------|---------------|")
+    for size_mb in [1, 4, 16]:
+        with tempfile.NamedTemporaryFile("w", suffix=".patch") as patch:
+            patch.write(_make_patch(size_mb * 1024 * 1024))
+            patch.flush()
+            size = os.path.getsize(patch.name)
+
+            pa = PatchAnalyzer(patch.name)
+            analyze = timeit.timeit(pa.analyze, number=number) / number
+            summaries = timeit.timeit(lambda: _summaries(pa), number=number) / number
+
+        print(
+            f"| {size / 1024 / 1024:.1f} | {len(pa.file_facts)} | {analyze * 1000:.1f} "
+            f"| {size / 1024 / 1024 / analyze:.1f} | {summaries * 1000:.3f} |"
+        )
+
+
+if __name__ == "__main__":
+    patch_analyzer()
@@ -0,0 +1,91 @@
+import sys
+import os
+import shutil
+import tempfile
+import timeit
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.diff.models.diff import Diff, DiffFile, DiffSummary
+from app.devagent.stages.review_init import DevagentRule, prepare_tasks
+
+_SAMPLE_PATCH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "tests", "patch", "8860.patch"
+)
+
+_PROJECT = "arkcompiler_ets_frontend"
+
+
+def _make_diff(size: int) -> Diff:
+    with open(_SAMPLE_PATCH, "r") as f:
+        sample = f.read()
+
+    files = list[DiffFile]()
+    total = 0
+    while total < size:
+        file_diff = sample.replace("ets2panda/", f"ets2panda/dir{len(files)}/")
+        files.append(
+            DiffFile(
+                file=f"ets2panda/dir{len(files)}/file.cpp",
+                diff=file_diff,
+                added_lines=0,
+                removed_lines=0,
+            )
+        )
+        total += len(file_diff)
+
+    return Diff(
+        remote="gitcode.com",
+        project=_PROJECT,
+        files=files,
+        summary=DiffSummary(
+            total_files=len(files),
+            added_lines=0,
+            removed_lines=0,
+            base_sha="0" * 40,
+            head_sha="1" * 40,
+        ),
+    )
+
+
+def prepare_tasks_benchmark() -> None:
+    """
+    argv[0] -- script name
+    argv[1] -- number of repetitions (optional)
+    argv[2] -- number of applicable rules (optional)
+    """
+
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    n_rules = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    rules = [
+        DevagentRule(name=f"rule{i}.md", dirs=[f"{_PROJECT}/ets2panda"])
+        for i in range(n_rules)
+    ]
+
+    print(f"{n_rules} applicable rules")
+    print("| diff, MB | prepare_tasks, ms | peak allocated, MB |")
+    print("|----------|-------------------|--------------------|")
+    for size_mb in [1, 4, 16]:
+        diff = _make_diff(size_mb * 1024 * 1024)
+        wd = tempfile.mkdtemp()
+        try:
+
+            def run() -> None:
+                prepare_tasks(wd, rules, [diff])
+
+            elapsed = timeit.timeit(run, number=number) / number
+
+            tracemalloc.start()
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        finally:
+            shutil.rmtree(wd)
+
+        print(f"| {size_mb} | {elapsed * 1000:.1f} | {peak / 1024 / 1024:.1f} |")
+
+
+if __name__ == "__main__":
+    prepare_tasks_benchmark()
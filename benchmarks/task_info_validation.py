@@ -0,0 +1,63 @@
+import sys
+import os
+import timeit
+import jsonschema
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.blob.blob import blob_key
+from app.redis.schemas.task_info import (
+    TASK_INFO_SCHEMA,
+    TASK_INFO_VALIDATOR,
+    task_info_task_id_key,
+    task_info_rules_revision_key,
+    task_info_devagent_revision_key,
+    task_info_project_revision_key,
+    task_info_patch_content_key,
+    task_info_patch_context_key,
+)
+
+
+def _make_task_info(n_patches: int) -> dict[str, str]:
+    task_info = {
+        task_info_task_id_key(): "task_id",
+        task_info_rules_revision_key(): "0" * 40,
+        task_info_devagent_revision_key(): "1" * 40,
+        task_info_project_revision_key("owner/repo"): "2" * 40,
+    }
+    for i in range(n_patches):
+        patch_name = f"task_id_{i}"
+        task_info.update({f"ETS{i:04}_rule": patch_name})
+        task_info.update({task_info_patch_content_key(patch_name): blob_key(f"{i}")})
+        task_info.update({task_info_patch_context_key(patch_name): blob_key(f"c{i}")})
+    return task_info
+
+
+def task_info_validation() -> None:
+    """
+    argv[0] -- script name
+    argv[1] -- number of repetitions (optional)
+    """
+
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+    print("| patches | keys | validate, ms | precompiled, ms |")
+    print("|---------|------|--------------|-----------------|")
+    for n_patches in [10, 100, 300]:
+        task_info = _make_task_info(n_patches)
+
+        per_call = dict[str, float]()
+        for name, stmt in [
+            ("validate", lambda: jsonschema.validate(task_info, TASK_INFO_SCHEMA)),
+            ("precompiled", lambda: TASK_INFO_VALIDATOR.validate(task_info)),
+        ]:
+            total = timeit.timeit(stmt, number=number)
+            per_call.update({name: total / number * 1000})
+
+        print(
+            f"| {n_patches} | {len(task_info)} | {per_call['validate']:.3f} | {per_call['precompiled']:.3f} |"
+        )
+
+
+if __name__ == "__main__":
+    task_info_validation()
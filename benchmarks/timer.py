@@ -0,0 +1,46 @@
+import sys
+import os
+import timeit
+import typing
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.utils.timer import Timer, TimerRegistry, TimerResolution, timed
+
+
+def timer_benchmark() -> None:
+    """
+    argv[0] -- script name
+    argv[1] -- number of repetitions (optional)
+    """
+
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    registry = TimerRegistry()
+
+    def timer_logged() -> None:
+        with Timer("logged"):
+            pass
+
+    def timer_registry() -> None:
+        with Timer("registry", TimerResolution.NANOSECONDS, registry):
+            pass
+
+    @timed(registry=registry)
+    def decorated() -> None:
+        pass
+
+    print("| timer | overhead per call, us |")
+    print("|-------|-----------------------|")
+    benchmarks: list[tuple[str, typing.Callable[[], object]]] = [
+        ("Timer, logged", timer_logged),
+        ("Timer, registry", timer_registry),
+        ("timed", decorated),
+    ]
+    for name, func in benchmarks:
+        elapsed = timeit.timeit(func, number=number) / number
+        print(f"| {name} | {elapsed * 1e6:.2f} |")
+
+
+if __name__ == "__main__":
+    timer_benchmark()
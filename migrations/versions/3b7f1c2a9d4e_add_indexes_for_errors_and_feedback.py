@@ -0,0 +1,42 @@
+"""Add indexes for errors and user_feedback queries
+
+Revision ID: 3b7f1c2a9d4e
+Revises: ddcd9e8bf183
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7f1c2a9d4e"
+down_revision: Union[str, Sequence[str], None] = "ddcd9e8bf183"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ["errors", "user_feedback"]:
+        op.create_index(
+            f"ix_{table}_rule_created_at", table, ["rule", "created_at"], unique=False
+        )
+        op.create_index(
+            f"ix_{table}_project_created_at",
+            table,
+            ["project", "created_at"],
+            unique=False,
+        )
+        op.create_index(f"ix_{table}_patch", table, ["patch"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ["errors", "user_feedback"]:
+        op.drop_index(f"ix_{table}_patch", table_name=table)
+        op.drop_index(f"ix_{table}_project_created_at", table_name=table)
+        op.drop_index(f"ix_{table}_rule_created_at", table_name=table)
@@ -0,0 +1,44 @@
+"""Add dataset watermarks for incremental exports
+
+Revision ID: 5d9a0e7c3f21
+Revises: 8c2e4f6a1b3d
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d9a0e7c3f21"
+down_revision: Union[str, Sequence[str], None] = "8c2e4f6a1b3d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "dataset_watermarks",
+        sa.Column("dataset", sa.String(), nullable=False),
+        sa.Column("watermark", sa.DateTime(), nullable=False),
+        sa.Column(
+            "updated_at", sa.DateTime, server_default=sa.func.now(), nullable=True
+        ),
+        sa.PrimaryKeyConstraint("dataset"),
+        sa.UniqueConstraint("dataset"),
+    )
+    for table in ["errors", "user_feedback"]:
+        op.create_index(
+            f"ix_{table}_updated_at", table, ["updated_at"], unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ["errors", "user_feedback"]:
+        op.drop_index(f"ix_{table}_updated_at", table_name=table)
+    op.drop_table("dataset_watermarks")
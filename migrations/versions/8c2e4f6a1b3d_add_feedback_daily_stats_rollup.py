@@ -0,0 +1,47 @@
+"""Add feedback_daily_stats rollup
+
+Revision ID: 8c2e4f6a1b3d
+Revises: 3b7f1c2a9d4e
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c2e4f6a1b3d"
+down_revision: Union[str, Sequence[str], None] = "3b7f1c2a9d4e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "feedback_daily_stats",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("rule", sa.String(), nullable=False),
+        sa.Column("project", sa.String(), nullable=False),
+        sa.Column("feedback", sa.Integer(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "rule", "project", "feedback"),
+    )
+    # feedback recorded before created_at was introduced is accounted to the epoch
+    op.execute(
+        """
+        INSERT INTO feedback_daily_stats (day, rule, project, feedback, count)
+        SELECT COALESCE(CAST(created_at AS DATE), DATE '1970-01-01') AS day,
+               rule, project, feedback, COUNT(*)
+        FROM user_feedback
+        GROUP BY day, rule, project, feedback
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("feedback_daily_stats")
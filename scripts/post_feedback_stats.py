@@ -6,13 +6,13 @@ import os
 import asyncio
 import sys
 import datetime
+import typing
+import sqlalchemy
 
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 
 from app.db.async_db import AsyncDBConnectionConfig, AsyncDBConnection
-from app.db.schemas.user_feedback import UserFeedback, Feedback
-from app.db.schemas.error import Error
-from app.db.schemas.patch import Patch
+from app.db.schemas.user_feedback import Feedback
 
 dotenv.load_dotenv()
 
@@ -27,6 +27,9 @@ DB_HOSTNAME = os.getenv("DB_HOSTNAME")
 
 UserFeedbackSummary = dict[str, list[int]]
 
+# rows loaded from the db, columns are accessible as attributes
+Row = sqlalchemy.Row[typing.Any]
+
 
 async def post_feedback_stats() -> None:
     """
@@ -42,16 +45,40 @@ async def post_feedback_stats() -> None:
         db=DB_DB,
     )
 
+    today = datetime.datetime.combine(datetime.date.today(), datetime.time())
+    tomorrow = today + datetime.timedelta(days=1)
+    week_ago = today - datetime.timedelta(days=7)
+
     db_conn = AsyncDBConnection(db_cfg)
     async for db_session in db_conn.get_session():
-        user_feedback = await db_session.select_user_feebdack(
-            lambda: UserFeedback.created_at.isnot(None)
+        feedback_today = await db_session.query_user_feedback(
+            created_from=today, created_to=tomorrow
+        )
+        stats_today = await db_session.query_feedback_stats(
+            day_from=today.date(), day_to=tomorrow.date()
+        )
+        stats_week = await db_session.query_feedback_stats(
+            day_from=week_ago.date(), day_to=tomorrow.date()
+        )
+        stats_all = await db_session.query_feedback_stats()
+        errors_today = await db_session.query_errors(
+            created_from=today, created_to=tomorrow
+        )
+        patches = await db_session.query_patches(
+            [str(fb.patch) for fb in feedback_today]
+            + [str(e.patch) for e in errors_today]
         )
-        patches = await db_session.select_patches(lambda: Patch.created_at.isnot(None))
-        errors = await db_session.select_errors(lambda: Error.created_at.isnot(None))
     await db_conn.close()
 
-    report = _generate_report(user_feedback, patches, errors)
+    report = _generate_report(
+        today,
+        feedback_today,
+        stats_today,
+        stats_week,
+        stats_all,
+        errors_today,
+        patches,
+    )
 
     payload = json.dumps({"body": report})
     headers = {
@@ -72,61 +99,40 @@ async def post_feedback_stats() -> None:
 
 
 def _generate_report(
-    user_feedback: list[UserFeedback], patches: list[Patch], errors: list[Error]
+    today: datetime.datetime,
+    feedback_today: list[Row],
+    stats_today: list[Row],
+    stats_week: list[Row],
+    stats_all: list[Row],
+    errors_today: list[Row],
+    patches: list[Row],
 ) -> str:
-    today = datetime.datetime.today()
     today_str = today.strftime("%Y-%m-%d")
     report = ""
     report += f"## {today_str}\n\n"
 
-    feedback_today = list[UserFeedback](
-        filter(
-            lambda fb: fb.created_at.date() == today.date(),
-            user_feedback,
-        )
-    )
-    patches_today = list[Patch](
-        filter(
-            lambda p: p.created_at.date() == today.date(),
-            patches,
-        )
-    )
-    errors_today = list[Error](
-        filter(
-            lambda e: e.created_at.date() == today.date(),
-            errors,
-        )
-    )
-
     report += f"### Feedback today: {today_str}\n\n"
-    report += _serialize_feedback_summary(feedback_today)
+    report += _serialize_feedback_summary(stats_today)
 
     report += f"### False positives today: {today_str}\n\n"
-    report += _serialize_false_positives(feedback_today, patches_today)
+    report += _serialize_false_positives(feedback_today, patches)
 
     report += f"### Errors today: {today_str}\n\n"
-    report += _serialize_errors(errors_today, patches_today)
+    report += _serialize_errors(errors_today, patches)
 
     start_date = today - datetime.timedelta(days=7)
     start_date_str = start_date.strftime("%Y-%m-%d")
-    feedback_in_timeframe = list(
-        filter(
-            lambda user_feedback: user_feedback.created_at.date() <= today.date()
-            and user_feedback.created_at.date() >= start_date.date(),
-            user_feedback,
-        )
-    )
 
     report += f"### Feedback in time frame: {start_date_str} - {today_str}\n\n"
-    report += _serialize_feedback_summary(feedback_in_timeframe)
+    report += _serialize_feedback_summary(stats_week)
 
     report += f"### Feedback entire time:\n\n"
-    report += _serialize_feedback_summary(user_feedback)
+    report += _serialize_feedback_summary(stats_all)
 
     return report
 
 
-def _serialize_errors(errors: list[Error], patches: list[Patch]) -> str:
+def _serialize_errors(errors: list[Row], patches: list[Row]) -> str:
     patch_mappping = {str(p.id): p for p in patches}
     report = ""
     for e in errors:
@@ -137,7 +143,7 @@ def _serialize_errors(errors: list[Error], patches: list[Patch]) -> str:
     return report
 
 
-def _create_issue_for_error(error: Error, patch: Patch) -> str:
+def _create_issue_for_error(error: Row, patch: Row) -> str:
     body = ""
     body += "## General info:\n\n"
     body += "```\n"
@@ -187,13 +193,13 @@ def _create_issue_for_error(error: Error, patch: Patch) -> str:
     return str(data["html_url"])
 
 
-def _serialize_feedback_summary(feedback: list[UserFeedback]) -> str:
+def _serialize_feedback_summary(feedback_stats: list[Row]) -> str:
     feedback_summary = dict[str, list[int]]()
 
-    for fb in feedback:
-        current_summary = feedback_summary.get(str(fb.rule), list[int]([0, 0, 0, 0]))
-        current_summary[int(fb.feedback)] = current_summary[int(fb.feedback)] + 1
-        feedback_summary.update({str(fb.rule): current_summary})
+    for row in feedback_stats:
+        current_summary = feedback_summary.get(str(row.rule), list[int]([0, 0, 0, 0]))
+        current_summary[int(row.feedback)] += int(row.total)
+        feedback_summary.update({str(row.rule): current_summary})
 
     report = ""
     report += "| Rule name | TP | FP |\n"
@@ -205,11 +211,9 @@ def _serialize_feedback_summary(feedback: list[UserFeedback]) -> str:
     return report
 
 
-def _serialize_false_positives(
-    feedback: list[UserFeedback], patches: list[Patch]
-) -> str:
+def _serialize_false_positives(feedback: list[Row], patches: list[Row]) -> str:
     patch_mappping = {str(p.id): p for p in patches}
-    group_by_patch_by_rule = dict[str, dict[str, list[UserFeedback]]]()
+    group_by_patch_by_rule = dict[str, dict[str, list[Row]]]()
 
     for fb in feedback:
         if fb.feedback != Feedback.FALSE_POSITIVE.value:
@@ -217,9 +221,9 @@ def _serialize_false_positives(
         patch_name = str(fb.patch)
         rule_name = str(fb.rule)
         rule_to_feedback = group_by_patch_by_rule.get(
-            patch_name, dict[str, list[UserFeedback]]()
+            patch_name, dict[str, list[Row]]()
         )
-        feedback_list = rule_to_feedback.get(rule_name, list[UserFeedback]())
+        feedback_list = rule_to_feedback.get(rule_name, list[Row]())
         feedback_list.append(fb)
         rule_to_feedback.update({rule_name: feedback_list})
         group_by_patch_by_rule.update({patch_name: rule_to_feedback})
@@ -238,7 +242,7 @@ def _serialize_false_positives(
 
 
 def _create_issue_for_false_positive(
-    rule_name: str, patch: Patch, feedback_list: list[UserFeedback]
+    rule_name: str, patch: Row, feedback_list: list[Row]
 ) -> str:
     body = ""
     body += "## General info:\n\n"
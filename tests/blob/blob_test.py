@@ -0,0 +1,30 @@
+import unittest
+import hashlib
+
+from app.blob.blob import blob_key, is_blob_key, compress_blob, decompress_blob
+
+
+class BlobTest(unittest.TestCase):
+    def test_key(self) -> None:
+        content = "diff --git a/file b/file\n+ыыы\n"
+        key = blob_key(content)
+        self.assertEqual(key, hashlib.sha256(content.encode("utf-8")).hexdigest())
+        self.assertEqual(key, blob_key(content.encode("utf-8")))
+        self.assertTrue(is_blob_key(key))
+        self.assertNotEqual(key, blob_key(content + " "))
+
+    def test_is_blob_key(self) -> None:
+        self.assertFalse(is_blob_key(""))
+        self.assertFalse(is_blob_key("tmp_patch_name"))
+        self.assertFalse(is_blob_key("A" * 64))
+
+    def test_compression(self) -> None:
+        content = "+line\n" * 1000
+        compressed = compress_blob(content)
+        self.assertLess(len(compressed), len(content))
+        self.assertEqual(decompress_blob(compressed), content)
+        self.assertEqual(decompress_blob(compress_blob("")), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
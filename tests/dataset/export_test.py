@@ -0,0 +1,223 @@
+import asyncio
+import datetime
+import io
+import json
+import threading
+import typing
+import unittest
+import zipfile
+
+from app.dataset.export import (
+    export_archive,
+    export_dataset,
+    MANIFEST_PATH,
+    WATERMARK_LAG,
+)
+from app.dataset.zip_export import ZipDatasetWriter, ZipEntry
+
+
+class _Row(typing.NamedTuple):
+    id: int
+    content: str
+    updated_at: datetime.datetime = datetime.datetime(2025, 1, 1)
+
+
+class _FakeNexus:
+    uploaded: dict[str, bytes]
+    threads: set[int]
+
+    def __init__(self) -> None:
+        self.uploaded = dict()
+        self.threads = set()
+
+    def upload_fileobj(
+        self, fileobj: typing.IO[bytes], size: int, remote_path: str
+    ) -> str:
+        self.threads.add(threading.get_ident())
+        data = fileobj.read()
+        assert len(data) == size
+        self.uploaded.update({remote_path: data})
+        return f"https://nexus/{remote_path}"
+
+    async def upload_fileobj_async(
+        self, fileobj: typing.IO[bytes], size: int, remote_path: str
+    ) -> str:
+        return await asyncio.to_thread(self.upload_fileobj, fileobj, size, remote_path)
+
+
+class _FakeDB:
+    rows: list[_Row]
+    time: datetime.datetime
+    watermarks: dict[str, datetime.datetime]
+
+    def __init__(self, rows: list[_Row], time: datetime.datetime) -> None:
+        self.rows = rows
+        self.time = time
+        self.watermarks = dict()
+
+    async def now(self) -> datetime.datetime:
+        return self.time
+
+    async def get_dataset_watermark(self, dataset: str) -> datetime.datetime | None:
+        return self.watermarks.get(dataset, None)
+
+    async def set_dataset_watermark(
+        self, dataset: str, watermark: datetime.datetime
+    ) -> None:
+        self.watermarks.update({dataset: watermark})
+
+    async def stream(
+        self,
+        changed_from: datetime.datetime | None,
+        changed_to: datetime.datetime | None,
+    ) -> typing.AsyncIterator[list[_Row]]:
+        yield [
+            row
+            for row in self.rows
+            if (changed_from == None or row.updated_at > changed_from)
+            and (changed_to == None or row.updated_at <= changed_to)
+        ]
+
+
+def _entries(row: _Row) -> list[ZipEntry]:
+    return [(f"{row.id}/content", row.content), (f"{row.id}/.env", f"ID={row.id}\n")]
+
+
+async def _batches(
+    batches: list[list[_Row]],
+) -> typing.AsyncIterator[list[_Row]]:
+    for batch in batches:
+        yield batch
+
+
+class ExportArchiveTest(unittest.TestCase):
+    def test_export_archive(self) -> None:
+        nexus = _FakeNexus()
+        batches = [[_Row(1, "a"), _Row(2, "b")], [_Row(3, "c")]]
+
+        writer = ZipDatasetWriter(_entries)
+        try:
+            url = asyncio.run(
+                export_archive(
+                    _batches(batches),
+                    writer,
+                    nexus,  # type: ignore
+                    "dataset.zip",
+                )
+            )
+        finally:
+            writer.close()
+
+        self.assertEqual(url, "https://nexus/dataset.zip")
+        self.assertNotIn(threading.get_ident(), nexus.threads)
+
+        with zipfile.ZipFile(io.BytesIO(nexus.uploaded["dataset.zip"])) as archive:
+            self.assertEqual(
+                sorted(archive.namelist()),
+                [
+                    "1/",
+                    "1/.env",
+                    "1/content",
+                    "2/",
+                    "2/.env",
+                    "2/content",
+                    "3/",
+                    "3/.env",
+                    "3/content",
+                ],
+            )
+            self.assertEqual(archive.read("3/content"), b"c")
+            self.assertEqual(archive.read("2/.env"), b"ID=2\n")
+
+
+class ExportDatasetTest(unittest.TestCase):
+    def _export(self, db: _FakeDB, nexus: _FakeNexus, incremental: bool) -> str:
+        return asyncio.run(
+            export_dataset(
+                db=db,  # type: ignore
+                nexus=nexus,  # type: ignore
+                dataset="errors",
+                incremental=incremental,
+                stream=db.stream,
+                writer=ZipDatasetWriter(_entries),
+            )
+        )
+
+    def test_incremental_export(self) -> None:
+        day = datetime.datetime(2025, 1, 1)
+        nexus = _FakeNexus()
+        watermark = day + datetime.timedelta(hours=1)
+        db = _FakeDB([_Row(1, "a", day), _Row(2, "b", day)], watermark)
+
+        # no watermark yet, so incremental export is full
+        url = self._export(db, nexus, incremental=True)
+        self.assertIn("errors-full-", url)
+        self.assertEqual(db.watermarks["errors"], watermark)
+
+        db.time = day + datetime.timedelta(days=1)
+        db.rows.append(_Row(3, "c", day + datetime.timedelta(hours=3)))
+        db.rows[0] = _Row(1, "a2", day + datetime.timedelta(hours=2))
+
+        url = self._export(db, nexus, incremental=True)
+        self.assertIn("errors-delta-", url)
+        self.assertEqual(db.watermarks["errors"], db.time)
+
+        remote_path = url.removeprefix("https://nexus/")
+        with zipfile.ZipFile(io.BytesIO(nexus.uploaded[remote_path])) as archive:
+            self.assertEqual(
+                sorted(archive.namelist()),
+                [
+                    "1/",
+                    "1/.env",
+                    "1/content",
+                    "3/",
+                    "3/.env",
+                    "3/content",
+                    MANIFEST_PATH,
+                ],
+            )
+            self.assertEqual(archive.read("1/content"), b"a2")
+            manifest = json.loads(archive.read(MANIFEST_PATH))
+
+        self.assertEqual(manifest["dataset"], "errors")
+        self.assertEqual(manifest["incremental"], True)
+        self.assertEqual(manifest["rows"], 2)
+        self.assertEqual(
+            manifest["changed_from"], (watermark - WATERMARK_LAG).isoformat()
+        )
+        self.assertEqual(manifest["changed_to"], db.time.isoformat())
+
+    def test_late_commit_is_exported(self) -> None:
+        day = datetime.datetime(2025, 1, 1)
+        nexus = _FakeNexus()
+        db = _FakeDB([_Row(1, "a", day)], day)
+
+        self._export(db, nexus, incremental=True)
+
+        # stamped before the watermark by a transaction committed after the export
+        db.rows.append(_Row(2, "b", day - datetime.timedelta(minutes=1)))
+        db.time = day + datetime.timedelta(days=1)
+
+        url = self._export(db, nexus, incremental=True)
+        self.assertIn("errors-delta-", url)
+        remote_path = url.removeprefix("https://nexus/")
+        with zipfile.ZipFile(io.BytesIO(nexus.uploaded[remote_path])) as archive:
+            self.assertIn("2/content", archive.namelist())
+
+    def test_full_export(self) -> None:
+        day = datetime.datetime(2025, 1, 1)
+        nexus = _FakeNexus()
+        db = _FakeDB([_Row(1, "a", day)], day + datetime.timedelta(days=1))
+        db.watermarks.update({"errors": day + datetime.timedelta(hours=1)})
+
+        url = self._export(db, nexus, incremental=False)
+
+        self.assertIn("errors-full-", url)
+        self.assertEqual(db.watermarks["errors"], db.time)
+        remote_path = url.removeprefix("https://nexus/")
+        with zipfile.ZipFile(io.BytesIO(nexus.uploaded[remote_path])) as archive:
+            self.assertIn("1/content", archive.namelist())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import datetime
+import io
+import json
+import typing
+import unittest
+import zipfile
+
+import pyarrow
+import pyarrow.parquet
+
+from app.dataset.parquet_export import ParquetDatasetWriter, ROWS_PATH, PATCHES_PATH
+from app.dataset.export import DatasetManifest, MANIFEST_PATH
+
+
+class _Row(typing.NamedTuple):
+    id: int
+    rule: str
+    patch: str
+    patch_content: str | None
+    patch_context: str | None
+    created_at: datetime.datetime | None
+
+
+_SCHEMA = pyarrow.schema(
+    dict[str, pyarrow.DataType](
+        {
+            "id": pyarrow.int64(),
+            "rule": pyarrow.string(),
+            "patch": pyarrow.string(),
+            "created_at": pyarrow.timestamp("us"),
+        }
+    )
+)
+
+
+class ParquetExportTest(unittest.TestCase):
+    def test_patches_are_deduplicated(self) -> None:
+        day = datetime.datetime(2025, 1, 1)
+        writer = ParquetDatasetWriter(_SCHEMA, max_memory=16)
+        try:
+            writer.write_rows(
+                [
+                    _Row(1, "rule-a", "p1", "diff-1", None, day),
+                    _Row(2, "rule-b", "p1", "diff-1", None, None),
+                ]
+            )
+            writer.write_rows([_Row(3, "rule-a", "p2", "diff-2", "ctx", day)])
+            archive, size = writer.finish(
+                DatasetManifest(
+                    dataset="errors", incremental=False, changed_from=None, changed_to=day
+                )
+            )
+
+            data = archive.read()
+            self.assertEqual(len(data), size)
+        finally:
+            writer.close()
+
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            self.assertEqual(
+                sorted(zf.namelist()), [MANIFEST_PATH, PATCHES_PATH, ROWS_PATH]
+            )
+            rows = pyarrow.parquet.read_table(io.BytesIO(zf.read(ROWS_PATH)))
+            patches = pyarrow.parquet.read_table(io.BytesIO(zf.read(PATCHES_PATH)))
+            manifest = json.loads(zf.read(MANIFEST_PATH))
+
+        self.assertEqual(rows.schema, _SCHEMA)
+        self.assertEqual(
+            rows.to_pylist(),
+            [
+                {"id": 1, "rule": "rule-a", "patch": "p1", "created_at": day},
+                {"id": 2, "rule": "rule-b", "patch": "p1", "created_at": None},
+                {"id": 3, "rule": "rule-a", "patch": "p2", "created_at": day},
+            ],
+        )
+        self.assertEqual(
+            patches.to_pylist(),
+            [
+                {"id": "p1", "content": "diff-1", "context": None},
+                {"id": "p2", "content": "diff-2", "context": "ctx"},
+            ],
+        )
+        self.assertEqual(manifest["rows"], 3)
+
+    def test_missing_patch(self) -> None:
+        writer = ParquetDatasetWriter(_SCHEMA)
+        try:
+            with self.assertRaises(Exception):
+                writer.write_rows([_Row(1, "rule-a", "p1", None, None, None)])
+        finally:
+            writer.close()
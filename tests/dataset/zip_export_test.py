@@ -0,0 +1,62 @@
+import datetime
+import os
+import shutil
+import tempfile
+import typing
+import unittest
+import zipfile
+
+from app.dataset.zip_export import ZipDatasetWriter, ZipEntry
+
+
+class _Row(typing.NamedTuple):
+    id: int
+    content: str
+    updated_at: datetime.datetime = datetime.datetime(2025, 1, 1)
+
+
+def _entries(row: _Row) -> list[ZipEntry]:
+    return [(f"{row.id}/content", row.content), (f"{row.id}/.env", f"ID={row.id}\n")]
+
+
+class ZipDatasetWriterTest(unittest.TestCase):
+    def test_writer_spills_to_disk(self) -> None:
+        writer = ZipDatasetWriter(_entries, max_memory=1024)
+        try:
+            # random content, so the archive outgrows the memory limit
+            writer.write_rows([_Row(i, os.urandom(1024).hex()) for i in range(8)])
+            archive, size = writer.finish()
+
+            self.assertGreater(size, 1024)
+            with zipfile.ZipFile(archive) as zf:
+                self.assertEqual(len(zf.namelist()), 24)
+        finally:
+            writer.close()
+
+    def test_layout_of_make_archive(self) -> None:
+        def entries(row: _Row) -> list[ZipEntry]:
+            return [(f"{row.id}/a/b/content", row.content), (f"{row.id}/.env", "")]
+
+        rows = [_Row(1, "a"), _Row(2, "b")]
+        writer = ZipDatasetWriter(entries)
+        try:
+            writer.write_rows(rows)
+            archive, _ = writer.finish()
+            with zipfile.ZipFile(archive) as zf:
+                names = sorted(zf.namelist())
+        finally:
+            writer.close()
+
+        with tempfile.TemporaryDirectory() as out, tempfile.TemporaryDirectory() as wd:
+            for row in rows:
+                for path, content in entries(row):
+                    os.makedirs(os.path.dirname(os.path.join(wd, path)), exist_ok=True)
+                    with open(os.path.join(wd, path), "w") as f:
+                        f.write(content)
+            expected = shutil.make_archive(os.path.join(out, "dataset"), "zip", wd, ".")
+            with zipfile.ZipFile(expected) as zf:
+                self.assertEqual(names, sorted(zf.namelist()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import asyncio
+
+from app.redis.async_redis import AsyncRedisConfig
+from app.devagent.resources import (
+    init_worker_resources,
+    close_worker_resources,
+    run_async,
+    get_redis,
+)
+
+
+def _redis_cfg(db: int) -> AsyncRedisConfig:
+    return AsyncRedisConfig(
+        host="localhost", port=6379, password="password", db=db, expiry=10
+    )
+
+
+class WorkerResourcesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        init_worker_resources()
+
+    def tearDown(self) -> None:
+        close_worker_resources()
+
+    def test_single_loop(self) -> None:
+        async def current_loop() -> asyncio.AbstractEventLoop:
+            return asyncio.get_running_loop()
+
+        self.assertIs(run_async(current_loop()), run_async(current_loop()))
+
+    def test_redis_is_reused(self) -> None:
+        self.assertIs(get_redis(_redis_cfg(0)), get_redis(_redis_cfg(0)))
+        self.assertIsNot(get_redis(_redis_cfg(0)), get_redis(_redis_cfg(1)))
+
+    def test_reinit(self) -> None:
+        redis = get_redis(_redis_cfg(0))
+        close_worker_resources()
+        init_worker_resources()
+        self.assertIsNot(redis, get_redis(_redis_cfg(0)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from app.diff.models.diff import Diff
+from app.diff.provider import DiffProvider, IDiffProvider
+from app.devagent.stages.review_init import fetch_diffs
+
+from tests.devagent.mock.test_diffs.basic1.project1.diff1 import (
+    DIFF as P1_DIFF1,
+)
+from tests.devagent.mock.test_diffs.basic1.project2.diff1 import (
+    DIFF as P2_DIFF1,
+)
+
+
+class _MockProvider(IDiffProvider):
+    def domain(self) -> str:
+        return "mock.com"
+
+    def get_diff(self, url: str) -> Diff:
+        return {"p1": P1_DIFF1, "p2": P2_DIFF1}[url.split("/")[-1]]
+
+
+class FetchDiffsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.diff_provider = DiffProvider()
+        self.diff_provider.register_provider(_MockProvider())
+
+    def test_no_urls(self) -> None:
+        self.assertListEqual(fetch_diffs(self.diff_provider, list()), list())
+
+    def test_order(self) -> None:
+        urls = ["https://mock.com/p2", "https://mock.com/p1", "https://mock.com/p2"]
+        diffs = fetch_diffs(self.diff_provider, urls)
+        self.assertListEqual(
+            [diff.project for diff in diffs],
+            [P2_DIFF1.project, P1_DIFF1.project, P2_DIFF1.project],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
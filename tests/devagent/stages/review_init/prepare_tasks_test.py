@@ -2,7 +2,15 @@ import unittest
 import shutil
 import os
 
-from app.devagent.stages.review_init import load_rules, prepare_tasks, DevagentRule
+from app.blob.blob import blob_key
+from app.patch.analyzer import PatchAnalyzer
+from app.patch.file_types import FileTypeClassifier, FileTypeRule
+from app.devagent.stages.review_init import (
+    load_rules,
+    prepare_tasks,
+    patch_context_version,
+    DevagentRule,
+)
 from app.devagent.stages.review_init import (
     _map_applicable_rules_to_diffs,
     _generate_patch_context,
@@ -43,35 +51,32 @@ def _clean_wd(wd: str) -> None:
 
 class PrepareTasksTest(unittest.TestCase):
     def test_basic(self) -> None:
-        task_id = f"task_id_{__name__}"
         # diffs = get_diffs(urls)
         diffs = [FE_EMPTY, RT_EMPTY]
         # populate_workdir(wd, diffs)
         wd = _get_wd("basic")
         rules = load_rules(wd)
-        tasks = prepare_tasks(task_id, wd, rules, diffs)
+        tasks = prepare_tasks(wd, rules, diffs)
         self.assertListEqual(tasks, list())
         _clean_wd(wd)
 
     def test_basic1_empty(self) -> None:
-        task_id = f"task_id_{__name__}"
         # diffs = get_diffs(urls)
         diffs = [P1_EMPTY, P2_EMPTY]
         # populate_workdir(wd, diffs)
         wd = _get_wd("basic1")
         rules = load_rules(wd)
-        tasks = prepare_tasks(task_id, wd, rules, diffs)
+        tasks = prepare_tasks(wd, rules, diffs)
         self.assertListEqual(tasks, list())
         _clean_wd(wd)
 
     def test_basic1_p1_diff1(self) -> None:
-        task_id = f"task_id_{__name__}"
         # diffs = get_diffs(urls)
         diffs = [P1_DIFF1]
         # populate_workdir(wd, diffs)
         wd = _get_wd("basic1")
         rules = load_rules(wd)
-        tasks = prepare_tasks(task_id, wd, rules, diffs)
+        tasks = prepare_tasks(wd, rules, diffs)
         self.assertEqual(len(tasks), 3)
         for task in tasks:
             self.assertEqual(task.wd, wd)
@@ -80,10 +85,12 @@ class PrepareTasksTest(unittest.TestCase):
             with open(task.patch_path) as patch:
                 gold = "\n\n".join([file.diff for file in P1_DIFF1.files])
                 self.assertEqual(patch.read(), gold)
+                self.assertEqual(task.patch_key, blob_key(gold))
             self.assertEqual(wd, os.path.commonpath([wd, task.context_path]))
             with open(task.context_path) as context:
-                gold = _generate_patch_context(task.patch_path)
+                gold = _generate_patch_context(PatchAnalyzer(task.patch_path))
                 self.assertEqual(context.read(), gold)
+                self.assertEqual(task.context_key, blob_key(gold))
             self.assertTrue(os.path.exists(task.rule_path))
             self.assertListEqual(
                 [r for r in rules if r.name == os.path.basename(task.rule_path)][
@@ -98,13 +105,12 @@ class PrepareTasksTest(unittest.TestCase):
         _clean_wd(wd)
 
     def test_basic1_p2_diff1(self) -> None:
-        task_id = f"task_id_{__name__}"
         # diffs = get_diffs(urls)
         diffs = [P2_DIFF1]
         # populate_workdir(wd, diffs)
         wd = _get_wd("basic1")
         rules = load_rules(wd)
-        tasks = prepare_tasks(task_id, wd, rules, diffs)
+        tasks = prepare_tasks(wd, rules, diffs)
         self.assertEqual(len(tasks), 3)
         for task in tasks:
             self.assertEqual(task.wd, wd)
@@ -113,10 +119,12 @@ class PrepareTasksTest(unittest.TestCase):
             with open(task.patch_path) as patch:
                 gold = "\n\n".join([file.diff for file in P2_DIFF1.files])
                 self.assertEqual(patch.read(), gold)
+                self.assertEqual(task.patch_key, blob_key(gold))
             self.assertEqual(wd, os.path.commonpath([wd, task.context_path]))
             with open(task.context_path) as context:
-                gold = _generate_patch_context(task.patch_path)
+                gold = _generate_patch_context(PatchAnalyzer(task.patch_path))
                 self.assertEqual(context.read(), gold)
+                self.assertEqual(task.context_key, blob_key(gold))
             self.assertTrue(os.path.exists(task.rule_path))
             self.assertListEqual(
                 [r for r in rules if r.name == os.path.basename(task.rule_path)][
@@ -131,13 +139,12 @@ class PrepareTasksTest(unittest.TestCase):
         _clean_wd(wd)
 
     def test_basic1_diff1(self) -> None:
-        task_id = f"task_id_{__name__}"
         # diffs = get_diffs(urls)
         diffs = [P1_DIFF1, P2_DIFF1]
         # populate_workdir(wd, diffs)
         wd = _get_wd("basic1")
         rules = load_rules(wd)
-        tasks = prepare_tasks(task_id, wd, rules, diffs)
+        tasks = prepare_tasks(wd, rules, diffs)
         self.assertEqual(len(tasks), 6)
         project_to_diff = {
             P2_DIFF1.project: "\n\n".join([file.diff for file in P2_DIFF1.files]),
@@ -149,10 +156,12 @@ class PrepareTasksTest(unittest.TestCase):
             with open(task.patch_path) as patch:
                 gold = project_to_diff[task.project]
                 self.assertEqual(patch.read(), gold)
+                self.assertEqual(task.patch_key, blob_key(gold))
             self.assertEqual(wd, os.path.commonpath([wd, task.context_path]))
             with open(task.context_path) as context:
-                gold = _generate_patch_context(task.patch_path)
+                gold = _generate_patch_context(PatchAnalyzer(task.patch_path))
                 self.assertEqual(context.read(), gold)
+                self.assertEqual(task.context_key, blob_key(gold))
             self.assertTrue(os.path.exists(task.rule_path))
             self.assertListEqual(
                 [r for r in rules if r.name == os.path.basename(task.rule_path)][
@@ -169,6 +178,128 @@ class PrepareTasksTest(unittest.TestCase):
         )
         _clean_wd(wd)
 
+    def test_cached_context(self) -> None:
+        diffs = [P1_DIFF1, P2_DIFF1]
+        wd = _get_wd("basic1")
+        rules = load_rules(wd)
+        p1_hash = blob_key("\n\n".join([file.diff for file in P1_DIFF1.files]))
+        p2_hash = blob_key("\n\n".join([file.diff for file in P2_DIFF1.files]))
+        cached_context = "cached context"
+
+        requested = list[list[str]]()
+
+        def context_cache(diff_hashes: list[str]) -> dict[str, str]:
+            requested.append(diff_hashes)
+            return {p1_hash: cached_context}
+
+        tasks = prepare_tasks(wd, rules, diffs, context_cache)
+        self.assertEqual(requested, [[p1_hash, p2_hash]])
+        self.assertEqual(len(tasks), 6)
+        for task in tasks:
+            with open(task.context_path) as context:
+                if task.patch_key == p1_hash:
+                    gold = cached_context
+                else:
+                    gold = _generate_patch_context(PatchAnalyzer(task.patch_path))
+                self.assertEqual(context.read(), gold)
+                self.assertEqual(task.context_key, blob_key(gold))
+        # contexts are emitted once per distinct context
+        self.assertEqual(len(set([task.context_path for task in tasks])), 2)
+        _clean_wd(wd)
+
+    def test_parallel(self) -> None:
+        diffs = [P1_DIFF1, P2_EMPTY, P2_DIFF1, P1_DIFF1]
+        wd = _get_wd("basic1")
+        rules = load_rules(wd)
+
+        serial = prepare_tasks(wd, rules, diffs)
+        parallel = prepare_tasks(wd, rules, diffs, max_workers=4)
+
+        # order of the tasks matters for the partitioning between workers
+        self.assertEqual(len(parallel), 9)
+        self.assertEqual(
+            [(t.project, t.rule_path, t.patch_key, t.context_key) for t in parallel],
+            [(t.project, t.rule_path, t.patch_key, t.context_key) for t in serial],
+        )
+        for task in parallel:
+            with open(task.patch_path) as patch:
+                self.assertEqual(blob_key(patch.read()), task.patch_key)
+            with open(task.context_path) as context:
+                self.assertEqual(blob_key(context.read()), task.context_key)
+        # identical diffs share the emitted files
+        self.assertEqual(len(set([t.patch_path for t in parallel])), 2)
+        self.assertEqual(
+            len(set([t.context_path for t in parallel])),
+            len(set([t.context_key for t in parallel])),
+        )
+        _clean_wd(wd)
+
+    def test_content_addressed_names(self) -> None:
+        diffs = [P1_DIFF1, P2_DIFF1]
+        wd = _get_wd("basic1")
+        rules = load_rules(wd)
+
+        tasks = prepare_tasks(wd, rules, diffs)
+        for task in tasks:
+            self.assertEqual(os.path.basename(task.patch_path), task.patch_key)
+            self.assertEqual(os.path.basename(task.context_path), task.context_key)
+
+        # identical content is named the same in every review
+        _clean_wd(wd)
+        next_review_tasks = prepare_tasks(wd, rules, list(reversed(diffs)))
+        self.assertEqual(
+            sorted([(t.patch_path, t.context_path) for t in tasks]),
+            sorted([(t.patch_path, t.context_path) for t in next_review_tasks]),
+        )
+        _clean_wd(wd)
+
+    def test_file_type_table(self) -> None:
+        diffs = [P1_DIFF1, P2_DIFF1]
+        wd = _get_wd("basic1")
+        rules = load_rules(wd)
+        # files of the mock projects are of no known type with the default table
+        classifier = FileTypeClassifier(
+            [
+                FileTypeRule(contains=["dir1/", "file3"], type="runtime"),
+                FileTypeRule(type="unit test"),
+            ]
+        )
+
+        project_diffs = {diff.project: diff for diff in diffs}
+        default_tasks = prepare_tasks(wd, rules, diffs)
+        for max_workers in [1, 4]:
+            tasks = prepare_tasks(
+                wd, rules, diffs, max_workers=max_workers, classifier=classifier
+            )
+            for task, default_task in zip(tasks, default_tasks):
+                self.assertNotEqual(task.context_key, default_task.context_key)
+                with open(task.context_path) as context:
+                    gold = _generate_patch_context(
+                        PatchAnalyzer.from_diff_files(
+                            project_diffs[task.project].files, classifier
+                        )
+                    )
+                    self.assertEqual(context.read(), gold)
+                self.assertIn("This patch contributes to the runtime", gold)
+                self.assertIn("This patch contributes to the tests", gold)
+
+        self.assertNotEqual(
+            patch_context_version(classifier),
+            patch_context_version(FileTypeClassifier(rules=[])),
+        )
+        _clean_wd(wd)
+
+    def test_cache_is_not_queried_without_tasks(self) -> None:
+        wd = _get_wd("basic1")
+        rules = load_rules(wd)
+
+        def context_cache(diff_hashes: list[str]) -> dict[str, str]:
+            raise Exception("Context cache must not be queried")
+
+        tasks = prepare_tasks(wd, rules, [P1_EMPTY, P2_EMPTY], context_cache)
+        self.assertListEqual(tasks, list())
+        _clean_wd(wd)
+
 
 class MapApplicableRulesToDiffsTest(unittest.TestCase):
     def test_basic_empty(self) -> None:
@@ -176,11 +307,11 @@ class MapApplicableRulesToDiffsTest(unittest.TestCase):
         rules = load_rules(wd)
 
         res = _map_applicable_rules_to_diffs(rules, RT_EMPTY)
-        ans = list[tuple[DevagentRule, str]]()
+        ans = list[tuple[DevagentRule, bytes]]()
         self.assertListEqual(res, ans)
 
         res = _map_applicable_rules_to_diffs(rules, FE_EMPTY)
-        ans = list[tuple[DevagentRule, str]]()
+        ans = list[tuple[DevagentRule, bytes]]()
         self.assertListEqual(res, ans)
 
     def test_basic1_empty(self) -> None:
@@ -188,17 +319,19 @@ class MapApplicableRulesToDiffsTest(unittest.TestCase):
         rules = load_rules(wd)
 
         res = _map_applicable_rules_to_diffs(rules, P1_EMPTY)
-        ans = list[tuple[DevagentRule, str]]()
+        ans = list[tuple[DevagentRule, bytes]]()
         self.assertListEqual(res, ans)
 
         res = _map_applicable_rules_to_diffs(rules, P2_EMPTY)
-        ans = list[tuple[DevagentRule, str]]()
+        ans = list[tuple[DevagentRule, bytes]]()
         self.assertListEqual(res, ans)
 
     def test_basic1_p1_diff1(self) -> None:
         wd = _get_wd("basic1")
         rules = load_rules(wd)
-        project1_combined_diff = "\n\n".join([file.diff for file in P1_DIFF1.files])
+        project1_combined_diff = "\n\n".join(
+            [file.diff for file in P1_DIFF1.files]
+        ).encode("utf-8")
         res = _map_applicable_rules_to_diffs(rules, P1_DIFF1)
         ans = [
             (
@@ -226,8 +359,12 @@ class MapApplicableRulesToDiffsTest(unittest.TestCase):
     def test_basic1_2_diff1(self) -> None:
         wd = _get_wd("basic1")
         rules = load_rules(wd)
-        project2_combined_diff = "\n\n".join([file.diff for file in P2_DIFF1.files])
+        project2_combined_diff = "\n\n".join(
+            [file.diff for file in P2_DIFF1.files]
+        ).encode("utf-8")
         res = _map_applicable_rules_to_diffs(rules, P2_DIFF1)
+        # combined diff is built once and shared by all rules
+        self.assertTrue(all(diff is res[0][1] for _, diff in res))
         ans = [
             (
                 DevagentRule(name="rule1.md", dirs=["project1/dir1/", "project2/dir1"]),
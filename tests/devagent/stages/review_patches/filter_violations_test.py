@@ -38,13 +38,12 @@ def _rule_url(rule_name: str) -> str:
 
 class FilterViolationsTest(unittest.TestCase):
     def test_basic1(self) -> None:
-        task_id = f"task_id_{__name__}"
         # diffs = get_diffs(urls)
         diffs = [P2_DIFF1, P1_DIFF1]
         # populate_workdir(wd, diffs)
         wd = _get_wd("basic1")
         rules = load_rules(wd)
-        tasks = prepare_tasks(task_id, wd, rules, diffs)
+        tasks = prepare_tasks(wd, rules, diffs)
         p1_tasks = {
             os.path.basename(task.rule_path): task
             for task in tasks
@@ -0,0 +1,42 @@
+import unittest
+import time
+
+from app.devagent.timings import StageTimings
+
+
+class StageTimingsTest(unittest.TestCase):
+    def test_spans(self) -> None:
+        timings = StageTimings("root", "task")
+
+        before = time.time()
+        with timings.stage("load_rules"):
+            time.sleep(0.01)
+        with timings.stage("review_patch", project="project1", rule="rule1"):
+            pass
+
+        self.assertEqual(
+            [span.stage for span in timings.spans], ["load_rules", "review_patch"]
+        )
+        load_rules, review_patch = timings.spans
+        self.assertEqual(load_rules.task_id, "task")
+        self.assertGreaterEqual(load_rules.started_at, before)
+        self.assertGreaterEqual(load_rules.duration, 0.01)
+        self.assertLess(review_patch.duration, load_rules.duration)
+        self.assertFalse(load_rules.failed)
+        self.assertEqual(load_rules.labels, dict())
+        self.assertEqual(review_patch.labels, {"project": "project1", "rule": "rule1"})
+
+    def test_failed_stage(self) -> None:
+        timings = StageTimings("root", "task")
+
+        with self.assertRaises(ValueError):
+            with timings.stage("prepare_tasks"):
+                raise ValueError("failed")
+
+        self.assertEqual(len(timings.spans), 1)
+        self.assertEqual(timings.spans[0].stage, "prepare_tasks")
+        self.assertTrue(timings.spans[0].failed)
+
+
+if __name__ == "__main__":
+    unittest.main()
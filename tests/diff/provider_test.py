@@ -0,0 +1,136 @@
+import unittest
+import redis
+
+from app.diff.models.diff import Diff, DiffFile, DiffSummary
+from app.diff.provider import (
+    IDiffProvider,
+    DiffProvider,
+    DiffCache,
+    DiffVersion,
+    CachedDiff,
+)
+
+
+def _make_diff(content: str) -> Diff:
+    return Diff(
+        remote="test.com",
+        project="owner/repo",
+        files=[DiffFile(file="f", diff=content, added_lines=1, removed_lines=0)],
+        summary=DiffSummary(
+            total_files=1, added_lines=1, removed_lines=0, base_sha="", head_sha=""
+        ),
+    )
+
+
+class _VersionedProvider(IDiffProvider):
+    def __init__(self) -> None:
+        self.contents = dict[str, str]()
+        self.n_fetched = 0
+        self.n_requests = 0
+
+    def domain(self) -> str:
+        return "test.com"
+
+    def get_diff(self, url: str) -> Diff:
+        return _make_diff(self.contents[url])
+
+    def get_diff_if_modified(
+        self, url: str, version: DiffVersion | None
+    ) -> tuple[Diff | None, DiffVersion]:
+        self.n_requests += 1
+        current = DiffVersion(etag=self.contents[url])
+        if version != None and version.etag == current.etag:
+            return None, current
+        self.n_fetched += 1
+        return self.get_diff(url), current
+
+
+class _UnversionedProvider(IDiffProvider):
+    def domain(self) -> str:
+        return "plain.com"
+
+    def get_diff(self, url: str) -> Diff:
+        return _make_diff(url)
+
+
+class DiffCacheTest(unittest.TestCase):
+    def test_lru(self) -> None:
+        cache = DiffCache(max_bytes=10)
+        version = DiffVersion(etag="e")
+        cache.put("a", CachedDiff(diff=_make_diff("aaaa"), version=version))
+        cache.put("b", CachedDiff(diff=_make_diff("bbbb"), version=version))
+        self.assertEqual(cache.total_bytes(), 10)
+
+        # touch `a`, so `b` becomes least recently used
+        self.assertIsNotNone(cache.get("a"))
+        cache.put("c", CachedDiff(diff=_make_diff("cccc"), version=version))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertEqual(cache.total_bytes(), 10)
+
+    def test_replace(self) -> None:
+        cache = DiffCache(max_bytes=100)
+        version = DiffVersion(etag="e")
+        cache.put("a", CachedDiff(diff=_make_diff("aaaa"), version=version))
+        cache.put("a", CachedDiff(diff=_make_diff("aa"), version=version))
+        self.assertEqual(cache.total_bytes(), 3)
+
+    def test_too_large(self) -> None:
+        cache = DiffCache(max_bytes=3)
+        version = DiffVersion(etag="e")
+        cache.put("a", CachedDiff(diff=_make_diff("aaaa"), version=version))
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.total_bytes(), 0)
+
+    def test_size_in_bytes(self) -> None:
+        cache = DiffCache(max_bytes=100)
+        version = DiffVersion(etag="e")
+        cache.put("a", CachedDiff(diff=_make_diff("яя"), version=version))
+        self.assertEqual(cache.total_bytes(), 5)
+
+    def test_redis_failure_is_miss(self) -> None:
+        # nothing listens on the port, so every command fails
+        unavailable = redis.Redis(port=1, socket_connect_timeout=0.1)
+        cache = DiffCache(max_bytes=100, redis_conn=unavailable)
+        version = DiffVersion(etag="e")
+
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", CachedDiff(diff=_make_diff("aa"), version=version))
+        self.assertIsNotNone(cache.get("a"))
+
+
+class DiffProviderTest(unittest.TestCase):
+    def test_revalidation(self) -> None:
+        url = "https://test.com/owner/repo/pull/1"
+        provider = _VersionedProvider()
+        provider.contents[url] = "v1"
+        diff_provider = DiffProvider(DiffCache(max_bytes=1024))
+        diff_provider.register_provider(provider)
+
+        self.assertEqual(diff_provider.get_diff(url).files[0].diff, "v1")
+        self.assertEqual(diff_provider.get_diff(url).files[0].diff, "v1")
+        self.assertEqual(provider.n_requests, 2)
+        self.assertEqual(provider.n_fetched, 1)
+
+        provider.contents[url] = "v2"
+        self.assertEqual(diff_provider.get_diff(url).files[0].diff, "v2")
+        self.assertEqual(provider.n_fetched, 2)
+
+    def test_unversioned(self) -> None:
+        url = "https://plain.com/owner/repo/pull/1"
+        cache = DiffCache(max_bytes=1024)
+        diff_provider = DiffProvider(cache)
+        diff_provider.register_provider(_UnversionedProvider())
+
+        self.assertEqual(diff_provider.get_diff(url).files[0].diff, url)
+        self.assertIsNone(cache.get(url))
+
+    def test_no_provider(self) -> None:
+        diff_provider = DiffProvider()
+        with self.assertRaises(Exception):
+            diff_provider.get_diff("https://unknown.com/owner/repo/pull/1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+import unittest.mock
+import urllib.parse
+import urllib.request
+import typing
+import json
+import io
+import email.message
+import urllib.error
+
+from app.diff.provider import DiffVersion
+from app.diff.providers.gitcode_provider import _try_get_diff
+
+_PR_URL = "https://gitcode.com/owner/repo/pull/1"
+
+
+def _diff_item(path: str) -> dict[str, typing.Any]:
+    return {
+        "statistic": {"path": path, "old_path": path, "new_path": path},
+        "added_lines": 1,
+        "remove_lines": 1,
+        "content": {
+            "text": [
+                {"type": "match", "line_content": "@@ -1,2 +1,2 @@"},
+                {"type": "context", "line_content": "ctx"},
+                {"type": "old", "line_content": "old"},
+                {"type": "new", "line_content": "new"},
+                {"type": "unknown", "line_content": "skipped"},
+            ]
+        },
+    }
+
+
+class _FakeResponse(io.BytesIO):
+    def __init__(self, body: bytes, etag: str) -> None:
+        super().__init__(body)
+        self.headers = email.message.Message()
+        self.headers["ETag"] = etag
+
+
+class _FakeApi:
+    def __init__(
+        self, paths: list[str], paginated: bool = True, etag: str = "etag"
+    ) -> None:
+        self.paths = paths
+        self.paginated = paginated
+        self.etag = etag
+        self.requested_pages = list[int]()
+
+    def urlopen(self, req: urllib.request.Request, timeout: int) -> _FakeResponse:
+        if req.get_header("If-none-match") == self.etag:
+            raise urllib.error.HTTPError(
+                req.full_url, 304, "Not Modified", email.message.Message(), None
+            )
+
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(req.full_url).query)
+        page = int(query["page"][0])
+        per_page = int(query["per_page"][0])
+        self.requested_pages.append(page)
+
+        if self.paginated:
+            page_paths = self.paths[(page - 1) * per_page : page * per_page]
+        else:
+            page_paths = self.paths
+
+        data = {
+            "count": len(self.paths),
+            "added_lines": len(self.paths),
+            "remove_lines": len(self.paths),
+            "diff_refs": {"base_sha": "base", "head_sha": "head"},
+            "diffs": [_diff_item(path) for path in page_paths],
+        }
+        return _FakeResponse(json.dumps(data).encode("utf-8"), self.etag)
+
+
+class TryGetDiffTest(unittest.TestCase):
+    def _get_diff(self, api: _FakeApi, per_page: int) -> typing.Any:
+        with unittest.mock.patch("urllib.request.urlopen", api.urlopen):
+            diff, _ = _try_get_diff("token", _PR_URL, per_page=per_page)
+            return diff
+
+    def test_single_page(self) -> None:
+        api = _FakeApi(["a", "b"])
+        diff = self._get_diff(api, per_page=10)
+        self.assertListEqual(api.requested_pages, [1])
+        self.assertEqual(diff.project, "owner/repo")
+        self.assertEqual(diff.summary.total_files, 2)
+        self.assertEqual(diff.summary.base_sha, "base")
+        self.assertEqual(diff.summary.head_sha, "head")
+        self.assertListEqual([file.file for file in diff.files], ["a", "b"])
+
+    def test_several_pages(self) -> None:
+        paths = [f"file{i}" for i in range(7)]
+        api = _FakeApi(paths)
+        diff = self._get_diff(api, per_page=3)
+        self.assertListEqual(api.requested_pages, [1, 2, 3])
+        self.assertListEqual([file.file for file in diff.files], paths)
+
+    def test_exact_pages(self) -> None:
+        paths = [f"file{i}" for i in range(6)]
+        api = _FakeApi(paths)
+        diff = self._get_diff(api, per_page=3)
+        self.assertListEqual(api.requested_pages, [1, 2])
+        self.assertListEqual([file.file for file in diff.files], paths)
+
+    def test_pagination_ignored(self) -> None:
+        paths = [f"file{i}" for i in range(7)]
+        api = _FakeApi(paths, paginated=False)
+        diff = self._get_diff(api, per_page=3)
+        self.assertListEqual(api.requested_pages, [1])
+        self.assertListEqual([file.file for file in diff.files], paths)
+
+    def test_diff_format(self) -> None:
+        diff = self._get_diff(_FakeApi(["dir/file"]), per_page=10)
+        self.assertEqual(
+            diff.files[0].diff,
+            "\n".join(
+                [
+                    "diff --git a/dir/file b/dir/file",
+                    "--- a/dir/file",
+                    "+++ b/dir/file",
+                    "@@ -1,2 +1,2 @@",
+                    " ctx",
+                    "-old",
+                    "+new",
+                ]
+            ),
+        )
+        self.assertEqual(diff.files[0].added_lines, 1)
+        self.assertEqual(diff.files[0].removed_lines, 1)
+
+    def test_version(self) -> None:
+        api = _FakeApi(["a"], etag="v1")
+        with unittest.mock.patch("urllib.request.urlopen", api.urlopen):
+            diff, version = _try_get_diff("token", _PR_URL)
+            self.assertIsNotNone(diff)
+            self.assertEqual(version.etag, "v1")
+
+            diff, version = _try_get_diff("token", _PR_URL, version=version)
+            self.assertIsNone(diff)
+            self.assertEqual(version.etag, "v1")
+
+            diff, version = _try_get_diff(
+                "token", _PR_URL, version=DiffVersion(etag="v0")
+            )
+            self.assertIsNotNone(diff)
+            self.assertEqual(version.etag, "v1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+import tempfile
+import subprocess
+import os
+
+from app.diff.providers.local_git_provider import LocalGitDiffProvider
+
+
+def _git(root: str, *args: str) -> str:
+    cmd = [
+        "git",
+        "-C",
+        root,
+        "-c",
+        "user.name=test",
+        "-c",
+        "user.email=test@test.com",
+        *args,
+    ]
+    res = subprocess.run(cmd, capture_output=True, check=True)
+    return res.stdout.decode("utf-8").strip()
+
+
+def _write(root: str, path: str, content: str) -> None:
+    abspath = os.path.join(root, path)
+    os.makedirs(os.path.dirname(abspath), exist_ok=True)
+    with open(abspath, "w") as f:
+        f.write(content)
+
+
+class LocalGitDiffProviderTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        work = os.path.join(self.tmp.name, "work")
+        os.makedirs(work)
+        _git(work, "init", "-q")
+
+        _write(work, "dir1/file1", "a\nb\nc\n")
+        _write(work, "to_remove", "x\n")
+        _write(work, "to_rename", "same\ncontent\n")
+        _git(work, "add", "-A")
+        _git(work, "commit", "-q", "-m", "base")
+        self.base_sha = _git(work, "rev-parse", "HEAD")
+
+        _write(work, "dir1/file1", "a\nB\nc\nd\n")
+        _write(work, "dir2/new_file", "new\n")
+        os.remove(os.path.join(work, "to_remove"))
+        _git(work, "mv", "to_rename", "renamed")
+        _git(work, "add", "-A")
+        _git(work, "commit", "-q", "-m", "head")
+        self.head_sha = _git(work, "rev-parse", "HEAD")
+
+        self.mirrors_root = os.path.join(self.tmp.name, "mirrors")
+        mirror = os.path.join(self.mirrors_root, "owner", "repo.git")
+        subprocess.run(
+            ["git", "clone", "-q", "--mirror", work, mirror],
+            capture_output=True,
+            check=True,
+        )
+
+        self.provider = LocalGitDiffProvider(self.mirrors_root, "gitcode.com")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_revisions_diff(self) -> None:
+        diff = self.provider.get_revisions_diff(
+            "owner/repo", self.base_sha, self.head_sha
+        )
+        self.assertEqual(diff.remote, "gitcode.com")
+        self.assertEqual(diff.project, "owner/repo")
+        self.assertEqual(diff.summary.base_sha, self.base_sha)
+        self.assertEqual(diff.summary.head_sha, self.head_sha)
+
+        files = {file.file: file for file in diff.files}
+        self.assertListEqual(
+            sorted(files.keys()),
+            sorted(["dir1/file1", "dir2/new_file", "to_remove", "renamed"]),
+        )
+        self.assertEqual(diff.summary.total_files, 4)
+
+        self.assertEqual(files["dir1/file1"].added_lines, 2)
+        self.assertEqual(files["dir1/file1"].removed_lines, 1)
+        self.assertTrue(
+            files["dir1/file1"].diff.startswith("diff --git a/dir1/file1 b/dir1/file1")
+        )
+        self.assertIn("+B", files["dir1/file1"].diff)
+        self.assertEqual(files["dir2/new_file"].added_lines, 1)
+        self.assertEqual(files["to_remove"].removed_lines, 1)
+        self.assertEqual(files["renamed"].added_lines, 0)
+        self.assertEqual(files["renamed"].removed_lines, 0)
+
+        self.assertEqual(diff.summary.added_lines, 3)
+        self.assertEqual(diff.summary.removed_lines, 2)
+
+    def test_url(self) -> None:
+        url = f"https://git-mirror/owner/repo/compare/{self.base_sha}...{self.head_sha}"
+        diff = self.provider.get_diff(url)
+        self.assertEqual(diff.summary.total_files, 4)
+
+    def test_invalid_url(self) -> None:
+        with self.assertRaises(Exception):
+            self.provider.get_diff("https://git-mirror/owner/repo/pull/1")
+
+    def test_url_outside_of_mirrors_root(self) -> None:
+        for project in ["../owner", "owner/..", "./owner"]:
+            url = f"https://git-mirror/{project}/compare/{self.base_sha}...{self.head_sha}"
+            with self.assertRaises(Exception):
+                self.provider.get_diff(url)
+
+        with self.assertRaisesRegex(Exception, "outside of the mirrors root"):
+            self.provider.get_revisions_diff(
+                "../work", self.base_sha, self.head_sha
+            )
+
+    def test_missing_mirror(self) -> None:
+        with self.assertRaises(Exception):
+            self.provider.get_revisions_diff(
+                "owner/other", self.base_sha, self.head_sha
+            )
+
+    def test_missing_revision(self) -> None:
+        with self.assertRaises(Exception):
+            self.provider.get_revisions_diff("owner/repo", self.base_sha, "0" * 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
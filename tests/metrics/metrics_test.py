@@ -0,0 +1,148 @@
+import unittest
+import fastapi
+import prometheus_client
+import redis
+
+from app.db.async_db import AsyncDBConnection, AsyncDBConnectionConfig
+from app.redis.async_redis import AsyncRedis, AsyncRedisConfig
+from app.redis.schemas.task_timings import StageTiming
+from app.metrics.metrics import observe_cache, observe_stage
+from app.metrics.listener import ListenerCollector, observe_request, render_metrics
+
+
+def _sample(name: str, labels: dict[str, str]) -> float:
+    return prometheus_client.REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsTest(unittest.TestCase):
+    def test_observe_request(self) -> None:
+        ok = {"task_kind": "0", "action": "1", "status": "200"}
+        bad = {"task_kind": "other", "action": "other", "status": "400"}
+        ok_before = _sample("devagent_listener_request_duration_seconds_count", ok)
+        bad_before = _sample("devagent_listener_request_duration_seconds_count", bad)
+        unknown = {"task_kind": "0", "action": "other", "status": "200"}
+        unknown_before = _sample(
+            "devagent_listener_request_duration_seconds_count", unknown
+        )
+
+        with observe_request(0, 1, [0, 1, 3], [0, 1, 2]):
+            pass
+        with observe_request(0, 7, [0, 1, 3], [0, 1, 2]):
+            pass
+        with self.assertRaises(fastapi.HTTPException):
+            with observe_request(42, 1000, [0, 1, 3], []):
+                raise fastapi.HTTPException(status_code=400)
+
+        self.assertEqual(
+            _sample("devagent_listener_request_duration_seconds_count", ok),
+            ok_before + 1,
+        )
+        self.assertEqual(
+            _sample("devagent_listener_request_duration_seconds_count", bad),
+            bad_before + 1,
+        )
+        self.assertEqual(
+            _sample("devagent_listener_request_duration_seconds_count", unknown),
+            unknown_before + 1,
+        )
+
+    def test_observe_stage(self) -> None:
+        labels = {"stage": "review_patch", "rule": "ETS001", "status": "failed"}
+        before = _sample("devagent_worker_rule_duration_seconds_count", labels)
+
+        observe_stage(
+            StageTiming(
+                stage="review_patch",
+                task_id="task",
+                started_at=0,
+                duration=2,
+                failed=True,
+                labels={"rule": "ETS001"},
+            )
+        )
+
+        self.assertEqual(
+            _sample("devagent_worker_rule_duration_seconds_count", labels), before + 1
+        )
+        self.assertGreaterEqual(
+            _sample(
+                "devagent_worker_stage_duration_seconds_count",
+                {"stage": "review_patch", "status": "failed"},
+            ),
+            1,
+        )
+
+    def test_observe_cache(self) -> None:
+        hit = {"cache": "test", "result": "hit"}
+        miss = {"cache": "test", "result": "miss"}
+        hits_before = _sample("devagent_cache_requests_total", hit)
+        misses_before = _sample("devagent_cache_requests_total", miss)
+
+        observe_cache("test", hits=3, misses=1)
+        observe_cache("test", hits=0, misses=0)
+
+        self.assertEqual(_sample("devagent_cache_requests_total", hit), hits_before + 3)
+        self.assertEqual(
+            _sample("devagent_cache_requests_total", miss), misses_before + 1
+        )
+
+    def test_listener_collector(self) -> None:
+        db = AsyncDBConnection(
+            AsyncDBConnectionConfig(
+                protocol="postgresql+asyncpg",
+                host="localhost",
+                port=5432,
+                user="user",
+                password="password",
+                db="db",
+            ),
+            pool_size=3,
+        )
+        async_redis = AsyncRedis(
+            AsyncRedisConfig(
+                host="localhost", port=6379, password="password", db=0, expiry=10
+            )
+        )
+        # nothing listens on the port, depth of the queue is skipped
+        broker = redis.Redis(host="localhost", port=1, socket_connect_timeout=1)
+
+        registry = prometheus_client.CollectorRegistry()
+        registry.register(ListenerCollector(db, async_redis, broker, "celery"))
+
+        self.assertEqual(
+            registry.get_sample_value(
+                "devagent_listener_db_pool_connections", {"state": "size"}
+            ),
+            3,
+        )
+        self.assertEqual(
+            registry.get_sample_value(
+                "devagent_listener_redis_pool_connections", {"state": "in_use"}
+            ),
+            0,
+        )
+        self.assertIsNone(registry.get_sample_value("devagent_worker_queue_depth"))
+
+    def test_redis_pool_without_counters(self) -> None:
+        async_redis = AsyncRedis(
+            AsyncRedisConfig(
+                host="localhost", port=6379, password="password", db=0, expiry=10
+            )
+        )
+        self.assertEqual(async_redis.pool_status(), (0, 0))
+
+        # pool of another redis-py release, which tracks connections differently
+        async_redis._conn.connection_pool = object()  # type: ignore
+        self.assertIsNone(async_redis.pool_status())
+
+    def test_render_metrics(self) -> None:
+        observe_cache("test", hits=1, misses=0)
+
+        response = render_metrics()
+
+        self.assertEqual(response.media_type, prometheus_client.CONTENT_TYPE_LATEST)
+        self.assertIn(b"devagent_cache_requests_total", response.body)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import asyncio
+import http.server
+import io
+import os
+import threading
+import typing
+import unittest
+
+from app.nexus.repo import NexusRepo
+
+
+class _NexusStandIn(http.server.ThreadingHTTPServer):
+    files: dict[str, bytes]
+    clients: list[tuple[str, int]]
+    failures: list[int]  # status codes returned to the next requests before success
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.files = dict()
+        self.clients = list()
+        self.failures = list()
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    server: _NexusStandIn
+
+    def do_PUT(self) -> None:
+        self.server.clients.append(self.client_address)
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+
+        if len(self.server.failures) > 0:
+            status = self.server.failures.pop(0)
+        else:
+            status = 201
+            self.server.files.update({self.path: body})
+
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args: typing.Any) -> None:
+        pass
+
+
+class NexusRepoTest(unittest.TestCase):
+    server: _NexusStandIn
+    thread: threading.Thread
+    repo: NexusRepo
+
+    def setUp(self) -> None:
+        self.server = _NexusStandIn()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        host, port = self.server.server_address[:2]
+        self.repo = NexusRepo(
+            "user", "pass", f"http://{host!s}:{port}/repository/raw", backoff=0
+        )
+
+    def tearDown(self) -> None:
+        self.repo.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_upload_reuses_connection(self) -> None:
+        data = os.urandom(1024 * 1024)
+
+        url = self.repo.upload_fileobj(io.BytesIO(data), len(data), "a.zip")
+        self.repo.upload_fileobj(io.BytesIO(b"small"), 5, "b.zip")
+
+        self.assertTrue(url.endswith("/repository/raw/a.zip"))
+        self.assertEqual(self.server.files["/repository/raw/a.zip"], data)
+        self.assertEqual(self.server.files["/repository/raw/b.zip"], b"small")
+        self.assertEqual(len(set(self.server.clients)), 1)
+
+    def test_upload_retries_from_the_start(self) -> None:
+        self.server.failures = [503, 502]
+        data = io.BytesIO(b"header" + b"payload")
+        data.seek(len(b"header"))
+
+        self.repo.upload_fileobj(data, len(b"payload"), "retried.zip")
+
+        self.assertEqual(len(self.server.clients), 3)
+        self.assertEqual(self.server.files["/repository/raw/retried.zip"], b"payload")
+
+    def test_upload_gives_up(self) -> None:
+        self.server.failures = [503] * 10
+
+        with self.assertRaises(Exception):
+            self.repo.upload_fileobj(io.BytesIO(b"data"), 4, "failed.zip")
+
+        # first try and 3 retries
+        self.assertEqual(len(self.server.clients), 4)
+
+    def test_client_errors_are_not_retried(self) -> None:
+        self.server.failures = [403]
+
+        with self.assertRaises(Exception):
+            self.repo.upload_fileobj(io.BytesIO(b"data"), 4, "forbidden.zip")
+
+        self.assertEqual(len(self.server.clients), 1)
+
+    def test_upload_file_async(self) -> None:
+        url = asyncio.run(
+            self.repo.upload_fileobj_async(io.BytesIO(b"async"), 5, "async.zip")
+        )
+
+        self.assertTrue(url.endswith("/async.zip"))
+        self.assertEqual(self.server.files["/repository/raw/async.zip"], b"async")
@@ -1,8 +1,43 @@
 import unittest
 
+from app.diff.models.diff import DiffFile
 from app.patch.analyzer import PatchAnalyzer
 
 
+def _summaries(pa: PatchAnalyzer) -> list[str]:
+    assert pa.analyze()
+    return [
+        pa.verboseRuntimeSummary(),
+        pa.verboseFrontEndSummary(),
+        pa.verboseTestSummary(),
+    ] + pa.rawSummary()
+
+
+def _split_diff_files(patch: str) -> list[DiffFile]:
+    files = list[DiffFile]()
+    for chunk in patch.split("diff --git ")[1:]:
+        lines = ("diff --git " + chunk).rstrip("\n").split("\n")
+        added_lines = 0
+        removed_lines = 0
+        in_hunk = False
+        for line in lines:
+            if in_hunk and line.startswith("+"):
+                added_lines += 1
+            elif in_hunk and line.startswith("-"):
+                removed_lines += 1
+            elif line.startswith("@@"):
+                in_hunk = True
+        files.append(
+            DiffFile(
+                file=lines[0].split(" b/")[-1],
+                diff="\n".join(lines),
+                added_lines=added_lines,
+                removed_lines=removed_lines,
+            )
+        )
+    return files
+
+
 class PatchAnalyzerTest(unittest.TestCase):
     def test_8860(self) -> None:
         pa = PatchAnalyzer("./tests/patch/8860.patch")
@@ -11,6 +46,105 @@ class PatchAnalyzerTest(unittest.TestCase):
         print(pa.verboseTestSummary())
         print("\n".join(pa.rawSummary()))
 
+    def test_categories(self) -> None:
+        pa = PatchAnalyzer("./tests/patch/categories.patch")
+        assert pa.analyze()
+
+        self.assertEqual(
+            pa.verboseRuntimeSummary(),
+            "This patch contributes to the runtime main code base.\n\n"
+            "Overall, 3 LoC are added, and 2 LoC are removed.\n\n"
+            "In particular, 1 LoC are added to the ETS stdlib, 1 LoC are removed from the ETS stdlib.\n\n",
+        )
+        self.assertEqual(
+            pa.verboseFrontEndSummary(),
+            "This patch contributes to the front-end main code base.\n\n"
+            "Overall, 4 LoC are added, and 2 LoC are removed.\n\n"
+            "In particular, 2 LoC are added to the type checker, 1 LoC are removed from the type checker.\n\n"
+            "In particular, 1 LoC are added to the AST verifier, 0 LoC are removed from the AST verifier.\n\n"
+            "In particular, 1 LoC are added to the code generator, 1 LoC are removed from the code generator.\n\n",
+        )
+        self.assertEqual(
+            pa.verboseTestSummary(),
+            "This patch contributes to the tests.\n\n"
+            "Overall, 2 LoC are added to the tests, and 1 LoC are removed from the tests.\n\n"
+            "In particular, the patch adds 1 tests, does not remove tests, modifies 1 existing tests.\n\n"
+            "The patch has 2 positive tests which decrease assertion usage.\n\n",
+        )
+        self.assertEqual(
+            pa.rawSummary()[0],
+            "static_core/runtime/foo.cpp: modified file (contributes to: runtime), "
+            "2 lines added, 1 lines removed, 1 assertions added, 1 assertions removed, "
+            "0 CTE checks added, 0 CTE checks removed",
+        )
+        self.assertEqual(
+            [(fi.state, fi.type) for fi in pa.file_facts[-4:]],
+            [
+                ("added", "positive front-end test"),
+                ("modified", "positive front-end test"),
+                ("removed", "other"),
+                ("renamed", "other"),
+            ],
+        )
+
+    def test_in_memory_sources(self) -> None:
+        for path in ["./tests/patch/8860.patch", "./tests/patch/categories.patch"]:
+            with open(path, "r") as f:
+                patch = f.read()
+
+            gold = _summaries(PatchAnalyzer(path))
+
+            self.assertEqual(
+                _summaries(PatchAnalyzer.from_lines(patch.splitlines(keepends=True))),
+                gold,
+            )
+            self.assertEqual(
+                _summaries(PatchAnalyzer.from_lines(patch.split("\n"))), gold
+            )
+            self.assertEqual(
+                _summaries(PatchAnalyzer.from_bytes(patch.encode("utf-8"))), gold
+            )
+            self.assertEqual(
+                _summaries(PatchAnalyzer.from_bytes(memoryview(patch.encode("utf-8")))),
+                gold,
+            )
+            self.assertEqual(
+                _summaries(PatchAnalyzer.from_diff_files(_split_diff_files(patch))),
+                gold,
+            )
+
+    def test_diff_files_counts_are_reused(self) -> None:
+        file = DiffFile(
+            file="ets2panda/parser/parser.cpp",
+            diff="diff --git a/ets2panda/parser/parser.cpp b/ets2panda/parser/parser.cpp\n"
+            "--- a/ets2panda/parser/parser.cpp\n"
+            "+++ b/ets2panda/parser/parser.cpp\n"
+            "@@ -1 +1 @@\n"
+            "--- not a header\n"
+            "+ES2PANDA_ASSERT(x);",
+            added_lines=10,
+            removed_lines=20,
+        )
+        binary = DiffFile(
+            file="static_core/runtime/image.png",
+            diff="diff --git a/static_core/runtime/image.png b/static_core/runtime/image.png\n"
+            "Binary files differ",
+            added_lines=0,
+            removed_lines=0,
+        )
+
+        pa = PatchAnalyzer.from_diff_files([file, binary])
+        assert pa.analyze()
+
+        self.assertEqual(len(pa.file_facts), 2)
+        fi = pa.file_facts[0]
+        self.assertEqual(fi.new_name, "ets2panda/parser/parser.cpp")
+        self.assertEqual(fi.type, "front-end parser")
+        self.assertEqual((fi.num_added_lines, fi.num_removed_lines), (10, 20))
+        self.assertEqual(fi.num_added_assertions, 1)
+        self.assertEqual(pa.file_facts[1].old_name, "static_core/runtime/image.png")
+        self.assertEqual(pa.file_facts[1].state, "modified")
+
 
 if __name__ == "__main__":
     unittest.main()
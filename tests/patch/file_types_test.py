@@ -0,0 +1,153 @@
+import unittest
+import tempfile
+import json
+import pickle
+
+from app.patch.file_types import (
+    FileTypeRule,
+    FileTypeClassifier,
+    DEFAULT_FILE_TYPE_CLASSIFIER,
+    load_file_type_classifier,
+)
+
+
+class FileTypeClassifierTest(unittest.TestCase):
+    def test_default_table(self) -> None:
+        cases = [
+            ("README.md", "other"),
+            ("static_core/runtime/tests/class_linker_test.cpp", "unit test"),
+            ("static_core/runtime/tests/data.txt", "test"),
+            ("ets2panda/test/unit/foo.ets", "front-end test"),
+            ("ets2panda/test/ast/parser/ets/foo.ets", "negative front-end test"),
+            ("ets2panda/test/runtime/ets/foo.sts", "positive front-end test"),
+            ("static_core/plugins/ets/tests/ets-templates/a/b.ets", "CTS test"),
+            ("static_core/plugins/ets/tests/ets_func_tests/a.ets", "functional test"),
+            ("ets2panda/parser/ETSparser.cpp", "front-end parser"),
+            ("ets2panda/ir/astNode.h", "front-end parser"),
+            ("ets2panda/checker/ETSchecker.cpp", "front-end checker"),
+            ("ets2panda/ast_verifier/helpers.cpp", "front-end AST verifier"),
+            ("ets2panda/compiler/core/ETSGen.cpp", "front-end code generator"),
+            ("ets2panda/compiler/core/ETSemitter.h", "front-end code generator"),
+            ("ets2panda/parser/README.md", "front-end"),
+            ("static_core/plugins/ets/stdlib/std/core/Array.ets", "runtime ETS stdlib"),
+            ("static_core/runtime/class_linker.cpp", "runtime"),
+            ("static_core/runtime/BUILD.gn", "other"),
+        ]
+
+        for path, type in cases:
+            self.assertEqual(DEFAULT_FILE_TYPE_CLASSIFIER.classify(path), type, path)
+
+    def test_rules_are_ordered(self) -> None:
+        # "a" matches later in the path than "b", but it's rule goes first
+        classifier = FileTypeClassifier(
+            [
+                FileTypeRule(contains=["a"], type="runtime"),
+                FileTypeRule(contains=["b"], type="front-end"),
+            ]
+        )
+        self.assertEqual(classifier.classify("b/a"), "runtime")
+        self.assertEqual(classifier.classify("b/c"), "front-end")
+        self.assertEqual(classifier.classify("c/c"), "other")
+
+    def test_nested_rules_keep_parent_type(self) -> None:
+        classifier = FileTypeClassifier(
+            [
+                FileTypeRule(
+                    contains=["src/"],
+                    type="runtime",
+                    rules=[FileTypeRule(suffixes=[".md"], type="test")],
+                )
+            ]
+        )
+        self.assertEqual(classifier.classify("src/a.md"), "test")
+        self.assertEqual(classifier.classify("src/a.cpp"), "runtime")
+        # suffix must be at the end of the path
+        self.assertEqual(classifier.classify("src/a.md.cpp"), "runtime")
+
+    def test_patterns_are_escaped(self) -> None:
+        classifier = FileTypeClassifier(
+            [FileTypeRule(contains=["a.b"], suffixes=[".h"], type="runtime")]
+        )
+        self.assertEqual(classifier.classify("x/a.b/y.h"), "runtime")
+        self.assertEqual(classifier.classify("x/axb/y.h"), "other")
+
+    def test_cache_is_bounded(self) -> None:
+        classifier = FileTypeClassifier(
+            [FileTypeRule(contains=["src/"], type="runtime")], max_cached_paths=2
+        )
+        for i in range(5):
+            self.assertEqual(classifier.classify(f"src/{i}"), "runtime")
+            self.assertEqual(classifier.classify(f"src/{i}"), "runtime")
+            self.assertLessEqual(len(classifier._cache), 2)
+
+    def test_from_json(self) -> None:
+        rules = [
+            {"contains": ["lib/"], "type": "runtime", "rules": []},
+            {"suffixes": [".ets"], "type": "front-end test"},
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as f:
+            json.dump(rules, f)
+            f.flush()
+            classifier = FileTypeClassifier.from_json(f.name)
+
+        self.assertEqual(classifier.classify("lib/a.ets"), "runtime")
+        self.assertEqual(classifier.classify("tests/a.ets"), "front-end test")
+
+    def test_from_json_custom_type(self) -> None:
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as f:
+            json.dump([{"contains": ["lib/"], "type": "library"}], f)
+            f.flush()
+            classifier = FileTypeClassifier.from_json(f.name)
+
+        self.assertEqual(classifier.classify("lib/a.cpp"), "library")
+
+    def test_from_json_invalid_type(self) -> None:
+        for type in ["", 1]:
+            with tempfile.NamedTemporaryFile("w", suffix=".json") as f:
+                json.dump([{"contains": ["lib/"], "type": type}], f)
+                f.flush()
+                with self.assertRaises(Exception):
+                    FileTypeClassifier.from_json(f.name)
+
+    def test_load(self) -> None:
+        self.assertIs(load_file_type_classifier(""), DEFAULT_FILE_TYPE_CLASSIFIER)
+
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as f:
+            json.dump([{"contains": ["lib/"], "type": "library"}], f)
+            f.flush()
+            classifier = load_file_type_classifier(f.name)
+
+        self.assertEqual(classifier.classify("lib/a.cpp"), "library")
+
+    def test_fingerprint(self) -> None:
+        rules = [FileTypeRule(contains=["lib/"], type="library")]
+        self.assertEqual(
+            FileTypeClassifier(rules).fingerprint(),
+            FileTypeClassifier(list(rules)).fingerprint(),
+        )
+        self.assertNotEqual(
+            FileTypeClassifier(rules).fingerprint(),
+            DEFAULT_FILE_TYPE_CLASSIFIER.fingerprint(),
+        )
+        self.assertNotEqual(
+            FileTypeClassifier(rules).fingerprint(),
+            FileTypeClassifier(
+                [FileTypeRule(contains=["lib/"], type="runtime")]
+            ).fingerprint(),
+        )
+
+    def test_pickle(self) -> None:
+        classifier = FileTypeClassifier(
+            [FileTypeRule(contains=["lib/"], type="library")]
+        )
+        classifier.classify("lib/a.cpp")
+
+        copy = pickle.loads(pickle.dumps(classifier))
+
+        self.assertEqual(copy.classify("lib/b.cpp"), "library")
+        self.assertEqual(copy.fingerprint(), classifier.fingerprint())
+        # memoised paths are not sent along
+        self.assertEqual(len(copy._cache), 1)
+
+if __name__ == "__main__":
+    unittest.main()
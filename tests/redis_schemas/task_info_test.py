@@ -0,0 +1,52 @@
+import unittest
+import jsonschema
+
+from app.blob.blob import blob_key
+from app.redis.schemas.task_info import (
+    TASK_INFO_VALIDATOR,
+    task_info_task_id_key,
+    task_info_rules_revision_key,
+    task_info_devagent_revision_key,
+    task_info_project_revision_key,
+    task_info_patch_content_key,
+    task_info_patch_context_key,
+)
+
+
+def _make_task_info() -> dict[str, str]:
+    return {
+        task_info_task_id_key(): "task_id",
+        task_info_rules_revision_key(): "rules_rev",
+        task_info_devagent_revision_key(): "devagent_rev",
+        task_info_project_revision_key("owner/repo"): "project_rev",
+        "ETS001_rule": "patch",
+        task_info_patch_content_key("patch"): blob_key("content"),
+        task_info_patch_context_key("patch"): blob_key("context"),
+    }
+
+
+class TaskInfoValidatorTest(unittest.TestCase):
+    def test_valid(self) -> None:
+        TASK_INFO_VALIDATOR.validate(_make_task_info())
+
+    def test_missing_required(self) -> None:
+        task_info = _make_task_info()
+        task_info.pop(task_info_devagent_revision_key())
+        with self.assertRaises(jsonschema.ValidationError):
+            TASK_INFO_VALIDATOR.validate(task_info)
+
+    def test_unknown_key(self) -> None:
+        task_info = _make_task_info()
+        task_info.update({"unknown": "value"})
+        with self.assertRaises(jsonschema.ValidationError):
+            TASK_INFO_VALIDATOR.validate(task_info)
+
+    def test_content_is_not_blob_key(self) -> None:
+        task_info = _make_task_info()
+        task_info.update({task_info_patch_content_key("patch"): "+added line"})
+        with self.assertRaises(jsonschema.ValidationError):
+            TASK_INFO_VALIDATOR.validate(task_info)
+
+
+if __name__ == "__main__":
+    unittest.main()
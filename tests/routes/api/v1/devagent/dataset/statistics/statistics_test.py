@@ -0,0 +1,73 @@
+import asyncio
+import datetime
+import typing
+import unittest
+
+import fastapi
+
+from app.db.schemas.user_feedback import Feedback
+from app.routes.api.v1.devagent.tasks.dataset.actions.statistics import (
+    action_statistics,
+)
+
+
+class _Row(typing.NamedTuple):
+    rule: str
+    feedback: int
+    total: int
+
+
+class _FakeDB:
+    rows: list[_Row]
+    kwargs: dict[str, typing.Any]
+
+    def __init__(self, rows: list[_Row]) -> None:
+        self.rows = rows
+        self.kwargs = dict()
+
+    async def query_feedback_stats(self, **kwargs: typing.Any) -> list[_Row]:
+        self.kwargs = kwargs
+        return self.rows
+
+
+class DatasetStatisticsTest(unittest.TestCase):
+    def test_precision_per_rule(self) -> None:
+        db = _FakeDB(
+            [
+                _Row("rule-a", Feedback.FALSE_POSITIVE.value, 1),
+                _Row("rule-a", Feedback.TRUE_POSITIVE.value, 3),
+                _Row("rule-b", Feedback.FALSE_POSITIVE.value, 2),
+                _Row("rule-c", Feedback.FALSE_NEGATIE.value, 5),
+            ]
+        )
+
+        response = asyncio.run(
+            action_statistics(
+                db=db,
+                query_params={"date_from": "2025-12-01", "rule": "rule-a"},
+            )
+        )
+
+        self.assertEqual(
+            db.kwargs,
+            {
+                "day_from": datetime.date(2025, 12, 1),
+                "day_to": None,
+                "rule": "rule-a",
+                "project": None,
+            },
+        )
+
+        statistics = dict((s.rule, s) for s in response.statistics)
+        self.assertEqual(statistics["rule-a"].true_positive, 3)
+        self.assertEqual(statistics["rule-a"].false_positive, 1)
+        self.assertEqual(statistics["rule-a"].precision, 0.75)
+        self.assertEqual(statistics["rule-b"].precision, 0.0)
+        self.assertEqual(statistics["rule-c"].precision, None)
+
+    def test_invalid_query_params(self) -> None:
+        with self.assertRaises(fastapi.HTTPException) as ctx:
+            asyncio.run(
+                action_statistics(db=_FakeDB([]), query_params={"date_from": "x"})
+            )
+        self.assertEqual(ctx.exception.status_code, 400)
@@ -0,0 +1,53 @@
+import asyncio
+import typing
+import unittest
+
+import fastapi
+
+from app.routes.api.v1.devagent.tasks.user_feedback.actions.set import (
+    action_set,
+    _encrypt_project_file_line_rule,
+)
+
+
+class _FakeRedis:
+    requested_keys: list[str]
+
+    def __init__(self) -> None:
+        self.requested_keys = list()
+
+    async def get_task_info_fields(
+        self, task_id: str, keys: list[str]
+    ) -> dict[str, str] | None:
+        self.requested_keys.extend(keys)
+        return None
+
+
+class UserFeedbackSetTest(unittest.TestCase):
+    def _set(self, redis: _FakeRedis, rule: str) -> typing.Any:
+        data = _encrypt_project_file_line_rule("owner/repo", "a.cpp", "1", rule)
+        return asyncio.run(
+            action_set(
+                db=None,
+                redis=redis,
+                query_params={"task_id": "task", "feedback": 0, "data": data},
+            )
+        )
+
+    def test_invalid_rule(self) -> None:
+        redis = _FakeRedis()
+        with self.assertRaises(fastapi.HTTPException) as e:
+            self._set(redis, "task_id_is_not_a_rule")
+        self.assertEqual(e.exception.status_code, 400)
+        self.assertEqual(redis.requested_keys, [])
+
+    def test_expired_task_info(self) -> None:
+        redis = _FakeRedis()
+        with self.assertRaises(fastapi.HTTPException) as e:
+            self._set(redis, "ETS001")
+        self.assertEqual(e.exception.status_code, 400)
+        self.assertIn("ETS001", redis.requested_keys)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import asyncio
+
+from app.utils.timer import Timer, TimerRegistry, TimerResolution, timed
+
+
+class TimerTest(unittest.TestCase):
+    def test_measure(self) -> None:
+        timer = Timer("test")
+        self.assertEqual(timer.measure(), None)
+
+        with self.assertLogs("Timer", level="INFO") as logs:
+            with timer:
+                self.assertTrue(timer.is_running())
+        self.assertFalse(timer.is_running())
+
+        seconds = timer.measure()
+        self.assertIsInstance(seconds, float)
+        assert seconds is not None
+        self.assertGreaterEqual(seconds, 0)
+        self.assertIn("[test] elapsed:", logs.output[0])
+
+    def test_measure_nanoseconds(self) -> None:
+        with Timer("test", TimerResolution.NANOSECONDS, TimerRegistry()) as timer:
+            pass
+        self.assertIsInstance(timer.measure(), int)
+        self.assertEqual(timer.measure(), timer.elapsed_ns())
+
+    def test_stop_is_idempotent(self) -> None:
+        timer = Timer("test")
+        timer.reset()
+        timer.stop()
+        toc = timer.toc
+        timer.stop()
+        self.assertEqual(timer.toc, toc)
+
+
+class TimerRegistryTest(unittest.TestCase):
+    def test_stats(self) -> None:
+        registry = TimerRegistry()
+        for elapsed in range(1, 101):
+            registry.record("test", elapsed * 1000)
+
+        stats = registry.stats("test")
+        assert stats is not None
+        self.assertEqual(stats.count, 100)
+        self.assertAlmostEqual(stats.total, 5050e-6)
+        self.assertAlmostEqual(stats.min, 1e-6)
+        self.assertAlmostEqual(stats.max, 100e-6)
+        self.assertAlmostEqual(stats.p50, 50e-6)
+        self.assertAlmostEqual(stats.p90, 90e-6)
+        self.assertAlmostEqual(stats.p99, 99e-6)
+
+        self.assertEqual(registry.stats("unknown"), None)
+
+    def test_samples_are_bounded(self) -> None:
+        registry = TimerRegistry(max_samples=10)
+        for elapsed in range(1000):
+            registry.record("test", elapsed)
+
+        stats = registry.stats("test")
+        assert stats is not None
+        self.assertEqual(stats.count, 1000)
+        self.assertEqual(stats.max, 999e-9)
+        self.assertEqual(len(registry._entries["test"].samples), 10)
+
+    def test_timer(self) -> None:
+        registry = TimerRegistry()
+        for _ in range(3):
+            with registry.timer("b"):
+                pass
+        with registry.timer("a"):
+            pass
+
+        summary = registry.summary()
+        self.assertEqual([stats.label for stats in summary], ["a", "b"])
+        self.assertEqual([stats.count for stats in summary], [1, 3])
+
+        registry.reset()
+        self.assertEqual(registry.summary(), [])
+
+    def test_timed(self) -> None:
+        registry = TimerRegistry()
+
+        @timed(registry=registry)
+        def func(x: int) -> int:
+            return x + 1
+
+        @timed("coro", registry=registry)
+        async def coro(x: int) -> int:
+            return x + 2
+
+        @timed("failing", registry=registry)
+        def failing() -> None:
+            raise Exception("failure")
+
+        self.assertEqual(func(1), 2)
+        self.assertEqual(asyncio.run(coro(1)), 3)
+        with self.assertRaises(Exception):
+            failing()
+
+        labels = [stats.label for stats in registry.summary()]
+        self.assertEqual(
+            labels, ["TimerRegistryTest.test_timed.<locals>.func", "coro", "failing"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()